@@ -1,60 +1,187 @@
 import os
-import pickle
 import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
 
+import numpy as np
 from aalpy import MarkovChain, run_Alergia
 from tabulate import tabulate
 
 from data_generation import datasets
-from data_generation.transformations import add_noise, crop_data
+from data_generation.mapped_samples import (
+    build_sample,
+    crop_sample,
+    MappedSample,
+    open_sample,
+    pickle_to_sample,
+    write_sample,
+)
+from data_generation.transformations import add_noise
+from parallel.shared_arrays import attach_shared_arrays, SharedArrays, SharedArraysSpec
+
+NUM_OF_RUNS = 50
+
+_worker_state: dict[str, Any] = {}
+
+
+def run_alergia(
+    positive: list[str],
+    negative: list[str],
+    noise_percentage: float,
+    seed: int,
+    visualisation_path: str | None = None,
+) -> tuple[float, int]:
+    """Learns a Markov chain from the data with added noise and returns its quality and number of states."""
+
+    data = add_noise(positive=positive, negative=negative, noise_percentage=noise_percentage, rnd=random.Random(seed))
+    mc: MarkovChain = run_Alergia(data=data, automaton_type="mc", print_info=False)
+    if visualisation_path is not None:
+        mc.visualize(path=visualisation_path, file_type="png")
+    return datasets.exact_a_and_b_alternately_solution_quality(automaton=mc), len(mc.states)
+
+
+def init_alergia_worker(spec: SharedArraysSpec, alphabet: list[str]) -> None:
+    arrays, blocks = attach_shared_arrays(spec=spec)
+    sample = MappedSample(
+        alphabet=alphabet, symbols=arrays["symbols"], offsets=arrays["offsets"], labels=arrays["labels"]
+    )
+    _worker_state.update(blocks=blocks, positive=sample.positive(), negative=sample.negative())
 
 
-def measure_alergia_noise_resistance(visualise: bool = False) -> None:
-    experiment_catalogue = "data/a_and_b_alternately"
+def run_alergia_worker(noise_percentage: float, seed: int, visualisation_path: str | None) -> tuple[float, int]:
+    return run_alergia(
+        positive=_worker_state["positive"],
+        negative=_worker_state["negative"],
+        noise_percentage=noise_percentage,
+        seed=seed,
+        visualisation_path=visualisation_path,
+    )
 
-    with open(os.path.join(experiment_catalogue, "data.pkl"), "rb") as f:
-        data = pickle.load(f)
 
-    dataset_size = 1000
-    rnd = random.Random(42)
+def cell_visualisation_paths(
+    noise_percentages: list[float],
+    num_of_runs: int,
+    visualisation_catalogue: str | None,
+) -> list[str | None]:
+    """
+    Where every (noise, run) cell of a sweep renders its Markov chain. Only the last run of every noise percentage is
+    rendered, to a file named after the noise percentage, so no two cells write the same file.
+    """
+
+    return [
+        (
+            os.path.join(visualisation_catalogue, f"learned_mc_{f'{noise_percentage:.3f}'.replace('.', '_')}.png")
+            if visualisation_catalogue is not None and run == num_of_runs - 1
+            else None
+        )
+        for noise_percentage in noise_percentages
+        for run in range(num_of_runs)
+    ]
+
+
+def run_alergia_noise_sweep(
+    positive: list[str],
+    negative: list[str],
+    noise_percentages: list[float],
+    num_of_runs: int = NUM_OF_RUNS,
+    seed: int = 42,
+    max_workers: int | None = None,
+    visualisation_catalogue: str | None = None,
+) -> list[tuple[float, float, float]]:
+    """
+    Runs Alergia `num_of_runs` times for every noise percentage and returns the average quality and number of states
+    per noise percentage. Every (noise, run) cell gets its own seed derived from `seed`, so the results do not depend
+    on the order of the cells or the number of workers. Cells run over `max_workers` processes (all cores by default)
+    that receive the base dataset once, through shared memory. With a `visualisation_catalogue`, the last run of every
+    noise percentage renders its Markov chain there.
+    """
+
+    cell_seeds = np.random.SeedSequence(seed).generate_state(len(noise_percentages) * num_of_runs)
+    cells = [
+        (noise_percentage, int(cell_seeds[i * num_of_runs + run]))
+        for i, noise_percentage in enumerate(noise_percentages)
+        for run in range(num_of_runs)
+    ]
+    visualisation_paths = cell_visualisation_paths(
+        noise_percentages=noise_percentages,
+        num_of_runs=num_of_runs,
+        visualisation_catalogue=visualisation_catalogue,
+    )
 
-    original_positive, original_negative = crop_data(data=data, size=dataset_size, rnd=rnd)
-    print(f"Positive examples: {len(original_positive)}")
-    print(f"Negative examples: {len(original_negative)}")
+    max_workers = max_workers if max_workers is not None else os.cpu_count() or 1
+    if max_workers == 1:
+        cell_results = []
+        for (noise_percentage, cell_seed), visualisation_path in zip(cells, visualisation_paths):
+            print(f"Running Alergia with noise percentage: {noise_percentage:.3f}")
+            cell_results.append(
+                run_alergia(
+                    positive=positive,
+                    negative=negative,
+                    noise_percentage=noise_percentage,
+                    seed=cell_seed,
+                    visualisation_path=visualisation_path,
+                )
+            )
+    else:
+        print(f"Running Alergia {len(cells)} times on {max_workers} workers")
+        sample = build_sample(positive=positive, negative=negative)
+        with (
+            SharedArrays(
+                arrays={"symbols": sample.symbols, "offsets": sample.offsets, "labels": sample.labels}
+            ) as shared_data,
+            ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=init_alergia_worker,
+                initargs=(shared_data.spec, sample.alphabet),
+            ) as executor,
+        ):
+            cell_results = list(
+                executor.map(
+                    run_alergia_worker,
+                    [noise_percentage for noise_percentage, _ in cells],
+                    [cell_seed for _, cell_seed in cells],
+                    visualisation_paths,
+                )
+            )
 
-    noise_percentages = [0.0, 0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5]
     results = []
-    for noise_percentage in noise_percentages:
-        average_quality = 0.0
-        average_num_of_states = 0.0
-
-        NUM_OF_RUNS = 50
-        for i in range(NUM_OF_RUNS):
-            percentage_formatted = f"{noise_percentage:.3f}".replace(".", "_")
-            print(f"[{i}] Running Alergia with noise percentage: {percentage_formatted}")
-
-            data = add_noise(
-                positive=original_positive,
-                negative=original_negative,
-                noise_percentage=noise_percentage,
-                rnd=rnd,
-            )
-            mc: MarkovChain = run_Alergia(data=data, automaton_type="mc", print_info=False)
+    for i, noise_percentage in enumerate(noise_percentages):
+        noise_results = cell_results[i * num_of_runs : (i + 1) * num_of_runs]
+        average_quality = sum(quality for quality, _ in noise_results) / num_of_runs
+        average_num_of_states = sum(num_of_states for _, num_of_states in noise_results) / num_of_runs
+        results.append((noise_percentage, average_quality, average_num_of_states))
+    return results
 
-            quality = datasets.measure_a_and_b_alternately_solution_quality(automaton=mc, attempts=10000, rnd=rnd)
 
-            average_quality += quality
-            average_num_of_states += len(mc.states)
+def measure_alergia_noise_resistance(
+    visualise: bool = False,
+    seed: int = 42,
+    max_workers: int | None = None,
+) -> None:
+    experiment_catalogue = "data/a_and_b_alternately"
+    sample_path = os.path.join(experiment_catalogue, "data.sample")
+    pickle_path = os.path.join(experiment_catalogue, "data.pkl")
+    if not os.path.exists(sample_path) and os.path.exists(pickle_path):
+        pickle_to_sample(pickle_path=pickle_path, path=sample_path)
 
-            if visualise:
-                mc.visualize(
-                    path=os.path.join(experiment_catalogue, f"learned_mc_{percentage_formatted}.png"),
-                    file_type="png",
-                )
+    sample = open_sample(path=sample_path)
 
-        average_quality /= NUM_OF_RUNS
-        average_num_of_states /= NUM_OF_RUNS
-        results.append((noise_percentage, average_quality, average_num_of_states))
+    dataset_size = 1000
+    rnd = random.Random(seed)
+
+    original_positive, original_negative = crop_sample(sample=sample, size=dataset_size, rnd=rnd)
+    print(f"Positive examples: {len(original_positive)}")
+    print(f"Negative examples: {len(original_negative)}")
+
+    noise_percentages = [0.0, 0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5]
+    results = run_alergia_noise_sweep(
+        positive=original_positive,
+        negative=original_negative,
+        noise_percentages=noise_percentages,
+        seed=seed,
+        max_workers=max_workers,
+        visualisation_catalogue=experiment_catalogue if visualise else None,
+    )
 
     headers = ["Noise percentage", "Quality", "Number of states"]
     result_array = tabulate(results, headers=headers, tablefmt="grid")
@@ -69,7 +196,7 @@ def save_a_and_b_alternately_dataset(
 ) -> None:
     experiment_catalogue = "data/a_and_b_alternately"
 
-    data = datasets.a_and_b_alternately(
+    positive, negative = datasets.a_and_b_alternately(
         positive_data_size=size,
         negative_data_size=size,
         min_seq_len=min_seq_len,
@@ -77,9 +204,7 @@ def save_a_and_b_alternately_dataset(
         seed=seed,
     )
 
-    os.makedirs(experiment_catalogue, exist_ok=True)
-    with open(os.path.join(experiment_catalogue, "data.pkl"), "wb") as f:
-        pickle.dump(data, f)
+    write_sample(path=os.path.join(experiment_catalogue, "data.sample"), positive=positive, negative=negative)
 
 
 if __name__ == "__main__":
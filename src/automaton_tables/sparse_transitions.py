@@ -0,0 +1,136 @@
+from dataclasses import dataclass, replace
+from functools import cached_property
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+@dataclass(eq=False)
+class SparseTransitions:
+    """
+    Transition table in compressed sparse row layout, for alphabets too large for a dense (num_states, alphabet_size)
+    table. The explicit transitions of state `s` are `symbols[row_offsets[s]:row_offsets[s + 1]]`, sorted, leading to
+    the same slice of `targets`. Every other symbol leads to `defaults[s]`, e.g. the state itself for a self-loop or
+    a sink. Indexing with `(states, symbols)` looks targets up like indexing a dense table, with broadcasting.
+    """
+
+    row_offsets: NDArray[np.int64]
+    symbols: NDArray[np.int64]
+    targets: NDArray[np.int64]
+    defaults: NDArray[np.int64]
+    alphabet_size: int
+
+    @property
+    def num_states(self) -> int:
+        return len(self.defaults)
+
+    @property
+    def num_transitions(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.num_states, self.alphabet_size
+
+    @property
+    def degrees(self) -> NDArray[np.int64]:
+        return np.diff(self.row_offsets)
+
+    @cached_property
+    def edge_states(self) -> NDArray[np.int64]:
+        """Source state of every explicit transition."""
+
+        return np.repeat(np.arange(self.num_states, dtype=np.int64), self.degrees)
+
+    @cached_property
+    def _edge_keys(self) -> NDArray[np.int64]:
+        return self.edge_states * self.alphabet_size + self.symbols
+
+    def __getitem__(self, key: tuple[ArrayLike, ArrayLike]) -> NDArray[np.int64]:
+        states, symbols = np.broadcast_arrays(*(np.asarray(index, dtype=np.int64) for index in key))
+        return self.lookup(states=states.ravel(), symbols=symbols.ravel()).reshape(states.shape)
+
+    def lookup(self, states: NDArray[np.int64], symbols: NDArray[np.int64]) -> NDArray[np.int64]:
+        """
+        Targets of all (state, symbol) pairs, found by one vectorised binary search. Transitions are sorted by state
+        and then by symbol, so the search for a pair lands in the row of its state; a pair with no explicit
+        transition lands on another symbol or outside the row and takes the default of the state.
+        """
+
+        targets = self.defaults[states]
+        keys = states * self.alphabet_size + symbols
+        positions = np.searchsorted(self._edge_keys, keys)
+        found = (symbols >= 0) & (symbols < self.alphabet_size) & (positions < self.row_offsets[states + 1])
+        found[found] = self._edge_keys[positions[found]] == keys[found]
+        targets[found] = self.targets[positions[found]]
+        return targets
+
+    def take_rows(self, rows: NDArray[np.int64]) -> "SparseTransitions":
+        """The table of the given states, in the given order. Targets and defaults are not renumbered."""
+
+        rows = np.asarray(rows, dtype=np.int64)
+        degrees = self.degrees[rows]
+        row_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=row_offsets[1:])
+        edges = np.repeat(self.row_offsets[rows] - row_offsets[:-1], degrees) + np.arange(row_offsets[-1])
+        return SparseTransitions(
+            row_offsets=row_offsets,
+            symbols=self.symbols[edges],
+            targets=self.targets[edges],
+            defaults=self.defaults[rows],
+            alphabet_size=self.alphabet_size,
+        )
+
+    def padded(self) -> "SparseTransitions":
+        """The table with an extra symbol `alphabet_size` that loops on every state, like padding in encoded samples."""
+
+        ends = self.row_offsets[1:]
+        return replace(
+            self,
+            row_offsets=self.row_offsets + np.arange(self.num_states + 1, dtype=np.int64),
+            symbols=np.insert(self.symbols, ends, self.alphabet_size),
+            targets=np.insert(self.targets, ends, np.arange(self.num_states, dtype=np.int64)),
+            alphabet_size=self.alphabet_size + 1,
+        )
+
+    def to_dense(self) -> NDArray[np.int64]:
+        dense = np.repeat(self.defaults[:, np.newaxis], self.alphabet_size, axis=1)
+        dense[self.edge_states, self.symbols] = self.targets
+        return dense
+
+
+def build_sparse_transitions(
+    sources: ArrayLike,
+    symbols: ArrayLike,
+    targets: ArrayLike,
+    defaults: ArrayLike,
+    alphabet_size: int,
+) -> SparseTransitions:
+    """Sorts explicit (source, symbol, target) transitions into rows. Every (source, symbol) pair must be unique."""
+
+    sources, symbols, targets = (np.asarray(values, dtype=np.int64).ravel() for values in (sources, symbols, targets))
+    defaults = np.asarray(defaults, dtype=np.int64)
+    order = np.lexsort((symbols, sources))
+    row_offsets = np.zeros(len(defaults) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=len(defaults)), out=row_offsets[1:])
+    return SparseTransitions(
+        row_offsets=row_offsets,
+        symbols=symbols[order],
+        targets=targets[order],
+        defaults=defaults,
+        alphabet_size=alphabet_size,
+    )
+
+
+def sparsify_transitions(transitions: NDArray[np.integer], defaults: ArrayLike) -> SparseTransitions:
+    """Sparse form of a dense table, keeping only the transitions that differ from the default of their state."""
+
+    defaults = np.asarray(defaults, dtype=np.int64)
+    sources, symbols = np.nonzero(transitions != defaults[:, np.newaxis])
+    return build_sparse_transitions(
+        sources=sources,
+        symbols=symbols,
+        targets=transitions[sources, symbols],
+        defaults=defaults,
+        alphabet_size=transitions.shape[1],
+    )
@@ -0,0 +1,118 @@
+import argparse
+import sys
+
+from tabulate import tabulate
+
+from benchmarking.cases import BenchmarkCase, HOT_FUNCTION_CASES, LEARNER_CASES
+from benchmarking.harness import BenchmarkResult, compare_results, load_results, measure, save_results
+
+BASELINE_PATH = "data/benchmark_results/baseline.json"
+LATEST_PATH = "data/benchmark_results/latest.json"
+
+
+def run_benchmarks(
+    cases: list[BenchmarkCase],
+    output_path: str | None = None,
+    quick: bool = False,
+    name_filter: str | None = None,
+) -> list[BenchmarkResult]:
+    """Measures every case whose name contains `name_filter`. Quick runs use 3 repetitions and no warm-up."""
+
+    results = []
+    for case in cases:
+        if name_filter is not None and name_filter not in case.name:
+            continue
+        print(f"Running benchmark: {case.name}")
+        benchmark = case.setup()
+        results.append(
+            measure(
+                name=case.name,
+                benchmark=benchmark,
+                warmup=0 if quick else 1,
+                repetitions=min(case.repetitions, 3) if quick else case.repetitions,
+            ),
+        )
+
+    headers = ["Benchmark", "Repetitions", "Median [s]", "CI low [s]", "CI high [s]", "Peak memory [KiB]"]
+    rows = [
+        (
+            result.name,
+            result.repetitions,
+            result.median_seconds,
+            result.ci_low_seconds,
+            result.ci_high_seconds,
+            result.peak_memory_bytes / 1024,
+        )
+        for result in results
+    ]
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+    if output_path is not None:
+        save_results(results=results, file_path=output_path)
+    return results
+
+
+def compare_benchmarks(baseline_path: str, current_path: str, tolerance: float = 0.1) -> bool:
+    """Prints the comparison of two result files and returns whether any benchmark regressed."""
+
+    comparisons = compare_results(
+        baseline=load_results(file_path=baseline_path),
+        current=load_results(file_path=current_path),
+        tolerance=tolerance,
+    )
+    headers = ["Benchmark", "Baseline median [s]", "Current median [s]", "Ratio", "Status"]
+    rows = [
+        (
+            comparison.name,
+            comparison.baseline_median_seconds,
+            comparison.current_median_seconds,
+            comparison.ratio,
+            "REGRESSION" if comparison.regression else "ok",
+        )
+        for comparison in comparisons
+    ]
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+    return any(comparison.regression for comparison in comparisons)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of the hot functions and of the learners.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write the results as JSON.")
+    run_output = run_parser.add_mutually_exclusive_group()
+    run_output.add_argument("--output", default=LATEST_PATH)
+    run_output.add_argument(
+        "--update-baseline",
+        action="store_const",
+        const=BASELINE_PATH,
+        dest="output",
+        help=f"Write the results to the baseline {BASELINE_PATH} instead of {LATEST_PATH}.",
+    )
+    run_parser.add_argument("--quick", action="store_true")
+    run_parser.add_argument("--filter", dest="name_filter")
+    run_parser.add_argument("--skip-learners", action="store_true")
+
+    compare_help = (
+        "Flag regressions of a result file against a baseline. The baseline holds timings of one machine: compare only "
+        "results measured on the machine it was recorded on, or record a new one with `run --update-baseline`."
+    )
+    compare_parser = subparsers.add_parser("compare", help=compare_help, description=compare_help)
+    compare_parser.add_argument("current", nargs="?", default=LATEST_PATH)
+    compare_parser.add_argument(
+        "--baseline",
+        default=BASELINE_PATH,
+        help="Machine-specific results of the same benchmarks, measured on this machine.",
+    )
+    compare_parser.add_argument("--tolerance", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        cases = HOT_FUNCTION_CASES if args.skip_learners else HOT_FUNCTION_CASES + LEARNER_CASES
+        run_benchmarks(cases=cases, output_path=args.output, quick=args.quick, name_filter=args.name_filter)
+        return 0
+    return 1 if compare_benchmarks(args.baseline, args.current, tolerance=args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
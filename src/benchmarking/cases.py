@@ -0,0 +1,131 @@
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from aalpy import RandomWordEqOracle, RegexSUL, run_Alergia, run_Lstar, run_RPNI
+from aalpy.learning_algs.deterministic_passive.rpni_helper_functions import createPTA
+
+from benchmarking.harness import Benchmark
+from data_generation import datasets
+from data_generation.transformations import add_noise
+from gig.fitness import calculate_data_points, encode_sample, evaluate_population, evaluate_population_trie
+from gig.fitness_cache import FitnessCache
+from gig.genetic_operations import canonicalize_partition, initialize_population, initialize_random_population
+from gig.mca import construct_mca, reduce_mca
+from gig.sample_trie import compile_sample_trie
+from gig_driver import run_gig
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A benchmark whose input data is prepared by `setup`, outside of the timed calls."""
+
+    name: str
+    setup: Callable[[], Benchmark]
+    repetitions: int
+
+
+def setup_construct_mca() -> Benchmark:
+    s_plus, _, _, _ = datasets.one_is_third_from_end()
+    return lambda: construct_mca(s_plus=s_plus)
+
+
+def setup_reduce_mca() -> Benchmark:
+    s_plus, _, _, _ = datasets.one_is_third_from_end()
+    mca = construct_mca(s_plus=s_plus)
+    partitions = initialize_random_population(mca.num_states, 100, np.random.default_rng(0))
+    return lambda: [reduce_mca(mca=mca, partition=partition) for partition in partitions]
+
+
+def setup_canonicalize_partition() -> Benchmark:
+    partitions = np.random.default_rng(0).integers(0, 50, size=(100, 100))
+    return lambda: [canonicalize_partition(partition=partition) for partition in partitions]
+
+
+def setup_calculate_data_points() -> Benchmark:
+    s_plus, s_minus, _, _ = datasets.one_is_third_from_end()
+    mca = construct_mca(s_plus=s_plus)
+    sample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet)
+    partitions = initialize_random_population(mca.num_states, 100, np.random.default_rng(0))
+    return lambda: calculate_data_points(
+        accepted=evaluate_population(mca=mca, partitions=partitions, sample=sample),
+        sample=sample,
+    )
+
+
+def setup_calculate_data_points_trie() -> Benchmark:
+    s_plus, s_minus, _, _ = datasets.one_is_third_from_end()
+    mca = construct_mca(s_plus=s_plus)
+    trie = compile_sample_trie(sample=encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet))
+    partitions = initialize_random_population(mca.num_states, 100, np.random.default_rng(0))
+    return lambda: calculate_data_points(
+        accepted=evaluate_population_trie(mca=mca, partitions=partitions, trie=trie),
+        sample=trie,
+    )
+
+
+def setup_create_pta() -> Benchmark:
+    random.seed(0)
+    data = datasets.create_rpni_benchmark_data(alphabet_size=8)
+    return lambda: createPTA(data, automaton_type="dfa")
+
+
+def setup_add_noise() -> Benchmark:
+    positive, negative = datasets.a_and_b_alternately(positive_data_size=10000, negative_data_size=10000, min_seq_len=1)
+    return lambda: add_noise(positive=positive, negative=negative, noise_percentage=0.5, rnd=random.Random(0))
+
+
+def setup_gig() -> Benchmark:
+    s_plus, s_minus, _, _ = datasets.even_number_of_as()
+    mca = construct_mca(s_plus=s_plus)
+    trie = compile_sample_trie(sample=encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet))
+    return lambda: run_gig(
+        mca=mca,
+        train_sample=trie,
+        test_sample=trie,
+        initial_population_func=initialize_population,
+        seed=0,
+        fitness_cache=FitnessCache(),
+    )
+
+
+def setup_rpni() -> Benchmark:
+    random.seed(0)
+    data = datasets.create_rpni_benchmark_data(alphabet_size=8)
+    return lambda: run_RPNI(data=data, automaton_type="dfa", print_info=False)
+
+
+def setup_alergia() -> Benchmark:
+    positive, negative = datasets.a_and_b_alternately(positive_data_size=1000, negative_data_size=1000, min_seq_len=1)
+    data = add_noise(positive=positive, negative=negative, noise_percentage=0.05, rnd=random.Random(0))
+    return lambda: run_Alergia(data=data, automaton_type="mc", print_info=False)
+
+
+def setup_lstar() -> Benchmark:
+    def learn() -> object:
+        alphabet = list("01")
+        sul = RegexSUL(regex="0{8}[01]*")
+        eq_oracle = RandomWordEqOracle(alphabet, sul, num_walks=500, min_walk_len=5, max_walk_len=20)
+        random.seed(0)
+        return run_Lstar(alphabet, sul, eq_oracle, automaton_type="dfa", cex_processing=None, print_level=0)
+
+    return learn
+
+
+HOT_FUNCTION_CASES = [
+    BenchmarkCase(name="construct_mca", setup=setup_construct_mca, repetitions=20),
+    BenchmarkCase(name="reduce_mca", setup=setup_reduce_mca, repetitions=20),
+    BenchmarkCase(name="canonicalize_partition", setup=setup_canonicalize_partition, repetitions=20),
+    BenchmarkCase(name="calculate_data_points", setup=setup_calculate_data_points, repetitions=20),
+    BenchmarkCase(name="calculate_data_points[trie]", setup=setup_calculate_data_points_trie, repetitions=20),
+    BenchmarkCase(name="createPTA", setup=setup_create_pta, repetitions=20),
+    BenchmarkCase(name="add_noise", setup=setup_add_noise, repetitions=20),
+]
+
+LEARNER_CASES = [
+    BenchmarkCase(name="gig[even_number_of_as]", setup=setup_gig, repetitions=5),
+    BenchmarkCase(name="rpni[alphabet_size=8]", setup=setup_rpni, repetitions=5),
+    BenchmarkCase(name="alergia[a_and_b_alternately]", setup=setup_alergia, repetitions=5),
+    BenchmarkCase(name="lstar[0{8}[01]*]", setup=setup_lstar, repetitions=5),
+]
@@ -0,0 +1,133 @@
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+import numpy as np
+
+Benchmark = Callable[[], object]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    repetitions: int
+    median_seconds: float
+    ci_low_seconds: float
+    ci_high_seconds: float
+    peak_memory_bytes: int
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_median_seconds: float
+    current_median_seconds: float
+    ratio: float
+    regression: bool
+
+
+def measure(
+    name: str,
+    benchmark: Benchmark,
+    warmup: int = 1,
+    repetitions: int = 10,
+    confidence: float = 0.95,
+) -> BenchmarkResult:
+    """
+    Times `repetitions` calls of the benchmark after `warmup` untimed ones and reports the median with a bootstrap
+    confidence interval. Peak memory is measured in one more call under tracemalloc, which would distort the timings.
+    """
+
+    for _ in range(warmup):
+        benchmark()
+
+    timings = np.empty(repetitions, dtype=np.float64)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(repetitions):
+            start = time.perf_counter()
+            benchmark()
+            timings[i] = time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        benchmark()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ci_low, ci_high = median_confidence_interval(timings=timings, confidence=confidence)
+    return BenchmarkResult(
+        name=name,
+        repetitions=repetitions,
+        median_seconds=float(np.median(timings)),
+        ci_low_seconds=ci_low,
+        ci_high_seconds=ci_high,
+        peak_memory_bytes=peak_memory,
+    )
+
+
+def median_confidence_interval(
+    timings: np.ndarray,
+    confidence: float = 0.95,
+    resamples: int = 2000,
+) -> tuple[float, float]:
+    rng = np.random.default_rng(0)
+    medians = np.median(rng.choice(timings, size=(resamples, len(timings)), replace=True), axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(medians, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def compare_results(
+    baseline: list[BenchmarkResult],
+    current: list[BenchmarkResult],
+    tolerance: float = 0.1,
+) -> list[Comparison]:
+    """
+    Matches benchmarks by name. A benchmark regressed when its median is more than `tolerance` slower than the
+    baseline and its confidence interval lies entirely above the baseline one.
+    """
+
+    baseline_by_name = {result.name: result for result in baseline}
+    comparisons = []
+    for result in current:
+        reference = baseline_by_name.get(result.name)
+        if reference is None:
+            continue
+        ratio = result.median_seconds / reference.median_seconds if reference.median_seconds else float("inf")
+        comparisons.append(
+            Comparison(
+                name=result.name,
+                baseline_median_seconds=reference.median_seconds,
+                current_median_seconds=result.median_seconds,
+                ratio=ratio,
+                regression=ratio > 1 + tolerance and result.ci_low_seconds > reference.ci_high_seconds,
+            )
+        )
+    return comparisons
+
+
+def save_results(results: list[BenchmarkResult], file_path: str) -> None:
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(result) for result in results],
+    }
+    with open(file_path, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def load_results(file_path: str) -> list[BenchmarkResult]:
+    with open(file_path) as f:
+        report = json.load(f)
+    return [BenchmarkResult(**result) for result in report["results"]]
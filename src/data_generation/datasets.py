@@ -2,9 +2,13 @@ import random
 from itertools import product
 from typing import Iterable
 
-from aalpy import Automaton, AutomatonSUL, DeterministicAutomaton, Dfa
+import numpy as np
+from aalpy import AutomatonSUL, DeterministicAutomaton, Dfa, MarkovChain
 from automata.fa.dfa import DFA
 
+from data_generation.markov_chains import exact_solution_quality, measure_solution_quality
+from data_generation.word_sampler import sample_words
+
 
 def even_number_of_as() -> tuple[list[str], list[str], list[str], list[str]]:
     train_pos = ["", "b", "aa", "aab", "bb", "baa", "aba", "abaaa", "baaaa"]
@@ -118,60 +122,72 @@ def a_and_b_alternately(
     max_seq_len: int = 20,
     seed: int | None = None,
 ) -> tuple[list[str], list[str]]:
+    """
+    The alternating words `abab...` as positive words and the other words starting with `a` as negative ones, drawn
+    uniformly per length by `sample_words`. Lengths are uniform over the lengths that have words.
+    """
+
     seed = seed if seed is not None else 42
-    rnd = random.Random(seed)
 
     if min_seq_len < 0:
         raise ValueError("Minimum sequence length must be at least 1")
     if max_seq_len < min_seq_len:
         raise ValueError("Maximum sequence length must be greater than or equal to minimum sequence length")
 
-    positive_examples = []
-    for _ in range(positive_data_size):
-        seq_len = rnd.randint(min_seq_len, max_seq_len)
-        try:
-            seq = DFA_FOR_A_AND_B_ALTERNATELY.random_word(k=seq_len, seed=seed)
-        except ValueError:
-            continue
-        positive_examples.append(seq)
-
     negated_dfa = DFA(
-        states={"s1", "s2", "s3"},
+        states={"s0", "s1", "s2", "s3", "s4"},
         input_symbols={"a", "b"},
-        initial_state="s1",
+        initial_state="s0",
         final_states={"s2"},
         transitions={
+            "s0": {"a": "s1", "b": "s4"},
             "s1": {"a": "s2", "b": "s3"},
             "s2": {"a": "s2", "b": "s2"},
             "s3": {"a": "s1", "b": "s2"},
+            "s4": {"a": "s4", "b": "s4"},
         },
     )
-    negative_examples = []
-    for _ in range(negative_data_size):
-        seq_len = rnd.randint(min_seq_len - 1, max_seq_len - 1)
-        try:
-            seq = "a" + negated_dfa.random_word(k=seq_len, seed=seed)
-        except ValueError:
-            continue
-        negative_examples.append(seq)
-
-    return positive_examples, negative_examples
+    return sample_words(
+        dfa=DFA_FOR_A_AND_B_ALTERNATELY,
+        negative_dfa=negated_dfa,
+        positive_data_size=positive_data_size,
+        negative_data_size=negative_data_size,
+        min_seq_len=min_seq_len,
+        max_seq_len=max_seq_len,
+        rng=np.random.default_rng(seed),
+    )
 
 
 def measure_a_and_b_alternately_solution_quality(
-    automaton: Automaton,
+    automaton: MarkovChain,
     attempts: int = 1000,
     rnd: random.Random | None = None,
 ) -> float:
-    """Measures the quality of the learned automaton by checking sentences it generates."""
+    """
+    Measures the quality of the learned Markov chain by checking sentences it generates. The sentences are sampled
+    in bulk from the transition matrix of the chain, seeded from `rnd`.
+    """
 
     if rnd is None:
         rnd = random.Random(42)
 
-    sul = AutomatonSUL(automaton=automaton)
-    data = generate_data_from_mc_sul(sul, size=attempts, min_seq_len=1, max_seq_len=20, rnd=rnd)
-    correct_sentences = sum(DFA_FOR_A_AND_B_ALTERNATELY.accepts_input(word) for word in data)
-    return correct_sentences / attempts
+    return measure_solution_quality(
+        mc=automaton,
+        dfa=DFA_FOR_A_AND_B_ALTERNATELY,
+        attempts=attempts,
+        min_seq_len=1,
+        max_seq_len=20,
+        rng=np.random.default_rng(rnd.getrandbits(64)),
+    )
+
+
+def exact_a_and_b_alternately_solution_quality(automaton: MarkovChain) -> float:
+    """
+    Exact value of `measure_a_and_b_alternately_solution_quality`: the probability that a sentence generated by the
+    learned Markov chain is accepted, computed over the product with the target DFA instead of sampled.
+    """
+
+    return exact_solution_quality(mc=automaton, dfa=DFA_FOR_A_AND_B_ALTERNATELY, min_seq_len=1, max_seq_len=20)
 
 
 def generate_data_from_mc_sul(
@@ -204,6 +220,11 @@ def save_data_to_file(data: Iterable, file_path: str) -> None:
             f.write(f"{example}\n")
 
 
+def read_data_from_file(file_path: str) -> list[str]:
+    with open(f"data/{file_path}.txt") as f:
+        return [line.removesuffix("\n") for line in f]
+
+
 def create_rpni_benchmark_data(alphabet_size: int) -> list[tuple[tuple[int | None, ...], bool]]:
     """
     Creates data for RPNI benchmarking. The data consists of positive and negative examples of words over an alphabet.
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable, Mapping, Sequence
+
+import aalpy
+import numpy as np
+from automata.fa.dfa import DFA
+from numpy.typing import NDArray
+
+
+@dataclass(eq=False)
+class DfaTable:
+    """
+    A complete DFA as arrays: `transitions[state, symbol]` is the next state of a state on the symbol with index
+    `symbol` in `alphabet`. Missing transitions of partial DFAs lead to an added rejecting sink state.
+    """
+
+    alphabet: list[Hashable]
+    transitions: NDArray[np.int64]
+    accepting: NDArray[np.bool_]
+    initial_state: int
+
+    @property
+    def num_states(self) -> int:
+        return len(self.accepting)
+
+    def complement(self) -> "DfaTable":
+        return DfaTable(
+            alphabet=self.alphabet,
+            transitions=self.transitions,
+            accepting=~self.accepting,
+            initial_state=self.initial_state,
+        )
+
+    def with_alphabet(self, alphabet: Sequence[Hashable]) -> "DfaTable":
+        """The same DFA over a superset of its alphabet. The new symbols lead to an added rejecting sink state."""
+
+        sink = self.num_states
+        transitions = np.full((sink + 1, len(alphabet)), sink, dtype=np.int64)
+        symbol_indices = {symbol: i for i, symbol in enumerate(self.alphabet)}
+        for i, symbol in enumerate(alphabet):
+            if symbol in symbol_indices:
+                transitions[:sink, i] = self.transitions[:, symbol_indices[symbol]]
+        return DfaTable(
+            alphabet=list(alphabet),
+            transitions=transitions,
+            accepting=np.append(self.accepting, False),
+            initial_state=self.initial_state,
+        )
+
+    def encode(self, words: Iterable[Sequence[Hashable]]) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Symbol ids of the words, concatenated, and the offsets of the words in them."""
+
+        index = {symbol: i for i, symbol in enumerate(self.alphabet)}
+        encoded = [[index[symbol] for symbol in word] for word in words]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(word) for word in encoded], out=offsets[1:])
+        symbols = np.fromiter((symbol for word in encoded for symbol in word), dtype=np.int64, count=offsets[-1])
+        return symbols, offsets
+
+    def accepts_words(self, symbols: NDArray[np.integer], offsets: NDArray[np.int64]) -> NDArray[np.bool_]:
+        """Runs all the words at once, one position at a time, and returns which of them are accepted."""
+
+        lengths = np.diff(offsets)
+        states = np.full(len(lengths), self.initial_state, dtype=np.int64)
+        active = np.arange(len(lengths))
+        for position in range(int(lengths.max(initial=0))):
+            active = active[lengths[active] > position]
+            states[active] = self.transitions[states[active], symbols[offsets[active] + position]]
+        return self.accepting[states]
+
+
+def compile_dfa(dfa: DFA | aalpy.Dfa, alphabet: Sequence[Hashable] | None = None) -> DfaTable:
+    """
+    Compiles an automata-lib `DFA` or an aalpy `Dfa` into a `DfaTable`. The alphabet defaults to the sorted input
+    symbols of the DFA. The initial state gets index 0.
+    """
+
+    states: list[Hashable]
+    state_transitions: list[Mapping[Any, Any]]
+    if isinstance(dfa, DFA):
+        names = [dfa.initial_state] + sorted(dfa.states - {dfa.initial_state}, key=str)
+        states = list(names)
+        state_transitions = [dfa.transitions.get(name, {}) for name in names]
+        accepting = [name in dfa.final_states for name in names]
+        input_symbols = set(dfa.input_symbols)
+    else:
+        aalpy_states = [dfa.initial_state] + [state for state in dfa.states if state is not dfa.initial_state]
+        states = list(aalpy_states)
+        state_transitions = [state.transitions for state in aalpy_states]
+        accepting = [state.is_accepting for state in aalpy_states]
+        input_symbols = set(dfa.get_input_alphabet())
+
+    alphabet = list(alphabet) if alphabet is not None else sorted(input_symbols, key=str)
+    state_indices = {state: i for i, state in enumerate(states)}
+
+    sink = len(states)
+    transitions = np.full((sink + 1, len(alphabet)), sink, dtype=np.int64)
+    for state, outgoing in enumerate(state_transitions):
+        for symbol_index, symbol in enumerate(alphabet):
+            if symbol in outgoing:
+                transitions[state, symbol_index] = state_indices[outgoing[symbol]]
+
+    return DfaTable(
+        alphabet=alphabet,
+        transitions=transitions,
+        accepting=np.array(accepting + [False], dtype=np.bool_),
+        initial_state=0,
+    )
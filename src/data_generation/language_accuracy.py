@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from typing import Hashable
+
+import aalpy
+import numpy as np
+from automata.fa.dfa import DFA
+from numpy.typing import NDArray
+
+from data_generation.dfa_tables import compile_dfa, DfaTable
+
+
+@dataclass(eq=False)
+class LanguageComparison:
+    """
+    Exact comparison of a learned DFA with a reference one. Entry `length` of every array is the fraction of the
+    words of that length in the respective class, i.e. the probability of the class for a uniformly random word.
+    """
+
+    accepted_by_both: NDArray[np.float64]
+    rejected_by_both: NDArray[np.float64]
+    accepted_by_learned_only: NDArray[np.float64]
+    accepted_by_reference_only: NDArray[np.float64]
+    equivalent: bool
+    distinguishing_word: tuple[Hashable, ...] | None
+
+    @property
+    def agreement(self) -> NDArray[np.float64]:
+        return self.accepted_by_both + self.rejected_by_both
+
+    def rates(self) -> tuple[float, float, float, float, float]:
+        """
+        Quality, TP, TN, FP and FN ratios in the conventions of `measure_quality`, over words drawn with a uniform
+        length and then uniformly among the words of that length. Positives are the words of the reference language.
+        """
+
+        positives = float(np.mean(self.accepted_by_both + self.accepted_by_reference_only))
+        negatives = float(np.mean(self.rejected_by_both + self.accepted_by_learned_only))
+        true_positives = float(np.mean(self.accepted_by_both))
+        true_negatives = float(np.mean(self.rejected_by_both))
+        return (
+            true_positives + true_negatives,
+            true_positives / positives if positives else 1.0,
+            true_negatives / negatives if negatives else 1.0,
+            (positives - true_positives) / positives if positives else 0.0,
+            (negatives - true_negatives) / negatives if negatives else 0.0,
+        )
+
+
+def compare_languages(
+    learned: DFA | aalpy.Dfa | DfaTable,
+    reference: DFA | aalpy.Dfa | DfaTable,
+    max_len: int = 20,
+) -> LanguageComparison:
+    """
+    Compares the languages of two DFAs through their product automaton, over the union of their alphabets.
+    The class fractions of every length up to `max_len` are obtained by pushing the uniform word distribution through
+    the product one length at a time. Equivalence does not depend on `max_len`: a breadth-first search of the product
+    finds a reachable state where the DFAs disagree, and the path to it is a shortest distinguishing word.
+    """
+
+    learned_table = learned if isinstance(learned, DfaTable) else compile_dfa(dfa=learned)
+    reference_table = reference if isinstance(reference, DfaTable) else compile_dfa(dfa=reference)
+    alphabet = sorted(set(learned_table.alphabet) | set(reference_table.alphabet), key=str)
+    learned_table = learned_table.with_alphabet(alphabet=alphabet)
+    reference_table = reference_table.with_alphabet(alphabet=alphabet)
+
+    # Product state `i * m + j` pairs state i of the learned DFA with state j of the reference one.
+    m = reference_table.num_states
+    transitions = learned_table.transitions[:, np.newaxis, :] * m + reference_table.transitions[np.newaxis, :, :]
+    transitions = transitions.reshape(-1, len(alphabet))
+    learned_accepts = np.repeat(learned_table.accepting, m)
+    reference_accepts = np.tile(reference_table.accepting, learned_table.num_states)
+    initial_state = learned_table.initial_state * m + reference_table.initial_state
+
+    classes = np.zeros((4, max_len + 1), dtype=np.float64)
+    masks = [
+        learned_accepts & reference_accepts,
+        ~learned_accepts & ~reference_accepts,
+        learned_accepts & ~reference_accepts,
+        ~learned_accepts & reference_accepts,
+    ]
+    distribution = np.zeros(len(transitions), dtype=np.float64)
+    distribution[initial_state] = 1.0
+    for length in range(max_len + 1):
+        if length > 0:
+            distribution = np.bincount(
+                transitions.ravel(),
+                weights=np.repeat(distribution / len(alphabet), len(alphabet)),
+                minlength=len(transitions),
+            )
+        for i, mask in enumerate(masks):
+            classes[i, length] = distribution[mask].sum()
+
+    distinguishing_word = _shortest_distinguishing_word(
+        transitions=transitions,
+        differ=learned_accepts != reference_accepts,
+        initial_state=initial_state,
+        alphabet=alphabet,
+    )
+    accepted_by_both, rejected_by_both, accepted_by_learned_only, accepted_by_reference_only = classes
+    return LanguageComparison(
+        accepted_by_both=accepted_by_both,
+        rejected_by_both=rejected_by_both,
+        accepted_by_learned_only=accepted_by_learned_only,
+        accepted_by_reference_only=accepted_by_reference_only,
+        equivalent=distinguishing_word is None,
+        distinguishing_word=distinguishing_word,
+    )
+
+
+def _shortest_distinguishing_word(
+    transitions: NDArray[np.int64],
+    differ: NDArray[np.bool_],
+    initial_state: int,
+    alphabet: list[Hashable],
+) -> tuple[Hashable, ...] | None:
+    parents = np.full(len(transitions), -1, dtype=np.int64)
+    parent_symbols = np.full(len(transitions), -1, dtype=np.int64)
+    visited = np.zeros(len(transitions), dtype=np.bool_)
+    visited[initial_state] = True
+    frontier = np.array([initial_state], dtype=np.int64)
+    while len(frontier):
+        differing = frontier[differ[frontier]]
+        if len(differing):
+            state = int(differing[0])
+            symbols = []
+            while state != initial_state:
+                symbols.append(alphabet[parent_symbols[state]])
+                state = int(parents[state])
+            return tuple(reversed(symbols))
+
+        targets = transitions[frontier].ravel()
+        new_targets, first = np.unique(targets, return_index=True)
+        unvisited = ~visited[new_targets]
+        new_targets, first = new_targets[unvisited], first[unvisited]
+        visited[new_targets] = True
+        parents[new_targets] = frontier[first // len(alphabet)]
+        parent_symbols[new_targets] = first % len(alphabet)
+        frontier = new_targets
+    return None
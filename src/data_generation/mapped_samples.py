@@ -0,0 +1,129 @@
+import json
+import os
+import pickle
+import random
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from data_generation.datasets import read_data_from_file, save_data_to_file
+from data_generation.streaming import symbol_dtype
+
+
+@dataclass(eq=False)
+class MappedSample:
+    """
+    Labelled words stored as one contiguous buffer of symbol ids, interned in `alphabet`. Word `i` is
+    `symbols[offsets[i]:offsets[i + 1]]`. Positive words come first. Arrays opened by `open_sample` are memory-mapped,
+    so only the pages of the words that are read are loaded.
+    """
+
+    alphabet: list[str]
+    symbols: NDArray[np.unsignedinteger]
+    offsets: NDArray[np.int64]
+    labels: NDArray[np.bool_]
+
+    @property
+    def num_words(self) -> int:
+        return len(self.labels)
+
+    @property
+    def num_positive(self) -> int:
+        return int(np.searchsorted(~self.labels, True))
+
+    def words(self, indices: Iterable[int]) -> list[str]:
+        characters = np.array(self.alphabet)
+        return ["".join(characters[self.symbols[self.offsets[index] : self.offsets[index + 1]]]) for index in indices]
+
+    def positive(self) -> list[str]:
+        return self.words(indices=range(self.num_positive))
+
+    def negative(self) -> list[str]:
+        return self.words(indices=range(self.num_positive, self.num_words))
+
+
+def build_sample(positive: Sequence[str], negative: Sequence[str]) -> MappedSample:
+    """In-memory sample of the words. Symbols are uint8 for alphabets of at most 256 symbols, uint16 otherwise."""
+
+    words = list(positive) + list(negative)
+    lengths = np.fromiter((len(word) for word in words), dtype=np.int64, count=len(words))
+    code_points = np.frombuffer("".join(words).encode("utf-32-le"), dtype=np.uint32)
+    alphabet_code_points, symbols = np.unique(code_points, return_inverse=True)
+
+    offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    labels = np.zeros(len(words), dtype=np.bool_)
+    labels[: len(positive)] = True
+    return MappedSample(
+        alphabet=[chr(code_point) for code_point in alphabet_code_points],
+        symbols=symbols.astype(symbol_dtype(alphabet_size=len(alphabet_code_points))),
+        offsets=offsets,
+        labels=labels,
+    )
+
+
+def write_sample(path: str, positive: Sequence[str], negative: Sequence[str]) -> None:
+    """Writes the sample as a directory of `.npy` arrays and an `alphabet.json`."""
+
+    sample = build_sample(positive=positive, negative=negative)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "alphabet.json"), "w") as f:
+        json.dump(sample.alphabet, f)
+    np.save(os.path.join(path, "symbols.npy"), sample.symbols)
+    np.save(os.path.join(path, "offsets.npy"), sample.offsets)
+    np.save(os.path.join(path, "labels.npy"), sample.labels)
+
+
+def open_sample(path: str) -> MappedSample:
+    with open(os.path.join(path, "alphabet.json")) as f:
+        alphabet = json.load(f)
+    return MappedSample(
+        alphabet=alphabet,
+        symbols=np.load(os.path.join(path, "symbols.npy"), mmap_mode="r"),
+        offsets=np.load(os.path.join(path, "offsets.npy"), mmap_mode="r"),
+        labels=np.load(os.path.join(path, "labels.npy"), mmap_mode="r"),
+    )
+
+
+def crop_sample(sample: MappedSample, size: int, rnd: random.Random) -> tuple[list[str], list[str]]:
+    """
+    Same as `crop_data` on the positive and negative lists of the sample, and draws the same words for the same
+    random state, but decodes only the drawn words.
+    """
+
+    num_positive = sample.num_positive
+    positive_indices = rnd.sample(range(num_positive), size)
+    negative_indices = rnd.sample(range(num_positive, sample.num_words), size)
+    return sample.words(indices=positive_indices), sample.words(indices=negative_indices)
+
+
+def pickle_to_sample(pickle_path: str, path: str) -> None:
+    """Converts a pickled `(positive, negative)` pair of word lists, like `data.pkl` of the Alergia experiments."""
+
+    with open(pickle_path, "rb") as f:
+        positive, negative = pickle.load(f)
+    write_sample(path=path, positive=positive, negative=negative)
+
+
+def sample_to_pickle(path: str, pickle_path: str) -> None:
+    sample = open_sample(path=path)
+    with open(pickle_path, "wb") as f:
+        pickle.dump((sample.positive(), sample.negative()), f)
+
+
+def text_to_sample(positive_file_path: str, negative_file_path: str, path: str) -> None:
+    """Converts word lists saved by `save_data_to_file`, one for the positive and one for the negative words."""
+
+    write_sample(
+        path=path,
+        positive=read_data_from_file(file_path=positive_file_path),
+        negative=read_data_from_file(file_path=negative_file_path),
+    )
+
+
+def sample_to_text(path: str, positive_file_path: str, negative_file_path: str) -> None:
+    sample = open_sample(path=path)
+    save_data_to_file(data=sample.positive(), file_path=positive_file_path)
+    save_data_to_file(data=sample.negative(), file_path=negative_file_path)
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from typing import Hashable
+
+import numpy as np
+from aalpy import MarkovChain
+from automata.fa.dfa import DFA
+from numpy.typing import NDArray
+
+from data_generation.dfa_tables import compile_dfa, DfaTable
+
+
+@dataclass(eq=False)
+class MarkovChainTable:
+    """
+    A Markov chain as arrays: `probabilities[state, next_state]` is a row-stochastic transition matrix and
+    `outputs[state]` the index of the output of a state in `output_alphabet`. States without transitions keep
+    the chain in place, like `MarkovChain.step` does.
+    """
+
+    output_alphabet: list[Hashable]
+    outputs: NDArray[np.int64]
+    probabilities: NDArray[np.float64]
+    initial_state: int
+
+    @property
+    def num_states(self) -> int:
+        return len(self.outputs)
+
+
+def compile_markov_chain(mc: MarkovChain) -> MarkovChainTable:
+    states = [mc.initial_state] + [state for state in mc.states if state is not mc.initial_state]
+    state_indices = {state: i for i, state in enumerate(states)}
+    output_alphabet = sorted({state.output for state in states}, key=str)
+    output_indices = {output: i for i, output in enumerate(output_alphabet)}
+
+    probabilities = np.zeros((len(states), len(states)), dtype=np.float64)
+    for i, state in enumerate(states):
+        if not state.transitions:
+            probabilities[i, i] = 1.0
+        for next_state, probability in state.transitions:
+            probabilities[i, state_indices[next_state]] += probability
+
+    return MarkovChainTable(
+        output_alphabet=output_alphabet,
+        outputs=np.array([output_indices[state.output] for state in states], dtype=np.int64),
+        probabilities=probabilities / probabilities.sum(axis=1, keepdims=True),
+        initial_state=0,
+    )
+
+
+def sample_sequences(
+    chain: MarkovChainTable,
+    lengths: NDArray[np.int64],
+    rng: np.random.Generator,
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """
+    Output sequences of the chain, like `generate_data_from_mc_sul` produces: the initial output followed by
+    `lengths[i]` steps for sequence `i`. All the sequences are stepped in parallel by inverse-CDF sampling over
+    the cumulative rows of the transition matrix. Returns the output ids, concatenated, and the sequence offsets.
+    """
+
+    cumulative = np.cumsum(chain.probabilities, axis=1)
+    cumulative[:, -1] = 1.0
+
+    sequence_lengths = np.asarray(lengths, dtype=np.int64) + 1
+    offsets = np.zeros(len(sequence_lengths) + 1, dtype=np.int64)
+    np.cumsum(sequence_lengths, out=offsets[1:])
+    outputs = np.empty(offsets[-1], dtype=np.int64)
+    states = np.full(len(sequence_lengths), chain.initial_state, dtype=np.int64)
+    active = np.arange(len(sequence_lengths))
+    for position in range(int(sequence_lengths.max(initial=0))):
+        active = active[sequence_lengths[active] > position]
+        if position > 0:
+            thresholds = rng.random(len(active))
+            states[active] = np.argmax(cumulative[states[active]] > thresholds[:, np.newaxis], axis=1)
+        outputs[offsets[active] + position] = chain.outputs[states[active]]
+    return outputs, offsets
+
+
+def measure_solution_quality(
+    mc: MarkovChain | MarkovChainTable,
+    dfa: DFA | DfaTable,
+    attempts: int = 1000,
+    min_seq_len: int = 1,
+    max_seq_len: int = 20,
+    rng: np.random.Generator | None = None,
+) -> float:
+    """
+    Fraction of `attempts` sequences generated by the chain that the DFA accepts, with lengths uniform in
+    `[min_seq_len, max_seq_len]`. Outputs are looked up in the DFA table for all sequences at once; outputs outside
+    the alphabet of the DFA reject the sequence.
+    """
+
+    if rng is None:
+        rng = np.random.default_rng(42)
+
+    chain = mc if isinstance(mc, MarkovChainTable) else compile_markov_chain(mc=mc)
+    table = dfa if isinstance(dfa, DfaTable) else compile_dfa(dfa=dfa)
+
+    lengths = rng.integers(min_seq_len, max_seq_len + 1, size=attempts)
+    outputs, offsets = sample_sequences(chain=chain, lengths=lengths, rng=rng)
+
+    symbol_indices = {symbol: i for i, symbol in enumerate(table.alphabet)}
+    symbols = np.array([symbol_indices.get(output, -1) for output in chain.output_alphabet], dtype=np.int64)[outputs]
+    unknown = np.add.reduceat(symbols < 0, offsets[:-1]) > 0 if len(symbols) else np.zeros(attempts, dtype=np.bool_)
+    accepted = table.accepts_words(symbols=np.maximum(symbols, 0), offsets=offsets) & ~unknown
+    return float(accepted.sum() / attempts)
+
+
+def accepted_probabilities(
+    mc: MarkovChain | MarkovChainTable,
+    dfa: DFA | DfaTable,
+    max_seq_len: int = 20,
+) -> NDArray[np.float64]:
+    """
+    Exact probability that the DFA accepts the sequence the chain generates in `length` steps, for every length up to
+    `max_seq_len`. The distribution over the product of chain and DFA states is pushed forward one step at a time.
+    The DFA component of a step is determined by the output of the next chain state, so every nonzero chain
+    transition moves the mass of each DFA state to one product state. A step is a single `np.bincount` over the
+    (num_transitions, num_dfa_states) product edges, so it takes time and memory linear in the number of chain
+    transitions instead of quadratic in the number of chain states, without scipy's sparse matrices.
+    """
+
+    chain = mc if isinstance(mc, MarkovChainTable) else compile_markov_chain(mc=mc)
+    table = dfa if isinstance(dfa, DfaTable) else compile_dfa(dfa=dfa)
+
+    # Outputs outside the alphabet of the DFA lead to an extra rejecting sink.
+    sink = table.num_states
+    num_dfa_states = sink + 1
+    transitions = np.full((num_dfa_states, len(chain.output_alphabet)), sink, dtype=np.int64)
+    symbol_indices = {symbol: i for i, symbol in enumerate(table.alphabet)}
+    for output, symbol in enumerate(chain.output_alphabet):
+        if symbol in symbol_indices:
+            transitions[:sink, output] = table.transitions[:, symbol_indices[symbol]]
+    accepting = np.append(table.accepting, False)
+    # successors[chain_state, dfa_state] is the DFA state reached by reading the output of the chain state
+    successors = transitions[:, chain.outputs].T
+
+    sources, targets = np.nonzero(chain.probabilities)
+    weights = chain.probabilities[sources, targets][:, np.newaxis]
+    # Flat product state that every transition moves the mass of every DFA state to.
+    product_targets = (targets[:, np.newaxis] * num_dfa_states + successors[targets]).ravel()
+
+    distribution = np.zeros((chain.num_states, num_dfa_states), dtype=np.float64)
+    distribution[chain.initial_state, successors[chain.initial_state, table.initial_state]] = 1.0
+
+    probabilities = np.empty(max_seq_len + 1, dtype=np.float64)
+    probabilities[0] = distribution[:, accepting].sum()
+    for length in range(1, max_seq_len + 1):
+        distribution = np.bincount(
+            product_targets,
+            weights=(weights * distribution[sources]).ravel(),
+            minlength=distribution.size,
+        ).reshape(distribution.shape)
+        probabilities[length] = distribution[:, accepting].sum()
+    return probabilities
+
+
+def exact_solution_quality(
+    mc: MarkovChain | MarkovChainTable,
+    dfa: DFA | DfaTable,
+    min_seq_len: int = 1,
+    max_seq_len: int = 20,
+) -> float:
+    """The value `measure_solution_quality` estimates: the acceptance probability averaged over uniform lengths."""
+
+    probabilities = accepted_probabilities(mc=mc, dfa=dfa, max_seq_len=max_seq_len)
+    return float(probabilities[min_seq_len : max_seq_len + 1].mean())
@@ -0,0 +1,95 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from data_generation.streaming import random_rpni_benchmark_words, word_positions, WordChunk
+
+# Odd multiplier of the polynomial word hash, taken modulo 2**64 by uint64 overflow.
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def hash_words(symbols: NDArray[np.integer], offsets: NDArray[np.int64]) -> NDArray[np.uint64]:
+    """64-bit polynomial hash of every word."""
+
+    lengths = np.diff(offsets)
+    _, positions = word_positions(lengths=lengths)
+    with np.errstate(over="ignore"):
+        powers = np.cumprod(np.full(int(lengths.max(initial=0)) + 1, HASH_MULTIPLIER, dtype=np.uint64))
+        cumulative = np.zeros(len(symbols) + 1, dtype=np.uint64)
+        np.cumsum((symbols.astype(np.uint64) + np.uint64(1)) * powers[positions], out=cumulative[1:])
+        # Sums of the terms of every word; the subtraction wraps around like the sums do.
+        return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+
+def first_occurrences(symbols: NDArray[np.integer], offsets: NDArray[np.int64]) -> NDArray[np.bool_]:
+    """
+    Mask of the words that do not repeat an earlier word. Words are grouped by hash and length and every word is
+    compared symbol by symbol with the word before it in its group. A word equal to its predecessor is a repeat. A
+    group with two different neighbouring words holds a hash collision; its words are compared exactly in Python, so
+    neither a collision nor a repeat further down such a group is missed.
+    """
+
+    lengths = np.diff(offsets)
+    hashes = hash_words(symbols=symbols, offsets=offsets)
+    # lexsort is stable, so the words of a group stay in order of occurrence.
+    order = np.lexsort((lengths, hashes))
+    hashes, sorted_lengths = hashes[order], lengths[order]
+    same_group = (hashes[1:] == hashes[:-1]) & (sorted_lengths[1:] == sorted_lengths[:-1])
+    candidates = np.flatnonzero(same_group) + 1
+    words, previous_words = order[candidates], order[candidates - 1]
+
+    candidate_lengths = lengths[words]
+    _, positions = word_positions(lengths=candidate_lengths)
+    word_of_symbol = np.repeat(np.arange(len(words)), candidate_lengths)
+    word_symbols = symbols[offsets[words][word_of_symbol] + positions]
+    previous_symbols = symbols[offsets[previous_words][word_of_symbol] + positions]
+    differs = word_symbols != previous_symbols
+    different_words = np.bincount(word_of_symbol[differs], minlength=len(words)) > 0
+
+    keep = np.ones(len(lengths), dtype=np.bool_)
+    keep[words[~different_words]] = False
+
+    groups = np.cumsum(np.concatenate(([False], ~same_group)))
+    for group in np.unique(groups[candidates[different_words]]):
+        seen = set()
+        for word in order[groups == group]:
+            word_symbols = tuple(symbols[offsets[word] : offsets[word + 1]].tolist())
+            keep[word] = word_symbols not in seen
+            seen.add(word_symbols)
+    return keep
+
+
+def create_rpni_benchmark_sample(
+    alphabet_size: int,
+    num_examples: int,
+    min_seq_len: int = 1,
+    max_seq_len: int = 10,
+    positive_fraction: float = 0.5,
+    seed: int = 42,
+) -> WordChunk:
+    """
+    Seeded, vectorised counterpart of `create_rpni_benchmark_data` for any alphabet size, length range and sample
+    size: words that start with 0 are positive, all others negative. Lengths are uniform in `[min_seq_len,
+    max_seq_len]` and the words are drawn by `random_rpni_benchmark_words`, like the random words of
+    `rpni_benchmark_chunks`. Repeated words are dropped, so the sample can hold fewer than `num_examples` words, and
+    since a label depends only on its word, no two words conflict. Use `labelled_sequences()` for the tuple list of
+    the RPNI experiments, or `write_chunks_to_sample` for a `.npy` sample.
+    """
+
+    if alphabet_size < 2:
+        raise ValueError("Alphabet size must be at least 2")
+    if not 0 <= min_seq_len <= max_seq_len:
+        raise ValueError(f"Invalid word length range [{min_seq_len}, {max_seq_len}]")
+
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(min_seq_len, max_seq_len + 1, size=num_examples)
+    labels = rng.random(num_examples) < positive_fraction
+    words = random_rpni_benchmark_words(rng=rng, lengths=lengths, labels=labels, alphabet_size=alphabet_size)
+
+    keep = first_occurrences(symbols=words.symbols, offsets=words.offsets)
+    kept_offsets, _ = word_positions(lengths=lengths[keep])
+    return WordChunk(
+        alphabet=words.alphabet,
+        symbols=words.symbols[np.repeat(keep, lengths)],
+        offsets=kept_offsets,
+        labels=words.labels[keep],
+    )
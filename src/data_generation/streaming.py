@@ -0,0 +1,373 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+ChunkGenerator = Callable[[np.random.Generator, NDArray[np.int64]], "WordChunk"]
+
+
+def symbol_dtype(alphabet_size: int) -> type[np.unsignedinteger]:
+    if alphabet_size > np.iinfo(np.uint16).max + 1:
+        raise ValueError(f"Alphabets of at most 65536 symbols are supported, got {alphabet_size}")
+    return np.uint8 if alphabet_size <= np.iinfo(np.uint8).max + 1 else np.uint16
+
+
+@dataclass(eq=False)
+class WordChunk:
+    """
+    Labelled words as ids into `alphabet`, laid out like a `MappedSample`: word `i` is
+    `symbols[offsets[i]:offsets[i + 1]]` and its label is `labels[i]`.
+    """
+
+    alphabet: list[str]
+    symbols: NDArray[np.int64]
+    offsets: NDArray[np.int64]
+    labels: NDArray[np.bool_]
+
+    @property
+    def num_words(self) -> int:
+        return len(self.labels)
+
+    def text(self, label: bool) -> str:
+        """The words with the given label, one per line, as written by `save_data_to_file`."""
+
+        if any(len(symbol) != 1 for symbol in self.alphabet):
+            raise ValueError("Only alphabets of single characters can be written as text")
+        selected = self.labels == label
+        lengths = np.diff(self.offsets)[selected]
+        symbols = self.symbols[np.repeat(selected, np.diff(self.offsets))]
+
+        code_points = np.array([ord(symbol) for symbol in self.alphabet], dtype=np.uint32)
+        line_ends = np.cumsum(lengths + 1) - 1
+        buffer = np.full(len(symbols) + len(lengths), ord("\n"), dtype=np.uint32)
+        is_symbol = np.ones(len(buffer), dtype=np.bool_)
+        is_symbol[line_ends] = False
+        buffer[is_symbol] = code_points[symbols]
+        return buffer.tobytes().decode("utf-32-le")
+
+    def words(self, label: bool) -> list[str]:
+        return self.text(label=label).split("\n")[:-1]
+
+    def labelled_sequences(self) -> list[tuple[tuple[int, ...], bool]]:
+        """The words as tuples of symbol ids with their labels, the data format of the RPNI experiments."""
+
+        return [
+            (tuple(self.symbols[start:end].tolist()), bool(label))
+            for start, end, label in zip(self.offsets[:-1], self.offsets[1:], self.labels)
+        ]
+
+
+def chunk_rng(seed: int, chunk_index: int) -> np.random.Generator:
+    """
+    Independent random stream of a chunk. It depends only on the seed and the chunk index, so any subset of chunks
+    can be generated in any process and still reproduce the same data.
+    """
+
+    return np.random.default_rng(np.random.SeedSequence(entropy=seed, spawn_key=(chunk_index,)))
+
+
+def generate_chunks(
+    generate_chunk: ChunkGenerator,
+    num_words: int,
+    chunk_size: int,
+    seed: int,
+    start_chunk: int = 0,
+    stop_chunk: int | None = None,
+) -> Iterator[WordChunk]:
+    """
+    Splits `num_words` words into chunks of `chunk_size` words and yields the chunks from `start_chunk` up to
+    `stop_chunk`. `generate_chunk` receives the random stream of the chunk and the stream indices of its words.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+
+    num_chunks = -(-num_words // chunk_size)
+    stop_chunk = num_chunks if stop_chunk is None else min(stop_chunk, num_chunks)
+    for chunk_index in range(start_chunk, stop_chunk):
+        indices = np.arange(chunk_index * chunk_size, min((chunk_index + 1) * chunk_size, num_words), dtype=np.int64)
+        yield generate_chunk(chunk_rng(seed=seed, chunk_index=chunk_index), indices)
+
+
+def word_positions(lengths: NDArray[np.int64]) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Offsets of words with the given lengths and the position of every symbol within its word."""
+
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    positions = np.arange(offsets[-1], dtype=np.int64) - np.repeat(offsets[:-1], lengths)
+    return offsets, positions
+
+
+def a_and_b_alternately_chunks(
+    positive_data_size: int = 1000,
+    negative_data_size: int = 1000,
+    min_seq_len: int = 1,
+    max_seq_len: int = 20,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = 42,
+    start_chunk: int = 0,
+    stop_chunk: int | None = None,
+) -> Iterator[WordChunk]:
+    """
+    Streaming version of `a_and_b_alternately`: the positive words followed by the negative ones. Positive words are
+    the alternating words `abab...`, negative words start with `a` and are drawn uniformly among the rejected words of
+    their length. Lengths are uniform over the lengths that have such words, so exactly the requested number of words
+    is generated (`a_and_b_alternately` skips the draws of lengths without words).
+    """
+
+    if max_seq_len < max(min_seq_len, 2):
+        raise ValueError("Maximum sequence length must be at least 2 and at least the minimum sequence length")
+
+    def generate_chunk(rng: np.random.Generator, indices: NDArray[np.int64]) -> WordChunk:
+        labels = indices < positive_data_size
+        low = np.where(labels, max(min_seq_len, 1), max(min_seq_len, 2))
+        lengths = rng.integers(low, max_seq_len + 1)
+        offsets, positions = word_positions(lengths=lengths)
+
+        # A negative word leaves the alternation at a break position p >= 1, after which its symbols are arbitrary.
+        # There are 2^(length - p - 1) such words, so the number of arbitrary symbols k = length - p - 1 has weight
+        # 2^k for k in [0, length - 2]: length - 2 - k is a geometric variable truncated to the length.
+        breaks = np.zeros(len(lengths), dtype=np.int64)
+        pending = np.flatnonzero(~labels)
+        while len(pending):
+            fixed_symbols = rng.geometric(0.5, size=len(pending)) - 1
+            fits = fixed_symbols <= lengths[pending] - 2
+            breaks[pending[fits]] = 1 + fixed_symbols[fits]
+            pending = pending[~fits]
+
+        word_breaks = np.repeat(np.where(labels, lengths, breaks), lengths)
+        symbols = positions % 2
+        symbols[positions == word_breaks] ^= 1
+        arbitrary = positions > word_breaks
+        symbols[arbitrary] = rng.integers(0, 2, size=int(arbitrary.sum()))
+        return WordChunk(alphabet=["a", "b"], symbols=symbols, offsets=offsets, labels=labels)
+
+    return generate_chunks(
+        generate_chunk=generate_chunk,
+        num_words=positive_data_size + negative_data_size,
+        chunk_size=chunk_size,
+        seed=seed,
+        start_chunk=start_chunk,
+        stop_chunk=stop_chunk,
+    )
+
+
+def coin_toss_chunks(
+    n: int = 1000,
+    min_len: int = 5,
+    max_len: int = 12,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = 42,
+    start_chunk: int = 0,
+    stop_chunk: int | None = None,
+) -> Iterator[WordChunk]:
+    """
+    Streaming version of `coin_toss`. It yields the `n` complete words only, all labelled positive, without
+    the intermediate prefixes that `coin_toss` also emits.
+    """
+
+    def generate_chunk(rng: np.random.Generator, indices: NDArray[np.int64]) -> WordChunk:
+        lengths = rng.integers(min_len, max_len + 1, size=len(indices))
+        offsets, _ = word_positions(lengths=lengths)
+        symbols = rng.integers(0, 2, size=offsets[-1])
+        labels = np.ones(len(indices), dtype=np.bool_)
+        return WordChunk(alphabet=["H", "T"], symbols=symbols, offsets=offsets, labels=labels)
+
+    return generate_chunks(
+        generate_chunk=generate_chunk,
+        num_words=n,
+        chunk_size=chunk_size,
+        seed=seed,
+        start_chunk=start_chunk,
+        stop_chunk=stop_chunk,
+    )
+
+
+RPNI_MAX_SEQ_LEN = {
+    2: 17,
+    4: 12,
+    8: 11,
+    16: 10,
+    32: 9,
+    64: 5,
+}
+
+
+def random_rpni_benchmark_words(
+    rng: np.random.Generator,
+    lengths: NDArray[np.int64],
+    labels: NDArray[np.bool_],
+    alphabet_size: int,
+) -> WordChunk:
+    """
+    Random words of the RPNI benchmark language with the given lengths and labels: all symbols are drawn in one call,
+    then the first symbol is set to 0 for positive words and drawn from the other symbols for negative ones. Empty
+    words are negative whatever their label.
+    """
+
+    labels = labels & (lengths > 0)
+    offsets, _ = word_positions(lengths=lengths)
+    symbols = rng.integers(0, alphabet_size, size=offsets[-1])
+    first = offsets[:-1][lengths > 0]
+    first_labels = labels[lengths > 0]
+    symbols[first[first_labels]] = 0
+    symbols[first[~first_labels]] = rng.integers(1, alphabet_size, size=len(first) - int(first_labels.sum()))
+    return WordChunk(
+        alphabet=[str(symbol) for symbol in range(alphabet_size)],
+        symbols=symbols,
+        offsets=offsets,
+        labels=labels,
+    )
+
+
+def rpni_benchmark_chunks(
+    alphabet_size: int,
+    max_seq_len: int | None = None,
+    words_per_length: int = 100,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = 42,
+    start_chunk: int = 0,
+    stop_chunk: int | None = None,
+) -> Iterator[WordChunk]:
+    """
+    Streaming version of `create_rpni_benchmark_data`: every word of length at most 2, then `words_per_length`
+    positive and negative random words of each length from 3 below `max_seq_len`, alternately. Words starting with 0
+    are positive. The empty word is the empty tuple rather than `(None,)`. Any alphabet size and maximum length are
+    supported, the default length is the one `create_rpni_benchmark_data` uses.
+    """
+
+    if alphabet_size < 2:
+        raise ValueError("Alphabet size must be at least 2")
+    if max_seq_len is None:
+        if alphabet_size not in RPNI_MAX_SEQ_LEN:
+            raise ValueError(f"Maximum sequence length is required for an alphabet of size {alphabet_size}")
+        max_seq_len = RPNI_MAX_SEQ_LEN[alphabet_size]
+
+    alphabet = np.arange(alphabet_size, dtype=np.int64)
+    others = alphabet[1:]
+    short_words = (
+        [np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64)]
+        + [np.array([0, symbol]) for symbol in alphabet]
+        + [word for symbol in others for word in ([np.array([symbol])] + [np.array([symbol, s]) for s in alphabet])]
+    )
+    short_lengths = np.array([len(word) for word in short_words], dtype=np.int64)
+    short_symbols = np.concatenate(short_words).astype(np.int64)
+    short_offsets, _ = word_positions(lengths=short_lengths)
+    short_labels = np.array([len(word) > 0 and word[0] == 0 for word in short_words], dtype=np.bool_)
+    num_random_words = 2 * words_per_length * max(max_seq_len - 3, 0)
+
+    def generate_chunk(rng: np.random.Generator, indices: NDArray[np.int64]) -> WordChunk:
+        is_short = indices < len(short_words)
+        random_indices = indices - len(short_words)
+        labels = np.where(is_short, short_labels[np.minimum(indices, len(short_words) - 1)], random_indices % 2 == 0)
+        lengths = np.where(
+            is_short,
+            short_lengths[np.minimum(indices, len(short_words) - 1)],
+            3 + random_indices // (2 * words_per_length),
+        )
+        chunk = random_rpni_benchmark_words(rng=rng, lengths=lengths, labels=labels, alphabet_size=alphabet_size)
+
+        for word_index in np.flatnonzero(is_short):
+            index = indices[word_index]
+            start, end = short_offsets[index], short_offsets[index + 1]
+            chunk.symbols[chunk.offsets[word_index] : chunk.offsets[word_index + 1]] = short_symbols[start:end]
+        return chunk
+
+    return generate_chunks(
+        generate_chunk=generate_chunk,
+        num_words=len(short_words) + num_random_words,
+        chunk_size=chunk_size,
+        seed=seed,
+        start_chunk=start_chunk,
+        stop_chunk=stop_chunk,
+    )
+
+
+def write_chunks_to_text(chunks: Iterable[WordChunk], positive_file_path: str, negative_file_path: str) -> None:
+    """Appends the words of each chunk, as soon as it is generated, to files in the format of `save_data_to_file`."""
+
+    with open(f"data/{positive_file_path}.txt", "w") as positive_file, open(
+        f"data/{negative_file_path}.txt", "w"
+    ) as negative_file:
+        for chunk in chunks:
+            positive_file.write(chunk.text(label=True))
+            negative_file.write(chunk.text(label=False))
+
+
+def write_chunks_to_sample(chunks: Iterable[WordChunk], path: str, block_size: int = 1 << 22) -> None:
+    """
+    Writes the chunks as a sample readable by `open_sample`. The positive and negative words are appended to raw
+    files as the chunks are generated and copied into the sample arrays in blocks of `block_size` elements at the end,
+    so memory stays bounded by the chunk and block sizes.
+    """
+
+    os.makedirs(path, exist_ok=True)
+    raw_paths = {
+        (label, name): os.path.join(path, f"{name}.{'positive' if label else 'negative'}.raw")
+        for label in (True, False)
+        for name in ("symbols", "lengths")
+    }
+    counts = dict.fromkeys(raw_paths, 0)
+    alphabet: list[str] = []
+    files = {key: open(raw_path, "wb") for key, raw_path in raw_paths.items()}
+    try:
+        for chunk in chunks:
+            alphabet = chunk.alphabet
+            word_labels = np.repeat(chunk.labels, np.diff(chunk.offsets))
+            for label in (True, False):
+                arrays = {
+                    "symbols": chunk.symbols[word_labels == label].astype(symbol_dtype(alphabet_size=len(alphabet))),
+                    "lengths": np.diff(chunk.offsets)[chunk.labels == label],
+                }
+                for name, array in arrays.items():
+                    array.tofile(files[label, name])
+                    counts[label, name] += len(array)
+    finally:
+        for file in files.values():
+            file.close()
+
+    symbols_dtype = symbol_dtype(alphabet_size=len(alphabet))
+    num_positive = counts[True, "lengths"]
+    num_words = num_positive + counts[False, "lengths"]
+    symbols = np.lib.format.open_memmap(
+        os.path.join(path, "symbols.npy"),
+        mode="w+",
+        dtype=symbols_dtype,
+        shape=(counts[True, "symbols"] + counts[False, "symbols"],),
+    )
+    offsets = np.lib.format.open_memmap(
+        os.path.join(path, "offsets.npy"), mode="w+", dtype=np.int64, shape=(num_words + 1,)
+    )
+    labels = np.lib.format.open_memmap(os.path.join(path, "labels.npy"), mode="w+", dtype=np.bool_, shape=(num_words,))
+    labels[:num_positive] = True
+    labels[num_positive:] = False
+
+    symbol_position, word_position, total_length = 0, 0, 0
+    offsets[0] = 0
+    for label in (True, False):
+        for block in _read_blocks(raw_paths[label, "symbols"], dtype=symbols_dtype, block_size=block_size):
+            symbols[symbol_position : symbol_position + len(block)] = block
+            symbol_position += len(block)
+        for block in _read_blocks(raw_paths[label, "lengths"], dtype=np.int64, block_size=block_size):
+            offsets[word_position + 1 : word_position + 1 + len(block)] = total_length + np.cumsum(block)
+            total_length += int(block.sum())
+            word_position += len(block)
+
+    for array in (symbols, offsets, labels):
+        array.flush()
+    for raw_path in raw_paths.values():
+        os.remove(raw_path)
+    with open(os.path.join(path, "alphabet.json"), "w") as f:
+        json.dump(alphabet, f)
+
+
+def _read_blocks(raw_path: str, dtype: type, block_size: int) -> Iterator[np.ndarray]:
+    itemsize = np.dtype(dtype).itemsize
+    size = os.path.getsize(raw_path) // itemsize
+    for start in range(0, size, block_size):
+        yield np.fromfile(raw_path, dtype=dtype, count=min(block_size, size - start), offset=start * itemsize)
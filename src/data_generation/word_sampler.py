@@ -0,0 +1,106 @@
+import aalpy
+import numpy as np
+from automata.fa.dfa import DFA
+from numpy.typing import NDArray
+
+from data_generation.dfa_tables import compile_dfa, DfaTable
+from data_generation.streaming import WordChunk
+
+
+class WordSampler:
+    """
+    Draws words of a given length uniformly from the words a DFA accepts (or rejects, with `accepted=False`). It
+    precomputes `counts[length, state]`, the number of accepted words of each length from each state, and then picks
+    every symbol with probability proportional to the number of accepted continuations it leaves. Counts are floats,
+    so they do not overflow for long words over large alphabets.
+    """
+
+    def __init__(self, dfa: DFA | aalpy.Dfa | DfaTable, max_len: int, accepted: bool = True) -> None:
+        table = dfa if isinstance(dfa, DfaTable) else compile_dfa(dfa=dfa)
+        self.table = table if accepted else table.complement()
+        self.accepted = accepted
+        self.max_len = max_len
+
+        self.counts = np.zeros((max_len + 1, self.table.num_states), dtype=np.float64)
+        self.counts[0] = self.table.accepting
+        for length in range(1, max_len + 1):
+            self.counts[length] = self.counts[length - 1][self.table.transitions].sum(axis=1)
+
+    def num_words(self, length: int) -> float:
+        return float(self.counts[length, self.table.initial_state])
+
+    def sample_lengths(self, size: int, min_len: int, max_len: int, rng: np.random.Generator) -> NDArray[np.int64]:
+        """Lengths drawn uniformly among the lengths in `[min_len, max_len]` that have at least one word."""
+
+        lengths = np.arange(min_len, max_len + 1)
+        lengths = lengths[self.counts[lengths, self.table.initial_state] > 0]
+        if len(lengths) == 0:
+            raise ValueError(f"There are no words with lengths between {min_len} and {max_len}")
+        return rng.choice(lengths, size=size)
+
+    def sample(self, lengths: NDArray[np.int64], rng: np.random.Generator) -> WordChunk:
+        """
+        One uniformly random word of each of the given lengths, all drawn in parallel. The words are labelled with
+        whether the DFA accepts them.
+        """
+
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if len(lengths) and lengths.max() > self.max_len:
+            raise ValueError(f"Words longer than {self.max_len} cannot be sampled")
+        if np.any(self.counts[lengths, self.table.initial_state] == 0):
+            raise ValueError("Some of the lengths have no words")
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        symbols = np.empty(offsets[-1], dtype=np.int64)
+        states = np.full(len(lengths), self.table.initial_state, dtype=np.int64)
+        active = np.arange(len(lengths))
+        for position in range(int(lengths.max(initial=0))):
+            active = active[lengths[active] > position]
+            remaining = lengths[active] - position - 1
+            next_states = self.table.transitions[states[active]]
+            cumulative = np.cumsum(self.counts[remaining[:, np.newaxis], next_states], axis=1)
+            thresholds = rng.random(len(active)) * cumulative[:, -1]
+            chosen = np.argmax(cumulative > thresholds[:, np.newaxis], axis=1)
+            symbols[offsets[active] + position] = chosen
+            states[active] = next_states[np.arange(len(active)), chosen]
+
+        return WordChunk(
+            alphabet=[str(symbol) for symbol in self.table.alphabet],
+            symbols=symbols,
+            offsets=offsets,
+            labels=np.full(len(lengths), self.accepted, dtype=np.bool_),
+        )
+
+
+def sample_words(
+    dfa: DFA | aalpy.Dfa | DfaTable,
+    positive_data_size: int = 1000,
+    negative_data_size: int = 1000,
+    min_seq_len: int = 1,
+    max_seq_len: int = 20,
+    rng: np.random.Generator | None = None,
+    negative_dfa: DFA | aalpy.Dfa | DfaTable | None = None,
+) -> tuple[list[str], list[str]]:
+    """
+    Positive and negative words of any regular language, in the format of `a_and_b_alternately`. Lengths are uniform
+    over the lengths with words and words are uniform within their length. With a `negative_dfa`, negative words are
+    drawn from the words it accepts instead of from all the words `dfa` rejects.
+    """
+
+    if rng is None:
+        rng = np.random.default_rng(42)
+
+    table = dfa if isinstance(dfa, DfaTable) else compile_dfa(dfa=dfa)
+    samplers = [WordSampler(dfa=table, max_len=max_seq_len)]
+    if negative_dfa is None:
+        samplers.append(WordSampler(dfa=table, max_len=max_seq_len, accepted=False))
+    else:
+        samplers.append(WordSampler(dfa=negative_dfa, max_len=max_seq_len))
+
+    data = []
+    for size, sampler in zip((positive_data_size, negative_data_size), samplers):
+        lengths = sampler.sample_lengths(size=size, min_len=min_seq_len, max_len=max_seq_len, rng=rng)
+        data.append(sampler.sample(lengths=lengths, rng=rng).words(label=sampler.accepted))
+    positive, negative = data
+    return positive, negative
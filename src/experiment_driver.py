@@ -0,0 +1,39 @@
+from experiments.orchestrator import aggregate_results, ExperimentGrid, ResultStore, run_experiment
+
+NUM_OF_RUNS = 50
+
+GRIDS = [
+    ExperimentGrid(
+        learner="gig",
+        dataset=dataset,
+        parameters={"initial_population_func": ["initialize_population", "initialize_random_population"]},
+        seeds=list(range(NUM_OF_RUNS)),
+    )
+    # Like the GIG driver, leaves out one_is_third_from_end: it has no test words to measure quality on.
+    for dataset in ["at_least_one_a", "even_number_of_as", "even_number_of_as_or_bs"]
+] + [
+    ExperimentGrid(
+        learner="rpni",
+        dataset="create_rpni_benchmark_data",
+        parameters={"alphabet_size": [2, 4, 8, 16, 32, 64]},
+        seeds=list(range(NUM_OF_RUNS)),
+    ),
+    ExperimentGrid(
+        learner="alergia",
+        dataset="a_and_b_alternately",
+        dataset_parameters={"positive_data_size": 1000, "negative_data_size": 1000, "min_seq_len": 1},
+        parameters={"noise_percentage": [0.0, 0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5]},
+        seeds=list(range(NUM_OF_RUNS)),
+    ),
+]
+
+
+def run_experiments(grids: list[ExperimentGrid], max_workers: int | None = None) -> None:
+    store = ResultStore()
+    for grid in grids:
+        results = run_experiment(grid=grid, store=store, max_workers=max_workers)
+        print(aggregate_results(grid=grid, results=results))
+
+
+if __name__ == "__main__":
+    run_experiments(grids=GRIDS)
@@ -0,0 +1,131 @@
+import random
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable
+
+from aalpy import MarkovChain, run_Alergia
+
+from data_generation import datasets
+from data_generation.transformations import add_noise
+from gig import genetic_operations
+from gig.fitness import encode_sample
+from gig.fitness_cache import FitnessCache
+from gig.mca import construct_mca
+from gig.sample_trie import compile_sample_trie
+from gig_driver import run_gig
+from rpni.pta import build_prefix_tree
+from rpni_driver import count_pta_states, PrefixTreeRPNI
+
+Metrics = dict[str, float]
+LearnerFunction = Callable[[Callable[..., Any], dict[str, Any], dict[str, Any], int], Metrics]
+
+
+@dataclass(frozen=True)
+class Learner:
+    """
+    How to run one experiment cell of a learner, and how its results are labelled in the tables the drivers print.
+    The learner function gets the dataset function, its keyword arguments, the learner parameters and the seed.
+    """
+
+    run: LearnerFunction
+    parameter_labels: dict[str, str]
+    metric_labels: dict[str, str]
+
+
+def run_gig_cell(
+    dataset: Callable[..., Any],
+    dataset_parameters: dict[str, Any],
+    parameters: dict[str, Any],
+    seed: int,
+) -> Metrics:
+    train_plus, train_minus, test_plus, test_minus = dataset(**dataset_parameters)
+    mca = construct_mca(s_plus=train_plus)
+    train_sample = encode_sample(s_plus=train_plus, s_minus=train_minus, alphabet=mca.alphabet)
+    test_sample = encode_sample(s_plus=test_plus, s_minus=test_minus, alphabet=mca.alphabet)
+
+    run = run_gig(
+        mca=mca,
+        train_sample=compile_sample_trie(sample=train_sample),
+        test_sample=compile_sample_trie(sample=test_sample),
+        initial_population_func=getattr(genetic_operations, parameters["initial_population_func"]),
+        seed=seed,
+        fitness_cache=FitnessCache(),
+    )
+    quality, tp, tn, fp, fn = run.quality
+    return {
+        "generations": run.generations,
+        "best_solution_generation": run.best_solution_generation,
+        "quality": quality,
+        "tp": tp,
+        "tn": tn,
+        "fp": fp,
+        "fn": fn,
+    }
+
+
+def run_rpni_cell(
+    dataset: Callable[..., Any],
+    dataset_parameters: dict[str, Any],
+    parameters: dict[str, Any],
+    seed: int,
+) -> Metrics:
+    random.seed(seed)
+    data = dataset(alphabet_size=parameters["alphabet_size"], **dataset_parameters)
+    pta = build_prefix_tree(data=data)
+    pta_state_count = count_pta_states(data=pta)
+
+    rpni = PrefixTreeRPNI(pta=pta)
+    start = perf_counter()
+    model = rpni.run_rpni()
+    end = perf_counter()
+
+    if model is None:
+        raise ValueError("Data provided to RPNI is not deterministic. Ensure that the data is deterministic.")
+    return {"examples": len(data), "pta_states": pta_state_count, "states": len(model.states), "time": end - start}
+
+
+def run_alergia_cell(
+    dataset: Callable[..., Any],
+    dataset_parameters: dict[str, Any],
+    parameters: dict[str, Any],
+    seed: int,
+) -> Metrics:
+    positive, negative = dataset(**dataset_parameters)
+    rnd = random.Random(seed)
+
+    data = add_noise(positive=positive, negative=negative, noise_percentage=parameters["noise_percentage"], rnd=rnd)
+    mc: MarkovChain = run_Alergia(data=data, automaton_type="mc", print_info=False)
+    quality = datasets.exact_a_and_b_alternately_solution_quality(automaton=mc)
+    return {"quality": quality, "states": len(mc.states)}
+
+
+LEARNERS = {
+    "gig": Learner(
+        run=run_gig_cell,
+        parameter_labels={"initial_population_func": "Initial Population Function"},
+        metric_labels={
+            "generations": "Average Generations",
+            "best_solution_generation": "Average Best Solution Generation",
+            "quality": "Average Quality",
+            "tp": "Average TP",
+            "tn": "Average TN",
+            "fp": "Average FP",
+            "fn": "Average FN",
+        },
+    ),
+    "rpni": Learner(
+        run=run_rpni_cell,
+        parameter_labels={"alphabet_size": "Alphabet size"},
+        metric_labels={
+            "examples": "Number of examples",
+            "pta_states": "PTA states",
+            "states": "Number of states",
+            "time": "Time",
+        },
+    ),
+    "alergia": Learner(
+        run=run_alergia_cell,
+        parameter_labels={"noise_percentage": "Noise percentage"},
+        metric_labels={"quality": "Quality", "states": "Number of states"},
+    ),
+}
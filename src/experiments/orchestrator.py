@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Any
+
+from tabulate import tabulate
+
+from data_generation import datasets
+from experiments.learners import LEARNERS, Metrics
+
+SOURCE_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass(frozen=True)
+class ExperimentCell:
+    learner: str
+    dataset: str
+    dataset_parameters: tuple[tuple[str, Any], ...]
+    parameters: tuple[tuple[str, Any], ...]
+    seed: int
+
+    def key(self, code_version: str) -> str:
+        """Content address of the cell: a hash of all of its inputs and of the code that computes it."""
+
+        inputs = {
+            "learner": self.learner,
+            "dataset": self.dataset,
+            "dataset_parameters": dict(self.dataset_parameters),
+            "parameters": dict(self.parameters),
+            "seed": self.seed,
+            "code_version": code_version,
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass
+class ExperimentGrid:
+    """Every combination of the parameter values, run once per seed, on one dataset function of `datasets`."""
+
+    learner: str
+    dataset: str
+    parameters: dict[str, list[Any]]
+    seeds: list[int]
+    dataset_parameters: dict[str, Any] = field(default_factory=dict)
+
+    def cells(self) -> list[ExperimentCell]:
+        names = list(self.parameters)
+        return [
+            ExperimentCell(
+                learner=self.learner,
+                dataset=self.dataset,
+                dataset_parameters=tuple(sorted(self.dataset_parameters.items())),
+                parameters=tuple(zip(names, values)),
+                seed=seed,
+            )
+            for values in product(*self.parameters.values())
+            for seed in self.seeds
+        ]
+
+
+class ResultStore:
+    """Metrics of computed cells, one JSON file per cell named after the cell key."""
+
+    def __init__(self, directory: str = "data/experiments") -> None:
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Metrics | None:
+        path = self._path(key=key)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)["metrics"]
+
+    def put(self, key: str, cell: ExperimentCell, metrics: Metrics) -> None:
+        path = self._path(key=key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "learner": cell.learner,
+            "dataset": cell.dataset,
+            "dataset_parameters": dict(cell.dataset_parameters),
+            "parameters": dict(cell.parameters),
+            "seed": cell.seed,
+            "metrics": metrics,
+        }
+        temporary_path = path.with_suffix(".tmp")
+        with open(temporary_path, "w") as f:
+            json.dump(record, f, indent=2)
+        os.replace(temporary_path, path)
+
+
+def code_version(root: Path = SOURCE_ROOT) -> str:
+    """Hash of every Python source file, so that changing the code invalidates the stored results."""
+
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def run_cell(cell: ExperimentCell) -> Metrics:
+    learner = LEARNERS[cell.learner]
+    return learner.run(
+        getattr(datasets, cell.dataset),
+        dict(cell.dataset_parameters),
+        dict(cell.parameters),
+        cell.seed,
+    )
+
+
+def run_experiment(
+    grid: ExperimentGrid,
+    store: ResultStore,
+    max_workers: int | None = None,
+    version: str | None = None,
+) -> dict[ExperimentCell, Metrics]:
+    """
+    Returns the metrics of every cell of the grid. Cells already in the store are reused, the others are computed
+    over `max_workers` processes (all cores by default) and stored as soon as they finish.
+    """
+
+    version = version if version is not None else code_version()
+    cells = grid.cells()
+    keys = {cell: cell.key(code_version=version) for cell in cells}
+
+    results: dict[ExperimentCell, Metrics] = {}
+    missing = []
+    for cell in cells:
+        metrics = store.get(key=keys[cell])
+        if metrics is None:
+            missing.append(cell)
+        else:
+            results[cell] = metrics
+    print(f"Experiment {grid.learner}/{grid.dataset}: {len(results)} cells cached, {len(missing)} to compute")
+
+    max_workers = max_workers if max_workers is not None else os.cpu_count() or 1
+    if max_workers == 1 or len(missing) <= 1:
+        for cell in missing:
+            metrics = run_cell(cell=cell)
+            store.put(key=keys[cell], cell=cell, metrics=metrics)
+            results[cell] = metrics
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for cell, metrics in zip(missing, executor.map(run_cell, missing)):
+                store.put(key=keys[cell], cell=cell, metrics=metrics)
+                results[cell] = metrics
+
+    return {cell: results[cell] for cell in cells}
+
+
+def aggregate_results(grid: ExperimentGrid, results: dict[ExperimentCell, Metrics]) -> str:
+    """Averages the metrics over the seeds of every parameter combination into a table like the drivers print."""
+
+    learner = LEARNERS[grid.learner]
+    sums: dict[tuple[tuple[str, Any], ...], dict[str, float]] = {}
+    counts: dict[tuple[tuple[str, Any], ...], int] = {}
+    for cell, metrics in results.items():
+        row_sums = sums.setdefault(cell.parameters, dict.fromkeys(learner.metric_labels, 0.0))
+        for metric in learner.metric_labels:
+            row_sums[metric] += metrics[metric]
+        counts[cell.parameters] = counts.get(cell.parameters, 0) + 1
+
+    rows = [
+        (*(value for _, value in parameters), *(total / counts[parameters] for total in row_sums.values()))
+        for parameters, row_sums in sums.items()
+    ]
+    headers = [learner.parameter_labels.get(name, name) for name in grid.parameters]
+    headers += list(learner.metric_labels.values())
+    return tabulate(rows, headers=headers, tablefmt="grid")
@@ -0,0 +1,188 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pygad
+from numpy.typing import NDArray
+
+from gig.fitness_cache import BatchFitnessFunction, cached_fitness_function, FitnessCache
+from gig.mca import MCA, pad_transitions, quotient_transitions, reduce_mca, Transitions
+from gig.sample_trie import count_true_verdicts, run_trie, SampleTrie
+
+if TYPE_CHECKING:
+    from gig.pruning import FitnessPruning
+
+
+@dataclass(eq=False)
+class EncodedSample:
+    """
+    Words encoded against an MCA alphabet as a padded (n_words, max_len) symbol matrix.
+    Padding uses symbol `alphabet_size`, which every automaton treats as a self-loop.
+    Words containing symbols outside of the alphabet are marked as not `valid` and are never accepted.
+    """
+
+    symbols: NDArray[np.int_]
+    lengths: NDArray[np.int_]
+    labels: NDArray[np.bool_]
+    valid: NDArray[np.bool_]
+
+    @property
+    def num_words(self) -> int:
+        return int(self.symbols.shape[0])
+
+
+def encode_sample(s_plus: list[str], s_minus: list[str], alphabet: dict[str, int]) -> EncodedSample:
+    words = s_plus + s_minus
+    pad_symbol = len(alphabet)
+    lengths = np.array([len(word) for word in words], dtype=np.int_)
+    max_len = int(lengths.max(initial=0))
+
+    symbols = np.full((len(words), max_len), pad_symbol, dtype=np.int_)
+    valid = np.ones(len(words), dtype=np.bool_)
+    for i, word in enumerate(words):
+        encoded = [alphabet.get(symbol, -1) for symbol in word]
+        if -1 in encoded:
+            valid[i] = False
+            continue
+        symbols[i, : len(encoded)] = encoded
+
+    labels = np.zeros(len(words), dtype=np.bool_)
+    labels[: len(s_plus)] = True
+    return EncodedSample(symbols=symbols, lengths=lengths, labels=labels, valid=valid)
+
+
+def accepts_sample(automaton: MCA, sample: EncodedSample) -> NDArray[np.bool_]:
+    """Runs every word of the sample through the automaton at once, one symbol column at a time."""
+
+    padded_transitions = pad_transitions(transitions=automaton.transitions)
+    states = np.full(sample.num_words, automaton.initial_state, dtype=np.int_)
+    for column in sample.symbols.T:
+        states = padded_transitions[states, column]
+    return automaton.final_states[states] & sample.valid
+
+
+def evaluate_partition(mca: MCA, partition: NDArray[np.int_], sample: EncodedSample) -> NDArray[np.bool_]:
+    """Accept/reject verdict of the quotient automaton for every word of the sample."""
+
+    return accepts_sample(automaton=reduce_mca(mca=mca, partition=partition), sample=sample)
+
+
+def evaluate_population(mca: MCA, partitions: NDArray[np.int_], sample: EncodedSample) -> NDArray[np.bool_]:
+    """
+    Accept/reject verdicts of shape (population_size, n_words). The quotient automata of all partitions are stacked
+    into one transition table and every individual is advanced over the sample in lock-step.
+    Follows `reduce_mca` semantics, including the last-writer rule for conflicting transitions.
+    """
+
+    initial_states, transitions, final_states = stack_quotients(mca=mca, partitions=partitions)
+    padded_transitions = pad_transitions(transitions=transitions)
+
+    states = np.repeat(initial_states[:, np.newaxis], sample.num_words, axis=1)
+    for column in sample.symbols.T:
+        states = padded_transitions[states, column]
+    return final_states[states] & sample.valid
+
+
+def evaluate_population_trie(mca: MCA, partitions: NDArray[np.int_], trie: SampleTrie) -> NDArray[np.bool_]:
+    """Accept/reject verdicts of shape (population_size, num_nodes), like `evaluate_population` for a trie."""
+
+    initial_states, transitions, final_states = stack_quotients(mca=mca, partitions=partitions)
+    return final_states[run_trie(transitions=transitions, initial_states=initial_states, trie=trie)]
+
+
+def stack_quotients(
+    mca: MCA,
+    partitions: NDArray[np.int_],
+) -> tuple[NDArray[np.int_], Transitions, NDArray[np.bool_]]:
+    """
+    Initial states, transitions and final states of the quotient automata of all partitions, stacked into one table
+    in which every individual has its own range of group ids. The table is sparse when the MCA table is.
+    """
+
+    population_size, num_states = partitions.shape
+    stride = int(partitions.max(initial=0)) + 1
+    row_offsets = np.arange(population_size, dtype=np.int_)[:, np.newaxis] * stride
+    _, flat_labels = np.unique(partitions + row_offsets, return_inverse=True)
+    flat_labels = flat_labels.ravel()
+    labels = flat_labels.reshape(population_size, num_states)
+
+    _, first_from_end = np.unique(flat_labels[::-1], return_index=True)
+    last_rows, last_states = np.divmod(flat_labels.size - 1 - first_from_end, num_states)
+    num_groups = len(last_states)
+
+    transitions = quotient_transitions(
+        transitions=mca.transitions,
+        members=last_states,
+        labels=labels,
+        member_rows=last_rows,
+    )
+    weights = np.tile(mca.final_states, population_size)
+    final_states = np.bincount(flat_labels, weights=weights, minlength=num_groups) > 0
+    return labels[:, mca.initial_state], transitions, final_states
+
+
+def calculate_unique_groups_points(solutions: NDArray[np.int_]) -> NDArray[np.floating]:
+    population_size, num_states = solutions.shape
+    stride = int(solutions.max(initial=0)) + 1
+    row_offsets = np.arange(population_size)[:, np.newaxis] * stride
+    group_counts = np.bincount((solutions + row_offsets).ravel(), minlength=population_size * stride)
+    unique_groups_points = group_counts.reshape(population_size, stride).max(axis=1) / num_states
+    return unique_groups_points
+
+
+def calculate_data_points(
+    accepted: NDArray[np.bool_],
+    sample: EncodedSample | SampleTrie,
+) -> NDArray[np.floating]:
+    if isinstance(sample, SampleTrie):
+        true_positives, true_negatives = count_true_verdicts(accepted=accepted, trie=sample)
+        corrct_answers = true_positives + true_negatives
+    else:
+        corrct_answers = np.count_nonzero(accepted == sample.labels, axis=1)
+
+    data_points = corrct_answers / sample.num_words
+    return data_points
+
+
+def create_fitness_function(
+    mca: MCA,
+    train_sample: EncodedSample | SampleTrie,
+    fitness_cache: FitnessCache,
+    pruning: "FitnessPruning | None" = None,
+) -> BatchFitnessFunction:
+    """
+    Batched pygad fitness function of GIG: training data agreement weighted 3:1 against the largest group size.
+    A `SampleTrie` training sample walks every shared prefix once.
+    With `pruning`, candidates that cannot reach the pruning threshold get a lower-bound fitness, returned masked
+    so that it is not cached.
+    """
+
+    def fitness_function(
+        ga_instance: pygad.GA,
+        solutions: NDArray[np.int_],
+        _solution_indices: list[int],
+    ) -> NDArray[np.floating]:
+        unique_groups_points = calculate_unique_groups_points(solutions=solutions)
+        threshold = pruning.threshold(ga_instance=ga_instance) if pruning is not None else None
+        if pruning is not None and threshold is not None:
+            corrct_answers, pruned = pruning.correct_counts(
+                mca=mca,
+                partitions=solutions,
+                sample=train_sample,
+                unique_groups_points=unique_groups_points,
+                threshold=threshold,
+            )
+            fitness = (corrct_answers / train_sample.num_words * 3 + unique_groups_points) * 1000
+            return np.ma.MaskedArray(fitness, mask=pruned)
+
+        if isinstance(train_sample, SampleTrie):
+            accepted = evaluate_population_trie(mca=mca, partitions=solutions, trie=train_sample)
+        else:
+            accepted = evaluate_population(mca=mca, partitions=solutions, sample=train_sample)
+
+        data_points = calculate_data_points(accepted=accepted, sample=train_sample)
+
+        fitness = data_points * 3 + unique_groups_points
+        return fitness * 1000
+
+    return cached_fitness_function(fitness_function=fitness_function, cache=fitness_cache)
@@ -0,0 +1,116 @@
+import sys
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+import pygad
+from numpy.typing import NDArray
+
+from gig.genetic_operations import canonicalize_population
+
+BatchFitnessFunction = Callable[[pygad.GA, NDArray[np.int_], list[int]], NDArray[np.floating]]
+
+
+class FitnessCache:
+    """
+    LRU cache of fitness values keyed by canonical partition bytes. Fitness depends only on the partition and the
+    training data, so one cache can be shared by every GA run on the same MCA.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[bytes, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"FitnessCache(entries={len(self)}, nbytes={self.nbytes}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: bytes) -> float | None:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: float) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._entries[key] = value
+            return
+
+        entry_size = _entry_size(key=key, value=value)
+        if entry_size > self.max_bytes:
+            return
+
+        self._entries[key] = value
+        self.nbytes += entry_size
+        while self.nbytes > self.max_bytes:
+            evicted_key, evicted_value = self._entries.popitem(last=False)
+            self.nbytes -= _entry_size(key=evicted_key, value=evicted_value)
+            self.evictions += 1
+
+
+def _entry_size(key: bytes, value: float) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+def partition_keys(partitions: NDArray[np.int_]) -> list[bytes]:
+    canonical = canonicalize_population(partitions=partitions)
+    key_dtype = np.min_scalar_type(max(partitions.shape[1] - 1, 0))
+    return [row.tobytes() for row in canonical.astype(key_dtype)]
+
+
+def cached_fitness_function(fitness_function: BatchFitnessFunction, cache: FitnessCache) -> BatchFitnessFunction:
+    """
+    Wraps a batched pygad fitness function so that only partitions missing from the cache are evaluated.
+    Masked values returned by the wrapped function are lower bounds, which are passed on but not cached.
+    """
+
+    def wrapper(
+        ga_instance: pygad.GA,
+        solutions: NDArray[np.int_],
+        solution_indices: list[int],
+    ) -> NDArray[np.floating]:
+        keys = partition_keys(partitions=solutions)
+        fitness = np.empty(len(keys), dtype=np.float64)
+
+        missing: dict[bytes, list[int]] = {}
+        for i, key in enumerate(keys):
+            if key in missing:
+                missing[key].append(i)
+                continue
+            value = cache.get(key)
+            if value is None:
+                missing[key] = [i]
+            else:
+                fitness[i] = value
+
+        if missing:
+            first_rows = [rows[0] for rows in missing.values()]
+            computed = fitness_function(ga_instance, solutions[first_rows], [solution_indices[i] for i in first_rows])
+            bounded = np.ma.getmaskarray(computed)
+            for (key, rows), value, is_bound in zip(missing.items(), np.ma.getdata(computed), bounded):
+                fitness[rows] = value
+                if not is_bound:
+                    cache.put(key=key, value=float(value))
+
+        return fitness
+
+    return wrapper
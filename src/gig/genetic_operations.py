@@ -1,4 +1,3 @@
-import random
 from itertools import combinations
 
 import numpy as np
@@ -6,16 +5,36 @@ import pygad
 from numpy.typing import NDArray
 
 
-def initialize_random_population(num_states: int, population_size: int) -> NDArray[np.int_]:
-    population = np.zeros((population_size, num_states), dtype=np.int_)
-    for i in range(population_size):
-        partition = np.array([random.randint(0, num_states - 1) for _ in range(num_states)], dtype=np.int_)
-        population[i] = canonicalize_partition(partition)
+def get_rng(ga_instance: pygad.GA) -> np.random.Generator:
+    """Generator driving the genetic operators of a GA run. Created on first use from the run's `random_seed`."""
+
+    rng = getattr(ga_instance, "gig_rng", None)
+    if rng is None:
+        rng = np.random.default_rng(ga_instance.random_seed)
+        ga_instance.gig_rng = rng
+    return rng
+
+
+def initialize_random_population(
+    num_states: int,
+    population_size: int,
+    rng: np.random.Generator | None = None,
+) -> NDArray[np.int_]:
+    if rng is None:
+        rng = np.random.default_rng()
+
+    population = rng.integers(0, num_states, size=(population_size, num_states), dtype=np.int_)
+    return canonicalize_population(partitions=population)
 
-    return population
 
+def initialize_population(
+    num_states: int,
+    population_size: int,
+    rng: np.random.Generator | None = None,
+) -> NDArray[np.int_]:
+    if rng is None:
+        rng = np.random.default_rng()
 
-def initialize_population(num_states: int, population_size: int) -> NDArray[np.int_]:
     population = np.zeros((population_size, num_states), dtype=np.int_)
 
     population[0] = np.arange(num_states, dtype=np.int_)
@@ -30,75 +49,70 @@ def initialize_population(num_states: int, population_size: int) -> NDArray[np.i
         partition[state2] = partition[state1]
         fixed_partitions.append(canonicalize_partition(partition))
 
-    for i, partition in enumerate(fixed_partitions, start=1):  # type: ignore[assignment]
+    for i, partition in enumerate(fixed_partitions, start=1):
         population[i] = partition
 
-    for i in range(len(fixed_partitions) + 1, population_size):
-        partition = np.array(  # type: ignore[assignment]
-            [random.randint(0, num_states - 1) for _ in range(num_states)],
-            dtype=np.int_,
-        )
-        population[i] = canonicalize_partition(partition)
+    num_random_partitions = population_size - len(fixed_partitions) - 1
+    if num_random_partitions > 0:
+        random_partitions = rng.integers(0, num_states, size=(num_random_partitions, num_states), dtype=np.int_)
+        population[len(fixed_partitions) + 1 :] = canonicalize_population(partitions=random_partitions)
 
     return population
 
 
-def mutation_func(offspring: NDArray[np.int_], _ga_instance: pygad.GA) -> NDArray[np.int_]:
+def mutation_func(offspring: NDArray[np.int_], ga_instance: pygad.GA) -> NDArray[np.int_]:
+    """Moves one random state of 1% of the offspring to a random existing group or to a new one."""
+
+    rng = get_rng(ga_instance)
     population_size, num_states = offspring.shape
     num_to_mutate = max(1, int(0.01 * population_size))
 
-    indices_to_mutate = random.sample(range(population_size), num_to_mutate)
-    mutated_offspring = offspring.copy()
-
-    for idx in indices_to_mutate:
-        state_idx = random.randint(0, num_states - 1)
-        individual = mutated_offspring[idx]
-        existing_groups = list(set(individual))
-        new_group = random.choice(existing_groups + [max(existing_groups) + 1])
-        individual[state_idx] = new_group
-        mutated_offspring[idx] = canonicalize_partition(partition=individual)
+    indices_to_mutate = rng.choice(population_size, size=num_to_mutate, replace=False)
+    state_indices = rng.integers(0, num_states, size=num_to_mutate)
+    individuals = canonicalize_population(partitions=offspring[indices_to_mutate])
+    new_groups = rng.integers(0, individuals.max(axis=1) + 2)
+    individuals[np.arange(num_to_mutate), state_indices] = new_groups
 
+    mutated_offspring = offspring.copy()
+    mutated_offspring[indices_to_mutate] = canonicalize_population(partitions=individuals)
     return mutated_offspring
 
 
 def crossover_func(
     parents: NDArray[np.int_],
     offspring_size: tuple[int, int],
-    _ga_instance: pygad.GA,
+    ga_instance: pygad.GA,
 ) -> NDArray[np.int_]:
-    offspring = []
-    for _ in range(offspring_size[0]):
-        parent1, parent2 = parents[random.sample(range(len(parents)), 2)]
+    """Uniform crossover of two distinct random parents per child, taking every gene from either with equal odds."""
 
-        num_genes = offspring_size[1]
-        child = np.zeros(num_genes, dtype=parent1.dtype)
+    rng = get_rng(ga_instance)
+    num_offspring, num_genes = offspring_size
+    num_parents = len(parents)
 
-        group_mapping = {}
-        next_group = 1
-        for gene_idx in range(num_genes):
-            chosen_parent = parent1 if random.random() < 0.5 else parent2
-            group = chosen_parent[gene_idx]
+    first_parents = rng.integers(0, num_parents, size=num_offspring)
+    second_parents = (first_parents + rng.integers(1, num_parents, size=num_offspring)) % num_parents
+    from_first_parent = rng.random((num_offspring, num_genes)) < 0.5
 
-            if group not in group_mapping:
-                group_mapping[group] = next_group
-                next_group += 1
-            child[gene_idx] = group_mapping[group]
+    offspring = np.where(from_first_parent, parents[first_parents], parents[second_parents])
+    return canonicalize_population(partitions=offspring)
 
-        child = canonicalize_partition(partition=child)
-        offspring.append(child)
 
-    return np.array(offspring)
+def canonicalize_partition(partition: NDArray[np.int_]) -> NDArray[np.int_]:
+    return canonicalize_population(partitions=np.asarray(partition, dtype=np.int_)[np.newaxis])[0]
 
 
-def canonicalize_partition(partition: NDArray[np.int_]) -> NDArray[np.int_]:
-    group_map = {}
-    next_group = 0
-    canonical_partition = []
+def canonicalize_population(partitions: NDArray[np.int_]) -> NDArray[np.int_]:
+    """Canonicalizes every row of the matrix at once: groups are renumbered in order of their first occurrence."""
 
-    for group in partition:
-        if group not in group_map:
-            group_map[group] = next_group
-            next_group += 1
-        canonical_partition.append(group_map[group])
+    population_size, num_states = partitions.shape
+    stride = int(partitions.max(initial=0)) + 1
+    row_offsets = np.arange(population_size, dtype=np.int_)[:, np.newaxis] * stride
+    _, first_indices, labels = np.unique(partitions + row_offsets, return_index=True, return_inverse=True)
 
-    return np.array(canonical_partition, dtype=np.int_)
+    group_rows = first_indices // num_states
+    ranks = np.empty(len(first_indices), dtype=np.int_)
+    ranks[np.argsort(first_indices)] = np.arange(len(first_indices))
+    groups_per_row = np.bincount(group_rows, minlength=population_size)
+    row_starts = np.cumsum(groups_per_row) - groups_per_row
+    canonical_labels = ranks - row_starts[group_rows]
+    return canonical_labels[labels.reshape(population_size, num_states)]
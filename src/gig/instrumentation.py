@@ -0,0 +1,161 @@
+import csv
+import json
+import time
+from dataclasses import asdict, dataclass, fields
+from types import TracebackType
+from typing import Any, Callable, TextIO
+
+import numpy as np
+import pygad
+from numpy.typing import NDArray
+
+from gig.fitness_cache import BatchFitnessFunction, FitnessCache, partition_keys
+
+
+@dataclass
+class GenerationRecord:
+    generation: int
+    total_seconds: float
+    fitness_seconds: float
+    selection_seconds: float
+    crossover_seconds: float
+    mutation_seconds: float
+    fitness_calls: int
+    evaluated_solutions: int
+    cache_hit_rate: float
+    diversity: int
+    best_fitness: float
+    mean_fitness: float
+
+
+class GenerationProfiler:
+    """
+    Collects a `GenerationRecord` per generation of a pygad run. Fitness time is measured by wrapping the fitness
+    function, selection, crossover and mutation time as the gaps between the pygad callbacks around them.
+    Profiling is off when no profiler is attached: neither the wrapper nor the callbacks are installed then.
+    """
+
+    def __init__(self, fitness_cache: FitnessCache | None = None) -> None:
+        self.fitness_cache = fitness_cache
+        self.records: list[GenerationRecord] = []
+        self._fitness_seconds = 0.0
+        self._fitness_calls = 0
+        self._evaluated_solutions = 0
+        self._cache_lookups = self._current_cache_lookups()
+        self._timestamps: dict[str, float] = {}
+        self._generation_start = time.perf_counter()
+
+    def profile_fitness(self, fitness_function: BatchFitnessFunction) -> BatchFitnessFunction:
+        def wrapper(
+            ga_instance: pygad.GA,
+            solutions: NDArray[np.int_],
+            solution_indices: list[int],
+        ) -> NDArray[np.floating]:
+            start = time.perf_counter()
+            fitness = fitness_function(ga_instance, solutions, solution_indices)
+            self._fitness_seconds += time.perf_counter() - start
+            self._fitness_calls += 1
+            self._evaluated_solutions += len(solutions)
+            return fitness
+
+        return wrapper
+
+    def callbacks(self) -> dict[str, Callable[..., Any]]:
+        """Keyword arguments of `pygad.GA` that install the profiling callbacks."""
+
+        return {
+            "on_start": self.on_start,
+            "on_fitness": lambda ga_instance, fitness: self._mark("fitness"),
+            "on_parents": lambda ga_instance, parents: self._mark("parents"),
+            "on_crossover": lambda ga_instance, offspring: self._mark("crossover"),
+            "on_mutation": lambda ga_instance, offspring: self._mark("mutation"),
+            "on_generation": self.on_generation,
+        }
+
+    def on_start(self, ga_instance: pygad.GA) -> None:
+        """The first generation includes the evaluation of the initial population."""
+
+        self._generation_start = time.perf_counter()
+
+    def on_generation(self, ga_instance: pygad.GA) -> None:
+        now = time.perf_counter()
+        hits, lookups = self._current_cache_lookups()
+        previous_hits, previous_lookups = self._cache_lookups
+        fitness = np.asarray(ga_instance.last_generation_fitness)
+        self.records.append(
+            GenerationRecord(
+                generation=ga_instance.generations_completed,
+                total_seconds=now - self._generation_start,
+                fitness_seconds=self._fitness_seconds,
+                selection_seconds=self._elapsed(start="fitness", end="parents"),
+                crossover_seconds=self._elapsed(start="parents", end="crossover"),
+                mutation_seconds=self._elapsed(start="crossover", end="mutation"),
+                fitness_calls=self._fitness_calls,
+                evaluated_solutions=self._evaluated_solutions,
+                cache_hit_rate=(
+                    (hits - previous_hits) / (lookups - previous_lookups) if lookups > previous_lookups else 0.0
+                ),
+                diversity=len(set(partition_keys(partitions=np.asarray(ga_instance.population)))),
+                best_fitness=float(fitness.max()),
+                mean_fitness=float(fitness.mean()),
+            )
+        )
+
+        self._fitness_seconds = 0.0
+        self._fitness_calls = 0
+        self._evaluated_solutions = 0
+        self._cache_lookups = (hits, lookups)
+        self._timestamps.clear()
+        self._generation_start = time.perf_counter()
+
+    def _mark(self, event: str) -> None:
+        self._timestamps[event] = time.perf_counter()
+
+    def _elapsed(self, start: str, end: str) -> float:
+        if start not in self._timestamps or end not in self._timestamps:
+            return 0.0
+        return self._timestamps[end] - self._timestamps[start]
+
+    def _current_cache_lookups(self) -> tuple[int, int]:
+        if self.fitness_cache is None:
+            return 0, 0
+        return self.fitness_cache.hits, self.fitness_cache.hits + self.fitness_cache.misses
+
+
+class GenerationLog:
+    """
+    Streams generation records, with extra identifying columns, to a CSV file (for a `.csv` path) or to
+    a JSON Lines file (otherwise).
+    """
+
+    def __init__(self, path: str, extra_columns: list[str]) -> None:
+        self.path = path
+        self.columns = extra_columns + [record_field.name for record_field in fields(GenerationRecord)]
+        self._file: TextIO = open(path, "w", newline="")
+        self._csv_writer: csv.DictWriter | None = None
+        if path.endswith(".csv"):
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=self.columns)
+            self._csv_writer.writeheader()
+
+    def __enter__(self) -> "GenerationLog":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def write(self, records: list[GenerationRecord], **extra: Any) -> None:
+        for record in records:
+            row = extra | asdict(record)
+            if self._csv_writer is not None:
+                self._csv_writer.writerow(row)
+            else:
+                self._file.write(json.dumps(row) + "\n")
+        self._file.flush()
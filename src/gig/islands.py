@@ -0,0 +1,246 @@
+import math
+import multiprocessing
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.queues import Queue
+from typing import Any, Callable, Literal
+
+import numpy as np
+import pygad
+from numpy.typing import NDArray
+
+from gig.fitness import create_fitness_function, EncodedSample
+from gig.fitness_cache import FitnessCache
+from gig.genetic_operations import crossover_func, initialize_population, mutation_func
+from gig.mca import MCA
+from gig.sample_trie import SampleTrie
+
+Topology = Literal["ring", "fully_connected"]
+InitialPopulationFunction = Callable[[int, int, np.random.Generator], NDArray[np.int_]]
+
+
+@dataclass
+class IslandStatistics:
+    island: int
+    generations: int = 0
+    immigrants: int = 0
+    best_fitness: list[float] = field(default_factory=list)
+    mean_fitness: list[float] = field(default_factory=list)
+
+
+@dataclass
+class IslandResult:
+    best_solution: NDArray[np.int_]
+    best_solution_fitness: float
+    statistics: IslandStatistics
+
+
+@dataclass
+class IslandModelResult:
+    best_solution: NDArray[np.int_]
+    best_solution_fitness: float
+    best_island: int
+    islands: list[IslandStatistics]
+
+
+@dataclass(frozen=True)
+class IslandSettings:
+    num_generations: int
+    population_size: int
+    migration_interval: int
+    migration_size: int
+    initial_population_func: InitialPopulationFunction
+    fitness_cache_bytes: int
+
+
+def migration_targets(num_islands: int, topology: Topology) -> list[list[int]]:
+    """Islands that receive the emigrants of each island."""
+
+    if topology == "ring":
+        return [[(island + 1) % num_islands] if num_islands > 1 else [] for island in range(num_islands)]
+    if topology == "fully_connected":
+        return [[target for target in range(num_islands) if target != island] for island in range(num_islands)]
+    raise ValueError(f"Unknown topology: {topology}")
+
+
+def run_island_model(
+    mca: MCA,
+    train_sample: EncodedSample | SampleTrie,
+    num_islands: int = 4,
+    num_generations: int = 2000,
+    population_size: int = 100,
+    migration_interval: int = 20,
+    migration_size: int = 2,
+    topology: Topology = "ring",
+    initial_population_func: InitialPopulationFunction = initialize_population,
+    seed: int = 42,
+    fitness_cache_bytes: int = 64 * 1024 * 1024,
+) -> IslandModelResult:
+    """
+    Evolves `num_islands` GIG populations in separate processes. Every `migration_interval` generations each island
+    sends copies of its `migration_size` best partitions to its neighbours in the topology, which replace their worst
+    individuals. Migration is synchronous, so the result is reproducible for a fixed seed.
+    """
+
+    settings = IslandSettings(
+        num_generations=num_generations,
+        population_size=population_size,
+        migration_interval=migration_interval,
+        migration_size=migration_size,
+        initial_population_func=initial_population_func,
+        fitness_cache_bytes=fitness_cache_bytes,
+    )
+    targets = migration_targets(num_islands=num_islands, topology=topology)
+    island_seeds = np.random.SeedSequence(seed).generate_state(num_islands)
+
+    context = multiprocessing.get_context()
+    inboxes: list[Queue] = [context.Queue() for _ in range(num_islands)]
+    results: Queue = context.Queue()
+    processes = [
+        context.Process(
+            target=run_island,
+            kwargs={
+                "island": island,
+                "mca": mca,
+                "train_sample": train_sample,
+                "settings": settings,
+                "seed": int(island_seeds[island]),
+                "inbox": inboxes[island],
+                "outboxes": [inboxes[target] for target in targets[island]],
+                "num_senders": sum(island in island_targets for island_targets in targets),
+                "results": results,
+            },
+        )
+        for island in range(num_islands)
+    ]
+    for process in processes:
+        process.start()
+
+    island_results: dict[int, IslandResult] = {}
+    try:
+        while len(island_results) < num_islands:
+            island, result = results.get()
+            if isinstance(result, str):
+                raise RuntimeError(f"Island {island} failed:\n{result}")
+            island_results[island] = result
+    finally:
+        for process in processes:
+            if process.is_alive() and len(island_results) < num_islands:
+                process.terminate()
+            process.join()
+
+    best_island = max(range(num_islands), key=lambda island: island_results[island].best_solution_fitness)
+    return IslandModelResult(
+        best_solution=island_results[best_island].best_solution,
+        best_solution_fitness=island_results[best_island].best_solution_fitness,
+        best_island=best_island,
+        islands=[island_results[island].statistics for island in range(num_islands)],
+    )
+
+
+def run_island(
+    island: int,
+    mca: MCA,
+    train_sample: EncodedSample | SampleTrie,
+    settings: IslandSettings,
+    seed: int,
+    inbox: Queue,
+    outboxes: list[Queue],
+    num_senders: int,
+    results: Queue,
+) -> None:
+    try:
+        result = evolve_island(
+            island=island,
+            mca=mca,
+            train_sample=train_sample,
+            settings=settings,
+            seed=seed,
+            inbox=inbox,
+            outboxes=outboxes,
+            num_senders=num_senders,
+        )
+        results.put((island, result))
+    except Exception:
+        results.put((island, traceback.format_exc()))
+
+
+def evolve_island(
+    island: int,
+    mca: MCA,
+    train_sample: EncodedSample | SampleTrie,
+    settings: IslandSettings,
+    seed: int,
+    inbox: Queue,
+    outboxes: list[Queue],
+    num_senders: int,
+) -> IslandResult:
+    population_seed, ga_seed = np.random.SeedSequence(seed).generate_state(2)
+    statistics = IslandStatistics(island=island)
+
+    def on_generation(ga_instance: pygad.GA) -> None:
+        statistics.best_fitness.append(float(np.max(ga_instance.last_generation_fitness)))
+        statistics.mean_fitness.append(float(np.mean(ga_instance.last_generation_fitness)))
+
+    ga_instance = pygad.GA(
+        num_generations=settings.migration_interval,
+        num_parents_mating=20,
+        fitness_func=create_fitness_function(
+            mca=mca,
+            train_sample=train_sample,
+            fitness_cache=FitnessCache(max_bytes=settings.fitness_cache_bytes),
+        ),
+        fitness_batch_size=settings.population_size,
+        initial_population=settings.initial_population_func(
+            mca.num_states,
+            settings.population_size,
+            np.random.default_rng(population_seed),
+        ),
+        mutation_type=mutation_func,
+        crossover_type=crossover_func,
+        gene_type=int,
+        parent_selection_type="rws",
+        keep_elitism=2,
+        stop_criteria=["reach_4000"],
+        random_seed=int(ga_seed),
+        on_generation=on_generation,
+    )
+
+    pending: dict[int, list[tuple[int, Any]]] = {}
+    num_epochs = math.ceil(settings.num_generations / settings.migration_interval)
+    for epoch in range(num_epochs):
+        ga_instance.num_generations = min(
+            settings.migration_interval,
+            settings.num_generations - epoch * settings.migration_interval,
+        )
+        ga_instance.run()
+        if epoch == num_epochs - 1:
+            break
+
+        fitness = np.asarray(ga_instance.last_generation_fitness)
+        emigrants = np.argsort(fitness)[::-1][: settings.migration_size]
+        for outbox in outboxes:
+            outbox.put((epoch, island, ga_instance.population[emigrants].copy()))
+
+        # A neighbour that already got all of its immigrants may send the next epoch's emigrants early.
+        while len(pending.get(epoch, [])) < num_senders:
+            message_epoch, source, partitions = inbox.get()
+            pending.setdefault(message_epoch, []).append((source, partitions))
+        messages: list[tuple[int, Any]] = sorted(pending.pop(epoch, []), key=lambda m: m[0])
+        if messages:
+            immigrants = np.concatenate([partitions for _, partitions in messages])[: settings.population_size]
+            worst = np.argsort(fitness)[: len(immigrants)]
+            population = ga_instance.population.copy()
+            population[worst] = immigrants
+            ga_instance.population = population
+            statistics.immigrants += len(immigrants)
+
+    best_solution, best_solution_fitness, _ = ga_instance.best_solution(
+        pop_fitness=ga_instance.last_generation_fitness,
+    )
+    statistics.generations = ga_instance.generations_completed
+    return IslandResult(
+        best_solution=best_solution,
+        best_solution_fitness=float(best_solution_fitness),
+        statistics=statistics,
+    )
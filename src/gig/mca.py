@@ -1,75 +1,162 @@
+from dataclasses import dataclass, replace
+from functools import cached_property
+
 import numpy as np
-from automata.base.exceptions import InvalidStateError
 from automata.fa.dfa import DFA
 from numpy._typing import NDArray
 
+from automaton_tables.sparse_transitions import build_sparse_transitions, SparseTransitions
 
-def construct_mca(s_plus: list[str]) -> DFA:
-    states = set()
-    transitions: dict[str, dict[str, str]] = {}
-    final_states = set()
-    alphabet = set()
+Transitions = NDArray[np.int_] | SparseTransitions
 
-    for word in s_plus:
-        prefix = ""
+
+@dataclass(eq=False)
+class MCA:
+    """
+    Integer-indexed automaton. States are numbered 0..n-1 and transitions are stored as a dense
+    (num_states, alphabet_size) table, with symbols interned through `alphabet`. For large alphabets the table
+    can be a `SparseTransitions`, which is indexed the same way.
+    """
+
+    transitions: Transitions
+    final_states: NDArray[np.bool_]
+    alphabet: dict[str, int]
+    initial_state: int = 0
+
+    @property
+    def num_states(self) -> int:
+        return int(self.transitions.shape[0])
+
+    def accepts_input(self, word: str) -> bool:
+        state = self.initial_state
         for symbol in word:
-            alphabet.add(symbol)
-            prefix += symbol
-            states.add(prefix)
-        final_states.add(prefix)
+            symbol_idx = self.alphabet.get(symbol)
+            if symbol_idx is None:
+                return False
+            state = int(self.transitions[state, symbol_idx])
+        return bool(self.final_states[state])
+
+    @cached_property
+    def dfa(self) -> DFA:
+        """automata-lib view of the automaton, built on first access. Meant for export and visualisation only."""
+
+        state_names = [f"q{i}" for i in range(self.num_states)]
+        symbols = list(self.alphabet)
+        transitions = {
+            state_names[state]: {symbol: state_names[next_state] for symbol, next_state in zip(symbols, row)}
+            for state, row in enumerate(dense_transitions(transitions=self.transitions).tolist())
+        }
+        return DFA(
+            states=set(state_names),
+            input_symbols=set(symbols),
+            transitions=transitions,
+            initial_state=state_names[self.initial_state],
+            final_states={state_names[state] for state in np.flatnonzero(self.final_states)},
+        )
+
+
+def dense_transitions(transitions: Transitions) -> NDArray[np.int_]:
+    return transitions.to_dense() if isinstance(transitions, SparseTransitions) else transitions
+
+
+def pad_transitions(transitions: Transitions) -> Transitions:
+    """The table with an extra padding symbol `alphabet_size` that loops on every state."""
+
+    if isinstance(transitions, SparseTransitions):
+        return transitions.padded()
+    return np.hstack([transitions, np.arange(len(transitions))[:, np.newaxis]])
 
-    initial_state = ""
-    states.add(initial_state)
 
+def quotient_transitions(
+    transitions: Transitions,
+    members: NDArray[np.int_],
+    labels: NDArray[np.int_],
+    member_rows: NDArray[np.int_] | None = None,
+) -> Transitions:
+    """
+    Transitions of a quotient automaton whose group `g` takes the row of state `members[g]`, with targets mapped to
+    groups through `labels`. For stacked quotients, `labels` has one row per automaton and `member_rows[g]` is the
+    automaton of group `g`.
+    """
+
+    if isinstance(transitions, SparseTransitions):
+        rows = transitions.take_rows(rows=members)
+        if member_rows is None:
+            return replace(rows, targets=labels[rows.targets], defaults=labels[rows.defaults])
+        return replace(
+            rows,
+            targets=labels[member_rows[rows.edge_states], rows.targets],
+            defaults=labels[member_rows, rows.defaults],
+        )
+    if member_rows is None:
+        return labels[transitions[members]]
+    return labels[member_rows[:, np.newaxis], transitions[members]]
+
+
+def construct_mca(s_plus: list[str], sparse: bool = False) -> MCA:
+    """
+    Maximal canonical automaton of the positive words: their prefix tree, with a self-loop for every missing
+    transition. With `sparse`, only the tree edges are stored and the self-loops are the defaults of the states.
+    """
+
+    alphabet = {symbol: i for i, symbol in enumerate(sorted(set().union(*s_plus)))}
+
+    children: dict[tuple[int, int], int] = {}
+    final_states = [False]
     for word in s_plus:
-        current_state = initial_state
+        state = 0
         for symbol in word:
-            next_state = current_state + symbol
-            transitions.setdefault(current_state, {})[symbol] = next_state
-            current_state = next_state
-
-    for state in states:
-        for symbol in alphabet:
-            if state not in transitions:
-                transitions[state] = {}
-            if symbol not in transitions[state]:
-                transitions[state][symbol] = state
-
-    return DFA(
-        states=states,
-        input_symbols=alphabet,
+            key = (state, alphabet[symbol])
+            next_state = children.get(key)
+            if next_state is None:
+                next_state = len(final_states)
+                children[key] = next_state
+                final_states.append(False)
+            state = next_state
+        final_states[state] = True
+
+    num_states = len(final_states)
+    if sparse:
+        return MCA(
+            transitions=build_sparse_transitions(
+                sources=[source for source, _ in children],
+                symbols=[symbol for _, symbol in children],
+                targets=list(children.values()),
+                defaults=np.arange(num_states),
+                alphabet_size=len(alphabet),
+            ),
+            final_states=np.array(final_states, dtype=np.bool_),
+            alphabet=alphabet,
+        )
+
+    transitions = np.repeat(np.arange(num_states, dtype=np.int_)[:, np.newaxis], len(alphabet), axis=1)
+    if children:
+        sources, symbols = np.array(list(children.keys()), dtype=np.int_).T
+        transitions[sources, symbols] = np.array(list(children.values()), dtype=np.int_)
+
+    return MCA(
         transitions=transitions,
-        initial_state=initial_state,
-        final_states=final_states,
+        final_states=np.array(final_states, dtype=np.bool_),
+        alphabet=alphabet,
     )
 
 
-def reduce_mca(mca_states: list[str], mca: DFA, partition: NDArray[np.int_]) -> DFA:
-    mapping = {mca_states[i]: mca_states[group] for i, group in enumerate(partition)}
-    new_states = set(mapping.values())
-    new_final_states = set()
-    new_transitions: dict[str, dict[str, str]] = {new_state: {} for new_state in new_states}
+def reduce_mca(mca: MCA, partition: NDArray[np.int_]) -> MCA:
+    """
+    Merges states that share a group in the partition. Groups are renumbered to 0..k-1 in ascending order.
+    When merged states disagree on a transition, the state with the highest index wins (last writer).
+    """
 
-    for old_state, new_state in mapping.items():
-        if old_state in mca.final_states:
-            new_final_states.add(new_state)
+    _, labels = np.unique(np.asarray(partition), return_inverse=True)
+    _, first_from_end = np.unique(labels[::-1], return_index=True)
+    last_members = len(labels) - 1 - first_from_end
 
-        for symbol, next_state in mca.transitions[old_state].items():
-            new_transitions[new_state][symbol] = mapping[next_state]
+    num_groups = len(last_members)
+    final_states = np.bincount(labels, weights=mca.final_states, minlength=num_groups) > 0
 
-    try:
-        return DFA(
-            states=new_states,
-            input_symbols=mca.input_symbols,
-            transitions=new_transitions,
-            initial_state=mapping[mca.initial_state],
-            final_states=new_final_states,
-        )
-    except InvalidStateError as e:
-        print(f"States: {mca_states}")
-        print(f"Partition: {partition}")
-        print(f"Mapping: {mapping}")
-        print(f"New States: {new_states}")
-        print(f"New Transitions: {new_transitions}")
-        print(f"New Final States: {new_final_states}")
-        raise e
+    return MCA(
+        transitions=quotient_transitions(transitions=mca.transitions, members=last_members, labels=labels),
+        final_states=final_states,
+        alphabet=mca.alphabet,
+        initial_state=int(labels[mca.initial_state]),
+    )
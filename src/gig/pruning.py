@@ -0,0 +1,96 @@
+import numpy as np
+import pygad
+from numpy.typing import NDArray
+
+from gig.fitness import EncodedSample, stack_quotients
+from gig.mca import MCA, pad_transitions
+from gig.sample_trie import SampleTrie
+
+
+class FitnessPruning:
+    """
+    Bound-based early termination of the GIG fitness. A candidate stops being evaluated as soon as its fitness,
+    with every remaining training word answered correctly, can no longer reach the `rank`-th best fitness of the
+    previous generation. Its fitness is then the lower bound with every remaining word answered wrongly.
+    Encoded samples are checked every `chunk_size` words, tries after every level.
+    """
+
+    def __init__(self, rank: int = 2, chunk_size: int = 256) -> None:
+        self.rank = rank
+        self.chunk_size = chunk_size
+        self.evaluations = 0
+        self.pruned = 0
+        self.skipped_words = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"FitnessPruning(rank={self.rank}, evaluations={self.evaluations}, "
+            f"pruned={self.pruned}, skipped_words={self.skipped_words})"
+        )
+
+    def threshold(self, ga_instance: pygad.GA) -> float | None:
+        last_generation_fitness = getattr(ga_instance, "last_generation_fitness", None)
+        if last_generation_fitness is None or len(last_generation_fitness) < self.rank:
+            return None
+        return float(np.sort(last_generation_fitness)[::-1][self.rank - 1])
+
+    def correct_counts(
+        self,
+        mca: MCA,
+        partitions: NDArray[np.int_],
+        sample: EncodedSample | SampleTrie,
+        unique_groups_points: NDArray[np.floating],
+        threshold: float,
+    ) -> tuple[NDArray[np.int_], NDArray[np.bool_]]:
+        """
+        Numbers of correctly answered words, exact for candidates that can reach `threshold` and lower bounds for
+        the others, together with the mask of the pruned candidates.
+        """
+
+        initial_states, transitions, final_states = stack_quotients(mca=mca, partitions=partitions)
+        correct = np.zeros(len(partitions), dtype=np.int_)
+        pruned = np.zeros(len(partitions), dtype=np.bool_)
+        active = np.arange(len(partitions))
+
+        def prune(active: NDArray[np.int_], remaining_words: int) -> NDArray[np.int_]:
+            if not remaining_words:
+                return active
+            best_correct = correct[active] + remaining_words
+            best_fitness = (best_correct / sample.num_words * 3 + unique_groups_points[active]) * 1000
+            hopeless = best_fitness < threshold
+            pruned[active[hopeless]] = True
+            self.skipped_words += remaining_words * int(np.count_nonzero(hopeless))
+            return active[~hopeless]
+
+        if isinstance(sample, SampleTrie):
+            states = np.empty((len(partitions), sample.num_nodes), dtype=np.int_)
+            states[:, 0] = initial_states
+            word_counts = sample.positives + sample.negatives
+            correct += sample.num_negatives - int(sample.negatives.sum())
+            remaining_words = int(word_counts.sum())
+            for start, end in zip(sample.level_offsets[:-1], sample.level_offsets[1:]):
+                if start > 0:
+                    parent_states = states[active[:, np.newaxis], sample.parents[start:end]]
+                    states[active, start:end] = transitions[parent_states, sample.symbols[start:end]]
+                accepted = final_states[states[active, start:end]].astype(np.int_)
+                correct[active] += accepted @ sample.positives[start:end] + (1 - accepted) @ sample.negatives[start:end]
+                remaining_words -= int(word_counts[start:end].sum())
+                active = prune(active=active, remaining_words=remaining_words)
+                if not len(active):
+                    break
+        else:
+            padded_transitions = pad_transitions(transitions=transitions)
+            for start in range(0, sample.num_words, self.chunk_size):
+                end = min(start + self.chunk_size, sample.num_words)
+                word_states = np.repeat(initial_states[active, np.newaxis], end - start, axis=1)
+                for column in sample.symbols[start:end, : int(sample.lengths[start:end].max())].T:
+                    word_states = padded_transitions[word_states, column]
+                word_accepted = final_states[word_states] & sample.valid[start:end]
+                correct[active] += np.count_nonzero(word_accepted == sample.labels[start:end], axis=1)
+                active = prune(active=active, remaining_words=sample.num_words - end)
+                if not len(active):
+                    break
+
+        self.evaluations += len(partitions)
+        self.pruned += int(np.count_nonzero(pruned))
+        return correct, pruned
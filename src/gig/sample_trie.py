@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from gig.mca import MCA, Transitions
+
+if TYPE_CHECKING:
+    from gig.fitness import EncodedSample
+
+
+@dataclass(eq=False)
+class SampleTrie:
+    """
+    Prefix trie of the words of a sample in compact arrays. Nodes are numbered level by level, so node 0 is the
+    empty word and nodes `level_offsets[d]:level_offsets[d + 1]` are the prefixes of length `d`.
+    Every node stores its parent, the symbol leading to it and how many positive/negative words end in it.
+    Words containing symbols outside of the alphabet are never accepted, so they are only counted in the totals.
+    """
+
+    parents: NDArray[np.int_]
+    symbols: NDArray[np.int_]
+    level_offsets: NDArray[np.int_]
+    positives: NDArray[np.int_]
+    negatives: NDArray[np.int_]
+    num_positives: int
+    num_negatives: int
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.parents)
+
+    @property
+    def num_words(self) -> int:
+        return self.num_positives + self.num_negatives
+
+
+def compile_sample_trie(sample: "EncodedSample") -> SampleTrie:
+    """Builds the trie one level at a time: the prefixes of length `d` are the unique (parent, symbol) pairs."""
+
+    alphabet_size = int(sample.symbols.max(initial=0)) + 1
+    nodes = np.zeros(sample.num_words, dtype=np.int_)
+    parents = [np.array([-1], dtype=np.int_)]
+    symbols = [np.array([-1], dtype=np.int_)]
+    level_offsets = [0, 1]
+
+    for depth in range(int(sample.lengths.max(initial=0))):
+        words = np.flatnonzero(sample.valid & (sample.lengths > depth))
+        if not len(words):
+            break
+        edges, level_nodes = np.unique(
+            nodes[words] * alphabet_size + sample.symbols[words, depth],
+            return_inverse=True,
+        )
+        level_parents, level_symbols = np.divmod(edges, alphabet_size)
+        nodes[words] = level_offsets[-1] + level_nodes
+        parents.append(level_parents)
+        symbols.append(level_symbols)
+        level_offsets.append(level_offsets[-1] + len(edges))
+
+    num_nodes = level_offsets[-1]
+    ends = nodes[sample.valid]
+    labels = sample.labels[sample.valid]
+    num_positives = int(np.count_nonzero(sample.labels))
+    return SampleTrie(
+        parents=np.concatenate(parents),
+        symbols=np.concatenate(symbols),
+        level_offsets=np.array(level_offsets, dtype=np.int_),
+        positives=np.bincount(ends[labels], minlength=num_nodes),
+        negatives=np.bincount(ends[~labels], minlength=num_nodes),
+        num_positives=num_positives,
+        num_negatives=sample.num_words - num_positives,
+    )
+
+
+def run_trie(
+    transitions: Transitions,
+    initial_states: NDArray[np.int_],
+    trie: SampleTrie,
+) -> NDArray[np.int_]:
+    """
+    States reached by every trie node, each computed once from its parent's state. `initial_states` has one entry
+    per automaton of a stacked transition table, the result has shape (len(initial_states), num_nodes).
+    """
+
+    states = np.empty((len(initial_states), trie.num_nodes), dtype=np.int_)
+    states[:, 0] = initial_states
+    for start, end in zip(trie.level_offsets[1:-1], trie.level_offsets[2:]):
+        states[:, start:end] = transitions[states[:, trie.parents[start:end]], trie.symbols[start:end]]
+    return states
+
+
+def accepts_trie(automaton: MCA, trie: SampleTrie) -> NDArray[np.bool_]:
+    """Accept/reject verdict of the automaton for every trie node."""
+
+    states = run_trie(
+        transitions=automaton.transitions,
+        initial_states=np.array([automaton.initial_state]),
+        trie=trie,
+    )
+    return automaton.final_states[states[0]]
+
+
+def count_true_verdicts(accepted: NDArray[np.bool_], trie: SampleTrie) -> tuple[NDArray[np.int_], NDArray[np.int_]]:
+    """True positive and true negative word counts of per-node verdicts, reduced over the last axis."""
+
+    accepted_counts = accepted.astype(np.int_)
+    true_positives = accepted_counts @ trie.positives
+    true_negatives = trie.num_negatives - accepted_counts @ trie.negatives
+    return true_positives, true_negatives
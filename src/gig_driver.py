@@ -1,71 +1,337 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
 import numpy as np
 import pygad
+from aalpy import Dfa
 from automata.fa.dfa import DFA
 from numpy.typing import NDArray
 from tabulate import tabulate
 
+from automaton_tables.sparse_transitions import SparseTransitions
 from data_generation import datasets
+from data_generation.dfa_tables import compile_dfa, DfaTable
+from data_generation.language_accuracy import compare_languages
 from data_generation.transformations import translate_automata_to_aalpy
+from gig.fitness import accepts_sample, create_fitness_function, encode_sample, EncodedSample
+from gig.fitness_cache import FitnessCache
 from gig.genetic_operations import crossover_func, initialize_population, initialize_random_population, mutation_func
-from gig.mca import construct_mca, reduce_mca
+from gig.instrumentation import GenerationLog, GenerationProfiler, GenerationRecord
+from gig.islands import run_island_model, Topology
+from gig.mca import construct_mca, dense_transitions, MCA, reduce_mca, Transitions
+from gig.pruning import FitnessPruning
+from gig.sample_trie import accepts_trie, compile_sample_trie, count_true_verdicts, SampleTrie
+from parallel.shared_arrays import attach_shared_arrays, SharedArrays, SharedArraysSpec
 
+InitialPopulationFunction = Callable[[int, int, np.random.Generator], NDArray[np.int_]]
+
+NUM_OF_RUNS = 50
+POPULATION_SIZE = 100
+
+
+@dataclass
+class GigRunResult:
+    best_solution: NDArray[np.int_]
+    best_solution_fitness: float
+    generations: int
+    best_solution_generation: int
+    quality: tuple[float, float, float, float, float]
+    generation_records: list[GenerationRecord] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_evictions: int = 0
 
-def measure_quality(
-    automaton: DFA,
-    s_plus: list[str],
-    s_minus: list[str],
-) -> tuple[float, float, float, float, float]:
-    """Returns confusion matrix ratio values: Quality, TP, TN, FP, FN."""
 
-    data_count = len(s_plus) + len(s_minus)
+def measure_quality(automaton: MCA, sample: EncodedSample | SampleTrie) -> tuple[float, float, float, float, float]:
+    """Returns confusion matrix ratio values: Quality, TP, TN, FP, FN."""
 
-    true_positives = 0
-    for word in s_plus:
-        if automaton.accepts_input(word):
-            true_positives += 1
+    if isinstance(sample, SampleTrie):
+        positives_count = sample.num_positives
+        negatives_count = sample.num_negatives
+        true_positives, true_negatives = map(
+            int,
+            count_true_verdicts(accepted=accepts_trie(automaton=automaton, trie=sample), trie=sample),
+        )
+    else:
+        accepted = accepts_sample(automaton=automaton, sample=sample)
+        positives_count = int(np.count_nonzero(sample.labels))
+        negatives_count = sample.num_words - positives_count
 
-    true_negatives = 0
-    for word in s_minus:
-        if not automaton.accepts_input(word):
-            true_negatives += 1
+        true_positives = int(np.count_nonzero(accepted & sample.labels))
+        true_negatives = int(np.count_nonzero(~accepted & ~sample.labels))
 
-    false_positives = len(s_plus) - true_positives
-    false_negatives = len(s_minus) - true_negatives
+    false_positives = positives_count - true_positives
+    false_negatives = negatives_count - true_negatives
 
-    quality = (true_positives + true_negatives) / data_count
-    true_positives_ratio = true_positives / len(s_plus)
-    true_negatives_ratio = true_negatives / len(s_minus)
-    false_positives_ratio = false_positives / len(s_plus)
-    false_negatives_ratio = false_negatives / len(s_minus)
+    quality = (true_positives + true_negatives) / sample.num_words
+    true_positives_ratio = true_positives / positives_count
+    true_negatives_ratio = true_negatives / negatives_count
+    false_positives_ratio = false_positives / positives_count
+    false_negatives_ratio = false_negatives / negatives_count
     return quality, true_positives_ratio, true_negatives_ratio, false_positives_ratio, false_negatives_ratio
 
 
+def measure_language_quality(
+    automaton: MCA,
+    reference: DfaTable,
+    max_len: int = 20,
+) -> tuple[float, float, float, float, float]:
+    """Exact counterpart of `measure_quality`: the same ratios over all words up to `max_len` instead of a test list."""
+
+    table = DfaTable(
+        alphabet=[symbol for symbol, _ in sorted(automaton.alphabet.items(), key=lambda item: item[1])],
+        transitions=dense_transitions(transitions=automaton.transitions).astype(np.int64),
+        accepting=automaton.final_states,
+        initial_state=automaton.initial_state,
+    )
+    return compare_languages(learned=table, reference=reference, max_len=max_len).rates()
+
+
+def run_gig(
+    mca: MCA,
+    train_sample: EncodedSample | SampleTrie,
+    test_sample: EncodedSample | SampleTrie,
+    initial_population_func: InitialPopulationFunction,
+    seed: int,
+    fitness_cache: FitnessCache,
+    pruning_rank: int | None = None,
+    profile: bool = False,
+) -> GigRunResult:
+    """
+    Runs a single GA. All of its randomness is derived from `seed`, so runs are reproducible in any process.
+    With `pruning_rank`, offspring that cannot beat the `pruning_rank`-th best fitness of the previous generation stop
+    being evaluated early and get a lower-bound fitness.
+    With `profile`, the result carries a timing and population record of every generation.
+    The result counts the fitness cache lookups of this run only, so runs sharing a cache can be summed up.
+    """
+
+    cache_counters = fitness_cache.hits, fitness_cache.misses, fitness_cache.evictions
+    population_seed, ga_seed = np.random.SeedSequence(seed).generate_state(2)
+    initial_population = initial_population_func(
+        mca.num_states,
+        POPULATION_SIZE,
+        np.random.default_rng(population_seed),
+    )
+    fitness_function = create_fitness_function(
+        mca=mca,
+        train_sample=train_sample,
+        fitness_cache=fitness_cache,
+        pruning=FitnessPruning(rank=pruning_rank) if pruning_rank is not None else None,
+    )
+    profiler = GenerationProfiler(fitness_cache=fitness_cache) if profile else None
+    ga_instance = pygad.GA(
+        num_generations=2000,
+        num_parents_mating=20,
+        fitness_func=profiler.profile_fitness(fitness_function=fitness_function) if profiler else fitness_function,
+        fitness_batch_size=POPULATION_SIZE,
+        initial_population=initial_population,
+        mutation_type=mutation_func,
+        crossover_type=crossover_func,
+        gene_type=int,
+        parent_selection_type="rws",
+        keep_elitism=2,
+        stop_criteria=["saturate_50", "reach_4000"],
+        random_seed=int(ga_seed),
+        **(profiler.callbacks() if profiler else {}),
+    )
+    ga_instance.run()
+
+    best_solution, best_solution_fitness, _ = ga_instance.best_solution()
+    result_mca = reduce_mca(mca=mca, partition=best_solution)
+    return GigRunResult(
+        best_solution=best_solution,
+        best_solution_fitness=best_solution_fitness,
+        generations=ga_instance.generations_completed,
+        best_solution_generation=ga_instance.best_solution_generation,
+        quality=measure_quality(automaton=result_mca, sample=test_sample),
+        generation_records=profiler.records if profiler else [],
+        cache_hits=fitness_cache.hits - cache_counters[0],
+        cache_misses=fitness_cache.misses - cache_counters[1],
+        cache_evictions=fitness_cache.evictions - cache_counters[2],
+    )
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def share_gig_data(mca: MCA, train_sample: EncodedSample, test_sample: EncodedSample) -> SharedArrays:
+    arrays: dict[str, NDArray] = {"mca_final_states": mca.final_states}
+    if isinstance(mca.transitions, SparseTransitions):
+        arrays.update(
+            {
+                "mca_row_offsets": mca.transitions.row_offsets,
+                "mca_symbols": mca.transitions.symbols,
+                "mca_targets": mca.transitions.targets,
+                "mca_defaults": mca.transitions.defaults,
+            },
+        )
+    else:
+        arrays["mca_transitions"] = mca.transitions
+    for prefix, sample in [("train", train_sample), ("test", test_sample)]:
+        arrays.update(
+            {
+                f"{prefix}_symbols": sample.symbols,
+                f"{prefix}_lengths": sample.lengths,
+                f"{prefix}_labels": sample.labels,
+                f"{prefix}_valid": sample.valid,
+            },
+        )
+    return SharedArrays(arrays=arrays)
+
+
+def init_gig_worker(spec: SharedArraysSpec, alphabet: dict[str, int], fitness_cache_bytes: int) -> None:
+    arrays, blocks = attach_shared_arrays(spec=spec)
+    samples = {
+        prefix: EncodedSample(
+            symbols=arrays[f"{prefix}_symbols"],
+            lengths=arrays[f"{prefix}_lengths"],
+            labels=arrays[f"{prefix}_labels"],
+            valid=arrays[f"{prefix}_valid"],
+        )
+        for prefix in ["train", "test"]
+    }
+    transitions: Transitions
+    if "mca_transitions" in arrays:
+        transitions = arrays["mca_transitions"]
+    else:
+        transitions = SparseTransitions(
+            row_offsets=arrays["mca_row_offsets"],
+            symbols=arrays["mca_symbols"],
+            targets=arrays["mca_targets"],
+            defaults=arrays["mca_defaults"],
+            alphabet_size=len(alphabet),
+        )
+    _worker_state.update(
+        blocks=blocks,
+        mca=MCA(transitions=transitions, final_states=arrays["mca_final_states"], alphabet=alphabet),
+        train_trie=compile_sample_trie(sample=samples["train"]),
+        test_trie=compile_sample_trie(sample=samples["test"]),
+        fitness_cache=FitnessCache(max_bytes=fitness_cache_bytes),
+    )
+
+
+def run_gig_worker(
+    initial_population_func: InitialPopulationFunction,
+    seed: int,
+    pruning_rank: int | None,
+    profile: bool,
+) -> GigRunResult:
+    return run_gig(
+        mca=_worker_state["mca"],
+        train_sample=_worker_state["train_trie"],
+        test_sample=_worker_state["test_trie"],
+        initial_population_func=initial_population_func,
+        seed=seed,
+        fitness_cache=_worker_state["fitness_cache"],
+        pruning_rank=pruning_rank,
+        profile=profile,
+    )
+
+
 def benchmark_gig_initial_population(
     data: tuple[list[str], list[str], list[str], list[str]],
     visualise: bool = False,
-) -> None:
+    fitness_cache_bytes: int = 64 * 1024 * 1024,
+    seed: int = 42,
+    max_workers: int | None = None,
+    pruning_rank: int | None = None,
+    profile_path: str | None = None,
+    reference: DFA | Dfa | None = None,
+    sparse_mca: bool = False,
+    num_of_runs: int = NUM_OF_RUNS,
+) -> list[tuple[str, float, float, float, float, float, float, float]]:
+    """
+    Runs the GA `num_of_runs` times for every initial population function, prints the averaged results and returns
+    them as the rows of the printed table.
+    Runs are spread over `max_workers` processes (all cores by default). Every run gets its own seed derived from
+    `seed`, so the table does not depend on the number of workers.
+    With a `profile_path`, per-generation profiles of every run are streamed to it as CSV or JSON Lines.
+    With a `reference` DFA of the target language, quality is measured exactly against it instead of on the test words.
+    With `sparse_mca`, the MCA keeps only its tree transitions, for alphabets too large for a dense table.
+    """
+
     train_plus, train_minus, test_plus, test_minus = data
-    mca = construct_mca(s_plus=train_plus)
-    mca_states = list(mca.states)
+    mca = construct_mca(s_plus=train_plus, sparse=sparse_mca)
+    train_sample = encode_sample(s_plus=train_plus, s_minus=train_minus, alphabet=mca.alphabet)
+    test_sample = encode_sample(s_plus=test_plus, s_minus=test_minus, alphabet=mca.alphabet)
+    train_trie = compile_sample_trie(sample=train_sample)
+    test_trie = compile_sample_trie(sample=test_sample)
+    run_seeds = [int(run_seed) for run_seed in np.random.SeedSequence(seed).generate_state(num_of_runs)]
 
-    def fitness_function(_: pygad.GA, solution: NDArray[np.int_], _solution_idx: int) -> np.floating:
-        nonlocal mca, train_plus, train_minus
+    initial_population_functions: list[InitialPopulationFunction] = [
+        initialize_population,
+        initialize_random_population,
+    ]
+    runs: dict[str, list[GigRunResult]] = {}
+    generation_log = (
+        GenerationLog(path=profile_path, extra_columns=["initial_population_func", "run"]) if profile_path else None
+    )
 
-        reduced_automaton = reduce_mca(mca_states=mca_states, mca=mca, partition=solution)
+    def record_run(initial_population_func_name: str, run: GigRunResult) -> None:
+        if generation_log is not None:
+            generation_log.write(
+                records=run.generation_records,
+                initial_population_func=initial_population_func_name,
+                run=len(runs[initial_population_func_name]),
+            )
+        runs[initial_population_func_name].append(run)
 
-        unique_groups_points = calculate_unique_groups_points(solution=solution)
-        data_points = calculate_data_points(
-            automaton=reduced_automaton,
-            s_plus=train_plus,
-            s_minus=train_minus,
-        )
+    with generation_log if generation_log is not None else nullcontext():
+        max_workers = max_workers if max_workers is not None else os.cpu_count() or 1
+        if max_workers == 1:
+            fitness_cache = FitnessCache(max_bytes=fitness_cache_bytes)
+            for initial_population_func in initial_population_functions:
+                runs[initial_population_func.__name__] = []
+                for i, run_seed in enumerate(run_seeds):
+                    print(f"[{i}] Running GIG with initial population function: {initial_population_func.__name__}")
+                    run = run_gig(
+                        mca=mca,
+                        train_sample=train_trie,
+                        test_sample=test_trie,
+                        initial_population_func=initial_population_func,
+                        seed=run_seed,
+                        fitness_cache=fitness_cache,
+                        pruning_rank=pruning_rank,
+                        profile=profile_path is not None,
+                    )
+                    record_run(initial_population_func_name=initial_population_func.__name__, run=run)
+        else:
+            with (
+                share_gig_data(mca=mca, train_sample=train_sample, test_sample=test_sample) as shared_data,
+                ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=init_gig_worker,
+                    initargs=(shared_data.spec, mca.alphabet, fitness_cache_bytes),
+                ) as executor,
+            ):
+                for initial_population_func in initial_population_functions:
+                    print(
+                        f"Running GIG {num_of_runs} times on {max_workers} workers: {initial_population_func.__name__}"
+                    )
+                    runs[initial_population_func.__name__] = []
+                    for run in executor.map(
+                        run_gig_worker,
+                        [initial_population_func] * num_of_runs,
+                        run_seeds,
+                        [pruning_rank] * num_of_runs,
+                        [profile_path is not None] * num_of_runs,
+                    ):
+                        record_run(initial_population_func_name=initial_population_func.__name__, run=run)
 
-        fitness = data_points * 3 + unique_groups_points
-        return fitness * 1000
+    reference_table = compile_dfa(dfa=reference) if reference is not None else None
+    results: list[tuple[str, float, float, float, float, float, float, float]] = []
+    for initial_population_func_name, func_runs in runs.items():
+        cache_hits = sum(run.cache_hits for run in func_runs)
+        cache_misses = sum(run.cache_misses for run in func_runs)
+        print(
+            f"{initial_population_func_name}: fitness cache hits={cache_hits}, misses={cache_misses}, "
+            f"evictions={sum(run.cache_evictions for run in func_runs)}, "
+            f"hit rate={cache_hits / max(cache_hits + cache_misses, 1):.3f}"
+        )
 
-    results = []
-    initial_population_functions = [initialize_population, initialize_random_population]
-    for initial_population_func in initial_population_functions:
         average_generations = 0.0
         average_best_solution_generation = 0.0
         average_quality = 0.0
@@ -74,32 +340,17 @@ def benchmark_gig_initial_population(
         average_fp = 0.0
         average_fn = 0.0
 
-        NUM_OF_RUNS = 50
-        for i in range(NUM_OF_RUNS):
-            num_states = len(mca.states)
-            ga_instance = pygad.GA(
-                num_generations=2000,
-                num_parents_mating=20,
-                fitness_func=fitness_function,
-                initial_population=initial_population_func(num_states=num_states, population_size=100),
-                mutation_type=mutation_func,
-                crossover_type=crossover_func,
-                gene_type=int,
-                parent_selection_type="rws",
-                keep_elitism=2,
-                stop_criteria=["saturate_50", "reach_4000"],
-            )
-
-            print(f"[{i}] Running GIG with initial population function: {initial_population_func.__name__}")
-            ga_instance.run()
-            best_solution, best_solution_fitness, _ = ga_instance.best_solution()
-            result_dfa = reduce_mca(mca_states=mca_states, mca=mca, partition=best_solution)
-
-            average_generations += ga_instance.generations_completed
-            average_best_solution_generation += ga_instance.best_solution_generation
+        for run in func_runs:
+            average_generations += run.generations
+            average_best_solution_generation += run.best_solution_generation
 
-            result = measure_quality(automaton=result_dfa, s_plus=test_plus, s_minus=test_minus)
-            quality, tp, tn, fp, fn = result
+            quality, tp, tn, fp, fn = (
+                run.quality
+                if reference_table is None
+                else measure_language_quality(
+                    automaton=reduce_mca(mca=mca, partition=run.best_solution), reference=reference_table
+                )
+            )
             average_quality += quality
             average_tp += tp
             average_tn += tn
@@ -107,23 +358,24 @@ def benchmark_gig_initial_population(
             average_fn += fn
 
             if visualise:
-                print(f"Best solution: {best_solution}")
-                print(f"Best solution fitness: {best_solution_fitness}")
+                print(f"Best solution: {run.best_solution}")
+                print(f"Best solution fitness: {run.best_solution_fitness}")
                 print(f"Best solution quality: {quality}")
-                aalpy_dfa = translate_automata_to_aalpy(dfa=result_dfa)
+                result_mca = reduce_mca(mca=mca, partition=run.best_solution)
+                aalpy_dfa = translate_automata_to_aalpy(dfa=result_mca.dfa)
                 aalpy_dfa.visualize(path="data/learned_dfa", file_type="png")
                 aalpy_dfa.save(file_path="data/learned_dfa")
 
-        average_generations /= NUM_OF_RUNS
-        average_best_solution_generation /= NUM_OF_RUNS
-        average_quality /= NUM_OF_RUNS
-        average_tp /= NUM_OF_RUNS
-        average_tn /= NUM_OF_RUNS
-        average_fp /= NUM_OF_RUNS
-        average_fn /= NUM_OF_RUNS
+        average_generations /= num_of_runs
+        average_best_solution_generation /= num_of_runs
+        average_quality /= num_of_runs
+        average_tp /= num_of_runs
+        average_tn /= num_of_runs
+        average_fp /= num_of_runs
+        average_fn /= num_of_runs
         results.append(
             (
-                initial_population_func.__name__,
+                initial_population_func_name,
                 average_generations,
                 average_best_solution_generation,
                 average_quality,
@@ -146,35 +398,63 @@ def benchmark_gig_initial_population(
     ]
     results_array = tabulate(results, headers=headers, tablefmt="grid")
     print(results_array)
+    return results
 
 
-def calculate_unique_groups_points(solution: NDArray[np.int_]) -> np.floating:
-    unique_groups, group_counts = np.unique(solution, return_counts=True)
-    unique_groups_points = np.max(group_counts) / len(solution)
-    return unique_groups_points
-
+def benchmark_gig_island_model(
+    data: tuple[list[str], list[str], list[str], list[str]],
+    num_islands: int | None = None,
+    topology: Topology = "ring",
+    seed: int = 42,
+    sparse_mca: bool = False,
+) -> None:
+    """
+    Runs the island model GA with one island per core (by default) and prints per-island statistics.
+    With `sparse_mca`, the MCA keeps only its tree transitions, for alphabets too large for a dense table.
+    """
 
-def calculate_data_points(automaton: DFA, s_plus: list[str], s_minus: list[str]) -> float:
-    data_count = len(s_plus) + len(s_minus)
+    train_plus, train_minus, test_plus, test_minus = data
+    mca = construct_mca(s_plus=train_plus, sparse=sparse_mca)
+    train_sample = encode_sample(s_plus=train_plus, s_minus=train_minus, alphabet=mca.alphabet)
 
-    corrct_answers = 0
-    for word in s_plus:
-        if automaton.accepts_input(word):
-            corrct_answers += 1
+    num_islands = num_islands if num_islands is not None else os.cpu_count() or 1
+    print(f"Running GIG island model with {num_islands} islands and {topology} topology")
+    result = run_island_model(
+        mca=mca,
+        train_sample=compile_sample_trie(sample=train_sample),
+        num_islands=num_islands,
+        topology=topology,
+        seed=seed,
+    )
 
-    for word in s_minus:
-        if not automaton.accepts_input(word):
-            corrct_answers += 1
+    results = [
+        (
+            statistics.island,
+            statistics.generations,
+            statistics.immigrants,
+            max(statistics.best_fitness, default=float("nan")),
+            statistics.mean_fitness[-1] if statistics.mean_fitness else float("nan"),
+        )
+        for statistics in result.islands
+    ]
+    headers = ["Island", "Generations", "Immigrants", "Best Fitness", "Final Mean Fitness"]
+    print(tabulate(results, headers=headers, tablefmt="grid"))
 
-    data_points = corrct_answers / data_count
-    return data_points
+    print(f"Best solution (island {result.best_island}): {result.best_solution}")
+    print(f"Best solution fitness: {result.best_solution_fitness}")
+    if test_plus and test_minus:
+        test_sample = encode_sample(s_plus=test_plus, s_minus=test_minus, alphabet=mca.alphabet)
+        result_mca = reduce_mca(mca=mca, partition=result.best_solution)
+        print(f"Best solution quality: {measure_quality(automaton=result_mca, sample=test_sample)[0]}")
 
 
 if __name__ == "__main__":
-    for data_func in [
-        datasets.at_least_one_a,
-        datasets.even_number_of_as,
-        datasets.even_number_of_as_or_bs,
+    for data_func, reference in [
+        (datasets.at_least_one_a, None),
+        (datasets.even_number_of_as, None),
+        (datasets.even_number_of_as_or_bs, datasets.create_dfa_for_even_number_of_as_or_bs()),
     ]:
         print(f"Running benchmark for data: {data_func.__name__}")
-        benchmark_gig_initial_population(data=data_func())
+        benchmark_gig_initial_population(data=data_func(), reference=reference)
+
+    # benchmark_gig_island_model(data=datasets.one_is_third_from_end())
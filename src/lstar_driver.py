@@ -1,9 +1,71 @@
-from typing import Callable
+from typing import Any, Callable
 
 from aalpy import Dfa, DfaState, PerfectKnowledgeEqOracle, RegexSUL, run_Lstar, SUL
 from tabulate import tabulate
 
 
+class CachingSUL(SUL):
+    """
+    Answers queries from a trie of the outputs of every word asked before, and forwards the rest to `sul`. Every
+    node of the trie maps an input to its output and the subtree after it, so repeated queries and prefixes of
+    earlier queries are answered without touching the SUL. On the first input missing from the trie the cached
+    prefix is replayed on the SUL and the query continues there, extending the trie. Works for `query` as well as
+    for equivalence oracles that call `pre`, `step` and `post` themselves. The empty word is the input `None`.
+    """
+
+    def __init__(self, sul: SUL) -> None:
+        super().__init__()
+        self.sul = sul
+        self.cache: dict[Any, tuple[Any, dict]] = {}
+        self.saved_queries = 0
+        self.saved_steps = 0
+        self.sul_queries = 0
+        self.sul_steps = 0
+        self._node = self.cache
+        self._prefix: list[Any] = []
+        self._forwarding = False
+
+    def __repr__(self) -> str:
+        return (
+            f"CachingSUL(saved_queries={self.saved_queries}, saved_steps={self.saved_steps}, "
+            f"sul_queries={self.sul_queries}, sul_steps={self.sul_steps})"
+        )
+
+    def pre(self) -> None:
+        self._node = self.cache
+        self._prefix = []
+        self._forwarding = False
+
+    def post(self) -> None:
+        if self._forwarding:
+            self.sul.post()
+            self.sul_queries += 1
+        else:
+            self.saved_queries += 1
+            self.saved_steps += len(self._prefix)
+
+    def step(self, letter: Any) -> Any:
+        if not self._forwarding:
+            cached = self._node.get(letter)
+            if cached is not None:
+                output, self._node = cached
+                self._prefix.append(letter)
+                return output
+
+            self._forwarding = True
+            self.sul.pre()
+            for cached_letter in self._prefix:
+                self.sul.step(cached_letter)
+            self.sul_steps += len(self._prefix)
+
+        output = self.sul.step(letter)
+        self.sul_steps += 1
+        child: dict[Any, tuple[Any, dict]] = {}
+        self._node[letter] = (output, child)
+        self._node = child
+        return output
+
+
 def measure_lstar_queries_ex1() -> None:
     def create_dfa(n: int) -> Dfa:
         """Creates DFA that matches the regex `0{n}[01]*`."""
@@ -25,7 +87,7 @@ def measure_lstar_queries_ex1() -> None:
     results = []
 
     for problem_size in [1, 2, 4, 8, 16, 32, 64]:
-        sul = RegexSUL(regex=f"0{{{problem_size}}}[01]*")
+        sul = CachingSUL(sul=RegexSUL(regex=f"0{{{problem_size}}}[01]*"))
         alphabet = list("01")
         dfa = create_dfa(n=problem_size)
         eq_oracle = PerfectKnowledgeEqOracle(alphabet, sul, model_under_learning=dfa)
@@ -35,15 +97,18 @@ def measure_lstar_queries_ex1() -> None:
             eq_oracle,
             automaton_type="dfa",
             cex_processing=None,
+            cache_and_non_det_check=False,
             return_data=True,
             print_level=0,
         )
         eq_queries_number = info["learning_rounds"]
         mq_queries_number = info["queries_learning"]
         automaton_size = info["automaton_size"]
-        results.append((problem_size, eq_queries_number, mq_queries_number, automaton_size))
+        results.append(
+            (problem_size, eq_queries_number, mq_queries_number, sul.saved_queries, sul.sul_queries, automaton_size),
+        )
 
-    headers = ["Problem size", "EQ queries", "MQ queries", "Automaton size"]
+    headers = ["Problem size", "EQ queries", "MQ queries", "Cached queries", "SUL queries", "Automaton size"]
     result_array = tabulate(results, headers=headers, tablefmt="grid")
     print(result_array)
 
@@ -97,7 +162,7 @@ def measure_lstar_queries_ex2() -> None:
                     return True
             return False
 
-        sul = ExSUL(is_correct=is_correct)
+        sul = CachingSUL(sul=ExSUL(is_correct=is_correct))
         alphabet = list("01")
         dfa = create_dfa(n=problem_size)
         eq_oracle = PerfectKnowledgeEqOracle(alphabet, sul, model_under_learning=dfa)
@@ -107,15 +172,18 @@ def measure_lstar_queries_ex2() -> None:
             eq_oracle,
             automaton_type="dfa",
             cex_processing=None,
+            cache_and_non_det_check=False,
             return_data=True,
             print_level=0,
         )
         eq_queries_number = info["learning_rounds"]
         mq_queries_number = info["queries_learning"]
         automaton_size = info["automaton_size"]
-        results.append((problem_size, eq_queries_number, mq_queries_number, automaton_size))
+        results.append(
+            (problem_size, eq_queries_number, mq_queries_number, sul.saved_queries, sul.sul_queries, automaton_size),
+        )
 
-    headers = ["Problem size", "EQ queries", "MQ queries", "Automaton size"]
+    headers = ["Problem size", "EQ queries", "MQ queries", "Cached queries", "SUL queries", "Automaton size"]
     result_array = tabulate(results, headers=headers, tablefmt="grid")
     print(result_array)
 
@@ -0,0 +1,58 @@
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+
+import numpy as np
+from numpy.typing import NDArray
+
+SharedArraysSpec = dict[str, tuple[str, tuple[int, ...], str]]
+
+
+class SharedArrays:
+    """
+    Named NumPy arrays copied once into shared memory. Worker processes attach to them through the picklable `spec`
+    instead of receiving a pickled copy with every task. The creating process owns the memory and frees it on exit.
+    """
+
+    def __init__(self, arrays: dict[str, NDArray]) -> None:
+        self._blocks: list[SharedMemory] = []
+        self.spec: SharedArraysSpec = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def attach_shared_arrays(spec: SharedArraysSpec) -> tuple[dict[str, NDArray], list[SharedMemory]]:
+    """
+    Returns read-only views of the shared arrays, together with the blocks backing them.
+    The blocks have to be kept alive for as long as the views are used.
+    """
+
+    arrays = {}
+    blocks = []
+    for name, (block_name, shape, dtype) in spec.items():
+        block = SharedMemory(name=block_name, track=False)
+        array: NDArray = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+        blocks.append(block)
+    return arrays, blocks
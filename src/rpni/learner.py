@@ -0,0 +1,129 @@
+import numpy as np
+from aalpy import Dfa, DfaState
+
+from rpni.pta import build_prefix_tree, PrefixTree, RpniData, UNKNOWN
+
+
+class StateMerger:
+    """
+    Blue-fringe state merging over a prefix tree. The current automaton is a partition of the tree nodes into blocks,
+    kept in a union-find forest whose roots carry the output and the children of their block. Children are kept in
+    a dict per block, in the order they were added, which decides between blue states of the same depth; their
+    memory grows with the transitions of the tree, not with the alphabet. A merge folds the blue block into the red
+    one, pair of blocks by pair of blocks, and records every write in an undo log, so a merge that hits conflicting
+    outputs is rolled back at the first conflict without copying anything.
+    """
+
+    def __init__(self, pta: PrefixTree) -> None:
+        self.pta = pta
+        # The merge loop reads and writes single entries, which is much faster on lists than on NumPy arrays.
+        self.parents: list[int] = list(range(pta.num_states))
+        self.outputs: list[int] = pta.outputs.tolist()
+        # Children of the prefix tree were created in the order of their node ids.
+        self.block_children: list[dict[int, int]] = [{} for _ in range(pta.num_states)]
+        order = np.argsort(pta.children.targets, kind="stable")
+        for node, symbol, child in zip(
+            pta.children.edge_states[order].tolist(),
+            pta.children.symbols[order].tolist(),
+            pta.children.targets[order].tolist(),
+        ):
+            self.block_children[node][symbol] = child
+        self.merges = 0
+        self.rejected_merges = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"StateMerger(states={self.pta.num_states}, merges={self.merges}, rejected_merges={self.rejected_merges})"
+        )
+
+    def find(self, node: int) -> int:
+        parents = self.parents
+        while parents[node] != node:
+            node = parents[node]
+        return node
+
+    def try_merge(self, red: int, blue: int) -> bool:
+        """Merges the block of the blue state into the block of the red state and folds their children together."""
+
+        parents, outputs, block_children = self.parents, self.outputs, self.block_children
+        # Entries are (container, key, old value), with None as the old value of a child added to a block.
+        undo_log: list[tuple] = []
+        stack = [(red, blue)]
+        while stack:
+            red_side, blue_side = stack.pop()
+            red_side, blue_side = self.find(red_side), self.find(blue_side)
+            if red_side == blue_side:
+                continue
+
+            blue_output = outputs[blue_side]
+            if blue_output != UNKNOWN:
+                red_output = outputs[red_side]
+                if red_output == UNKNOWN:
+                    undo_log.append((outputs, red_side, red_output))
+                    outputs[red_side] = blue_output
+                elif red_output != blue_output:
+                    self._undo(undo_log=undo_log)
+                    self.rejected_merges += 1
+                    return False
+            undo_log.append((parents, blue_side, blue_side))
+            parents[blue_side] = red_side
+
+            red_children = block_children[red_side]
+            for symbol, child in block_children[blue_side].items():
+                red_child = red_children.get(symbol)
+                if red_child is None:
+                    undo_log.append((red_children, symbol, None))
+                    red_children[symbol] = child
+                else:
+                    stack.append((red_child, child))
+        self.merges += 1
+        return True
+
+    def _undo(self, undo_log: list[tuple]) -> None:
+        for container, key, value in reversed(undo_log):
+            if value is None:
+                del container[key]
+            else:
+                container[key] = value
+
+
+def run_native_rpni(data: RpniData | PrefixTree) -> Dfa:
+    """
+    RPNI with the merge order of aalpy's `GsmRPNI`: the shallowest blue state is merged into the first red state it
+    is compatible with, or promoted to red. Ties between blue states of the same depth are broken by red state order
+    and then by the order the transitions were added in. States without a label after merging are rejecting,
+    like in aalpy.
+    """
+
+    pta = data if isinstance(data, PrefixTree) else build_prefix_tree(data=data)
+    merger = StateMerger(pta=pta)
+    red = [0]
+    is_red = [False] * pta.num_states
+    is_red[0] = True
+
+    depths = pta.depths.tolist()
+    while True:
+        blue, blue_parent, blue_symbol = -1, -1, -1
+        for red_state in red:
+            for symbol, child in merger.block_children[red_state].items():
+                child = merger.find(child)
+                if not is_red[child] and (blue < 0 or depths[child] < depths[blue]):
+                    blue, blue_parent, blue_symbol = child, red_state, symbol
+        if blue < 0:
+            break
+
+        for red_state in red:
+            if merger.try_merge(red=red_state, blue=blue):
+                merger.block_children[blue_parent][blue_symbol] = red_state
+                break
+        else:
+            red.append(blue)
+            is_red[blue] = True
+
+    states = [DfaState(f"s{i}", merger.outputs[state] == 1) for i, state in enumerate(red)]
+    state_indices = {state: i for i, state in enumerate(red)}
+    for state, red_state in zip(states, red):
+        for symbol, child in merger.block_children[red_state].items():
+            child = merger.find(child)
+            state.transitions[pta.alphabet[symbol]] = states[state_indices[child]]
+    return Dfa(states[0], states)
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Hashable
+
+import numpy as np
+from aalpy.learning_algs.deterministic_passive.rpni_helper_functions import RpniNode
+from numpy.typing import NDArray
+
+from automaton_tables.sparse_transitions import build_sparse_transitions, SparseTransitions
+
+RpniData = list[tuple[tuple[Any, ...], bool]]
+
+UNKNOWN = -1
+
+
+@dataclass(eq=False)
+class PrefixTree:
+    """
+    Prefix tree acceptor of labelled words as arrays. Node 0 is the root, `children[node, symbol]` is the child of
+    a node on the symbol with index `symbol` in `alphabet` (-1 if there is none), stored sparsely so that memory
+    does not grow with the alphabet. `outputs[node]` is 1 or 0 for the end of a positive or negative word and -1
+    otherwise. Symbols are indexed in the order they first appear in the words sorted by length, which is the order
+    aalpy's `createPTA` inserts children in.
+
+    The tree is built once per sample and shared by the statistics of the drivers and the native learner. The
+    statistics are computed on first access.
+    """
+
+    alphabet: list[Hashable]
+    children: SparseTransitions
+    outputs: NDArray[np.int8]
+    depths: NDArray[np.int64]
+
+    @property
+    def num_states(self) -> int:
+        return len(self.outputs)
+
+    @cached_property
+    def depth_histogram(self) -> NDArray[np.int64]:
+        """Number of nodes at every depth, from the root at depth 0 to the longest word."""
+
+        return np.bincount(self.depths)
+
+    @cached_property
+    def symbol_counts(self) -> NDArray[np.int64]:
+        """Number of edges labelled with every symbol of the alphabet."""
+
+        return np.bincount(self.children.symbols, minlength=len(self.alphabet))
+
+    @cached_property
+    def branching_histogram(self) -> NDArray[np.int64]:
+        """Number of nodes with 0, 1, 2, ... children."""
+
+        return np.bincount(self.children.degrees, minlength=1)
+
+    @property
+    def mean_branching(self) -> float:
+        """Average number of children of the inner nodes."""
+
+        inner_nodes = self.num_states - self.branching_histogram[0]
+        return float((self.num_states - 1) / inner_nodes) if inner_nodes else 0.0
+
+
+def build_prefix_tree(data: RpniData) -> PrefixTree:
+    """Builds the prefix tree of RPNI data. Raises a ValueError when a word has both labels."""
+
+    sorted_data = sorted(data, key=lambda example: len(example[0]))
+    symbol_indices: dict[Hashable, int] = {}
+    for word, _ in sorted_data:
+        for symbol in word:
+            symbol_indices.setdefault(symbol, len(symbol_indices))
+
+    children: dict[tuple[int, int], int] = {}
+    outputs = [UNKNOWN]
+    depths = [0]
+    for word, label in sorted_data:
+        node = 0
+        for symbol in word:
+            key = (node, symbol_indices[symbol])
+            child = children.get(key)
+            if child is None:
+                child = len(outputs)
+                children[key] = child
+                outputs.append(UNKNOWN)
+                depths.append(depths[node] + 1)
+            node = child
+        if outputs[node] == UNKNOWN:
+            outputs[node] = int(label)
+        elif outputs[node] != int(label):
+            raise ValueError("Data provided to RPNI is not deterministic. Ensure that the data is deterministic.")
+
+    return PrefixTree(
+        alphabet=list(symbol_indices),
+        children=build_sparse_transitions(
+            sources=[source for source, _ in children],
+            symbols=[symbol for _, symbol in children],
+            targets=list(children.values()),
+            defaults=np.full(len(outputs), -1),
+            alphabet_size=len(symbol_indices),
+        ),
+        outputs=np.array(outputs, dtype=np.int8),
+        depths=np.array(depths, dtype=np.int64),
+    )
+
+
+def to_rpni_nodes(pta: PrefixTree) -> RpniNode:
+    """
+    Converts the tree to the linked nodes of aalpy's RPNI and returns the root, for running aalpy on a tree built once
+    with `build_prefix_tree`. Nodes are created in the order `createPTA` creates them, so children are in the same
+    order and aalpy merges the same states as it does on its own tree.
+    """
+
+    nodes = [RpniNode(output=None if output == UNKNOWN else bool(output)) for output in pta.outputs.tolist()]
+    for source, symbol, target in sorted(
+        zip(pta.children.edge_states.tolist(), pta.children.symbols.tolist(), pta.children.targets.tolist()),
+        key=lambda edge: edge[2],
+    ):
+        nodes[target].prefix = nodes[source].prefix + (pta.alphabet[symbol],)
+        nodes[source].children[pta.alphabet[symbol]] = nodes[target]
+    return nodes[0]
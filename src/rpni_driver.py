@@ -1,33 +1,48 @@
-from collections import deque
 from time import perf_counter
-from typing import Any
 
+import numpy as np
 from aalpy import Dfa
-from aalpy.learning_algs.deterministic_passive.RPNI import RPNI
-from aalpy.learning_algs.deterministic_passive.rpni_helper_functions import createPTA
 from tabulate import tabulate
 
 from data_generation.datasets import create_rpni_benchmark_data
+from data_generation.rpni_samples import create_rpni_benchmark_sample
+from rpni.learner import run_native_rpni
+from rpni.pta import build_prefix_tree, PrefixTree, RpniData, to_rpni_nodes
 
+try:
+    from aalpy.learning_algs.deterministic_passive.RPNI import RPNI
+except ImportError:  # aalpy >= 1.5 ships the same algorithm as GsmRPNI
+    from aalpy.learning_algs.deterministic_passive.GsmRPNI import GsmRPNI as RPNI
 
-def count_pta_states(data: list[tuple[tuple[Any, ...], bool]]) -> int:
-    root_node = createPTA(data, automaton_type="dfa")
-    pta_state_count = 0
-    q = deque([root_node])
-    while q:
-        pta_state_count += 1
-        current_node = q.popleft()
-        for child in current_node.children.values():
-            q.append(child)
 
-    return pta_state_count
+class PrefixTreeRPNI(RPNI):
+    """aalpy's RPNI for DFAs, started from a shared `PrefixTree` instead of a prefix tree of its own."""
 
+    def __init__(self, pta: PrefixTree, print_info: bool = False) -> None:
+        super().__init__(data=[], automaton_type="dfa", print_info=print_info)
+        self.root_node = to_rpni_nodes(pta=pta)
+
+
+def count_pta_states(data: RpniData | PrefixTree) -> int:
+    pta = data if isinstance(data, PrefixTree) else build_prefix_tree(data=data)
+    return pta.num_states
+
+
+def measure_rpni_alphabet_dependence(learner: str = "aalpy") -> None:
+    """
+    Learns benchmark data of growing alphabets with aalpy's RPNI (`learner="aalpy"`) or the native array-based
+    RPNI (`learner="native"`). Only the merging phase is timed. The prefix tree is built once per sample and shared by
+    the PTA columns and both learners; aalpy's RPNI gets it converted to its node type before the timer starts.
+    """
+
+    if learner not in ("aalpy", "native"):
+        raise ValueError(f"Unknown RPNI learner: {learner}")
 
-def measure_rpni_alphabet_dependence() -> None:
     results = []
     for alphabet_size in [2, 4, 8, 16, 32, 64]:
         average_data_len = 0.0
         average_pta_state_count = 0.0
+        average_pta_branching = 0.0
         average_model_state_count = 0.0
         average_time = 0.0
 
@@ -35,25 +50,32 @@ def measure_rpni_alphabet_dependence() -> None:
         for i in range(NUM_OF_RUNS):
             print(f"[{i}] Creating data with alphabet size: {alphabet_size}")
             data = create_rpni_benchmark_data(alphabet_size=alphabet_size)
-            pta_state_count = count_pta_states(data=data)
-
-            rpni = RPNI(data=data, automaton_type="dfa", print_info=False)
-
-            print(f"[{i}] Running RPNI with alphabet size: {alphabet_size}")
-            start = perf_counter()
-            model: Dfa | None = rpni.run_rpni()
-            end = perf_counter()
+            pta = build_prefix_tree(data=data)
+
+            print(f"[{i}] Running {learner} RPNI with alphabet size: {alphabet_size}")
+            model: Dfa | None
+            if learner == "native":
+                start = perf_counter()
+                model = run_native_rpni(data=pta)
+                end = perf_counter()
+            else:
+                rpni = PrefixTreeRPNI(pta=pta)
+                start = perf_counter()
+                model = rpni.run_rpni()
+                end = perf_counter()
 
             if model is None:
                 raise ValueError("Data provided to RPNI is not deterministic. Ensure that the data is deterministic.")
 
             average_data_len += len(data)
-            average_pta_state_count += pta_state_count
+            average_pta_state_count += count_pta_states(data=pta)
+            average_pta_branching += pta.mean_branching
             average_model_state_count += len(model.states)
             average_time += end - start
 
         average_data_len /= NUM_OF_RUNS
         average_pta_state_count /= NUM_OF_RUNS
+        average_pta_branching /= NUM_OF_RUNS
         average_model_state_count /= NUM_OF_RUNS
         average_time /= NUM_OF_RUNS
 
@@ -62,15 +84,59 @@ def measure_rpni_alphabet_dependence() -> None:
                 alphabet_size,
                 average_data_len,
                 average_pta_state_count,
+                average_pta_branching,
                 average_model_state_count,
                 average_time,
             ),
         )
 
-    headers = ["Alphabet size", "Number of examples", "PTA states", "Number of states", "Time"]
+    headers = ["Alphabet size", "Number of examples", "PTA states", "PTA branching", "Number of states", "Time"]
     results_array = tabulate(results, headers=headers, tablefmt="grid")
     print(results_array)
 
 
+def measure_rpni_alphabet_scaling(
+    alphabet_sizes: tuple[int, ...] = (64, 256, 1024, 4096),
+    num_examples: int = 100_000,
+    max_seq_len: int = 8,
+    num_of_runs: int = 5,
+    seed: int = 42,
+) -> None:
+    """
+    Alphabet-scaling study beyond the sizes `create_rpni_benchmark_data` supports, with the native learner on
+    seeded samples from `create_rpni_benchmark_sample`. Every run gets its own seed derived from `seed`.
+    """
+
+    results = []
+    for alphabet_size in alphabet_sizes:
+        run_seeds = np.random.SeedSequence([seed, alphabet_size]).generate_state(num_of_runs)
+        examples, pta_states, model_states, times = [], [], [], []
+        for i, run_seed in enumerate(run_seeds):
+            print(f"[{i}] Creating {num_examples} examples with alphabet size: {alphabet_size}")
+            sample = create_rpni_benchmark_sample(
+                alphabet_size=alphabet_size,
+                num_examples=num_examples,
+                max_seq_len=max_seq_len,
+                seed=int(run_seed),
+            )
+            pta = build_prefix_tree(data=sample.labelled_sequences())
+
+            print(f"[{i}] Running native RPNI with alphabet size: {alphabet_size}")
+            start = perf_counter()
+            model = run_native_rpni(data=pta)
+            times.append(perf_counter() - start)
+            examples.append(sample.num_words)
+            pta_states.append(pta.num_states)
+            model_states.append(len(model.states))
+
+        results.append(
+            (alphabet_size, np.mean(examples), np.mean(pta_states), np.mean(model_states), np.mean(times)),
+        )
+
+    headers = ["Alphabet size", "Number of examples", "PTA states", "Number of states", "Time"]
+    print(tabulate(results, headers=headers, tablefmt="grid"))
+
+
 if __name__ == "__main__":
-    measure_rpni_alphabet_dependence()
+    for rpni_learner in ("aalpy", "native"):
+        measure_rpni_alphabet_dependence(learner=rpni_learner)
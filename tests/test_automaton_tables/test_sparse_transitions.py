@@ -0,0 +1,49 @@
+import numpy as np
+
+from automaton_tables.sparse_transitions import build_sparse_transitions, sparsify_transitions
+
+
+def test_lookup_matches_dense_table() -> None:
+    rng = np.random.default_rng(0)
+    dense = rng.integers(0, 50, size=(50, 30))
+    self_loops = rng.random(dense.shape) < 0.8
+    dense[self_loops] = np.nonzero(self_loops)[0]
+    transitions = sparsify_transitions(transitions=dense, defaults=np.arange(50))
+
+    states = rng.integers(0, 50, size=1000)
+    symbols = rng.integers(0, 30, size=1000)
+    assert transitions.num_transitions < dense.size
+    assert (transitions.lookup(states=states, symbols=symbols) == dense[states, symbols]).all()
+    assert (transitions[states.reshape(10, 100), symbols[:100]] == dense[states.reshape(10, 100), symbols[:100]]).all()
+    assert (transitions.to_dense() == dense).all()
+
+
+def test_missing_and_unknown_symbols_take_the_default() -> None:
+    transitions = build_sparse_transitions(
+        sources=[0, 0, 2],
+        symbols=[3, 1, 0],
+        targets=[1, 2, 0],
+        defaults=[-1, 1, 2],
+        alphabet_size=4,
+    )
+
+    assert transitions.row_offsets.tolist() == [0, 2, 2, 3]
+    assert transitions.symbols.tolist() == [1, 3, 0]
+    assert transitions[[0, 0, 0, 0, 1, 2, 2], [0, 1, 3, 4, 1, 0, -1]].tolist() == [-1, 2, 1, -1, 1, 0, 2]
+
+
+def test_take_rows_and_padding() -> None:
+    dense = np.array([[1, 0], [2, 1], [2, 0]])
+    transitions = sparsify_transitions(transitions=dense, defaults=np.arange(3))
+
+    assert (transitions.take_rows(rows=np.array([2, 0, 2])).to_dense() == dense[[2, 0, 2]]).all()
+    padded = transitions.padded()
+    assert padded.shape == (3, 3)
+    assert (padded.to_dense() == np.hstack([dense, np.arange(3)[:, np.newaxis]])).all()
+
+
+def test_empty_table() -> None:
+    transitions = build_sparse_transitions(sources=[], symbols=[], targets=[], defaults=[0, 1], alphabet_size=5)
+
+    assert transitions[[0, 1], [4, 2]].tolist() == [0, 1]
+    assert transitions.padded()[[1], [5]].tolist() == [1]
@@ -0,0 +1,93 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import benchmark_driver
+from benchmarking.cases import HOT_FUNCTION_CASES
+from benchmarking.harness import (
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    measure,
+    median_confidence_interval,
+    save_results,
+)
+
+
+def result(name: str, median: float, spread: float = 0.01) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        repetitions=10,
+        median_seconds=median,
+        ci_low_seconds=median - spread,
+        ci_high_seconds=median + spread,
+        peak_memory_bytes=0,
+    )
+
+
+def test_measure() -> None:
+    calls = []
+
+    def benchmark() -> list[int]:
+        calls.append(1)
+        time.sleep(0.001)
+        return [0] * 100_000
+
+    measured = measure(name="sleep", benchmark=benchmark, warmup=2, repetitions=5)
+    assert len(calls) == 2 + 5 + 1
+    assert measured.repetitions == 5
+    assert 0.001 <= measured.ci_low_seconds <= measured.median_seconds <= measured.ci_high_seconds
+    assert measured.peak_memory_bytes >= 100_000 * 8
+
+
+def test_median_confidence_interval() -> None:
+    timings = np.array([1.0, 2.0, 3.0, 4.0, 100.0])
+    low, high = median_confidence_interval(timings=timings)
+    assert 1.0 <= low <= 3.0 <= high <= 100.0
+    assert median_confidence_interval(timings=np.full(5, 2.0)) == (2.0, 2.0)
+
+
+def test_compare_results() -> None:
+    baseline = [result("same", 1.0), result("slower", 1.0), result("noisy", 1.0, spread=0.5), result("gone", 1.0)]
+    current = [result("same", 1.02), result("slower", 1.5), result("noisy", 1.3, spread=0.5), result("new", 1.0)]
+
+    comparisons = {comparison.name: comparison for comparison in compare_results(baseline=baseline, current=current)}
+    assert set(comparisons) == {"same", "slower", "noisy"}
+    assert not comparisons["same"].regression
+    assert comparisons["slower"].regression
+    assert comparisons["slower"].ratio == pytest.approx(1.5)
+    assert not comparisons["noisy"].regression, "Overlapping confidence intervals are not a regression"
+
+
+def test_save_and_load_results(tmp_path: Path) -> None:
+    results = [result("a", 1.0), result("b", 2.0)]
+    save_results(results=results, file_path=str(tmp_path / "results"))
+    assert load_results(file_path=str(tmp_path / "results")) == results
+
+
+def test_baseline_covers_every_case() -> None:
+    baseline = load_results(file_path=benchmark_driver.BASELINE_PATH)
+    assert {case.name for case in HOT_FUNCTION_CASES} <= {result.name for result in baseline}
+
+
+@pytest.mark.parametrize(
+    "argv, output_path",
+    [
+        pytest.param(["run"], benchmark_driver.LATEST_PATH, id="default"),
+        pytest.param(["run", "--update-baseline"], benchmark_driver.BASELINE_PATH, id="update-baseline"),
+        pytest.param(["run", "--output", "results"], "results", id="output"),
+    ],
+)
+def test_run_writes_the_baseline_only_when_asked(
+    argv: list[str], output_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    output_paths = []
+    monkeypatch.setattr(
+        benchmark_driver,
+        "run_benchmarks",
+        lambda output_path, **kwargs: output_paths.append(output_path),
+    )
+    assert benchmark_driver.main(argv=argv) == 0
+    assert output_paths == [output_path]
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from automata.fa.dfa import DFA
+
+from data_generation import datasets
+from data_generation.dfa_tables import compile_dfa
+from data_generation.language_accuracy import compare_languages
+from data_generation.transformations import translate_automata_to_aalpy
+from gig.mca import construct_mca
+from gig_driver import measure_language_quality
+
+EVEN_NUMBER_OF_AS = DFA(
+    states={"even", "odd"},
+    input_symbols={"a", "b"},
+    initial_state="even",
+    final_states={"even"},
+    transitions={"even": {"a": "odd", "b": "even"}, "odd": {"a": "even", "b": "odd"}},
+)
+EVEN_NUMBER_OF_AS_OR_BS = datasets.create_dfa_for_even_number_of_as_or_bs()
+
+
+def test_equivalent_dfas() -> None:
+    comparison = compare_languages(
+        learned=translate_automata_to_aalpy(dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY),
+        reference=datasets.DFA_FOR_A_AND_B_ALTERNATELY,
+        max_len=10,
+    )
+
+    assert comparison.equivalent
+    assert comparison.distinguishing_word is None
+    assert np.allclose(comparison.agreement, 1.0)
+    assert comparison.rates()[0] == pytest.approx(1.0)
+
+
+def test_class_fractions_per_length() -> None:
+    comparison = compare_languages(learned=EVEN_NUMBER_OF_AS, reference=EVEN_NUMBER_OF_AS_OR_BS, max_len=3)
+
+    assert not comparison.equivalent
+    assert comparison.distinguishing_word == ("a",)
+    # Length 2: "aa" and "bb" are accepted by both, "ab" and "ba" have an odd number of both symbols.
+    assert comparison.accepted_by_both.tolist() == pytest.approx([1.0, 0.5, 0.5, 0.5])
+    assert comparison.accepted_by_reference_only.tolist() == pytest.approx([0.0, 0.5, 0.0, 0.5])
+    assert comparison.accepted_by_learned_only.tolist() == pytest.approx([0.0, 0.0, 0.0, 0.0])
+    assert comparison.rejected_by_both.tolist() == pytest.approx([0.0, 0.0, 0.5, 0.0])
+
+
+def test_rates_match_exhaustive_enumeration() -> None:
+    comparison = compare_languages(learned=EVEN_NUMBER_OF_AS, reference=EVEN_NUMBER_OF_AS_OR_BS, max_len=6)
+    reference = compile_dfa(dfa=EVEN_NUMBER_OF_AS_OR_BS, alphabet=["a", "b"])
+
+    for length in range(7):
+        words = [
+            format(i, f"0{length}b").replace("0", "a").replace("1", "b") if length else "" for i in range(2**length)
+        ]
+        symbols, offsets = reference.encode(words=words)
+        reference_accepts = reference.accepts_words(symbols=symbols, offsets=offsets)
+        learned_accepts = np.array([EVEN_NUMBER_OF_AS.accepts_input(word) for word in words])
+        assert comparison.agreement[length] == pytest.approx(np.mean(reference_accepts == learned_accepts))
+
+
+def test_different_alphabets() -> None:
+    reference = DFA(
+        states={"even", "odd"},
+        input_symbols={"a", "b", "c"},
+        initial_state="even",
+        final_states={"even"},
+        transitions={"even": {"a": "odd", "b": "even", "c": "even"}, "odd": {"a": "even", "b": "odd", "c": "odd"}},
+    )
+    comparison = compare_languages(learned=EVEN_NUMBER_OF_AS, reference=reference, max_len=1)
+
+    assert comparison.distinguishing_word == ("c",)
+    assert comparison.accepted_by_reference_only.tolist() == pytest.approx([0.0, 1 / 3])
+    assert (
+        compare_languages(learned=EVEN_NUMBER_OF_AS, reference=datasets.DFA_FOR_A_AND_B_ALTERNATELY).distinguishing_word
+        == ()
+    )
+
+
+def test_measure_language_quality() -> None:
+    train_plus, _, _, _ = datasets.even_number_of_as()
+    mca = construct_mca(s_plus=train_plus)
+    quality, tp, tn, fp, fn = measure_language_quality(automaton=mca, reference=compile_dfa(dfa=EVEN_NUMBER_OF_AS))
+
+    assert 0.0 < quality < 1.0
+    assert tp + fp == pytest.approx(1.0)
+    assert tn + fn == pytest.approx(1.0)
@@ -0,0 +1,74 @@
+import os
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from data_generation import datasets
+from data_generation.mapped_samples import (
+    crop_sample,
+    open_sample,
+    pickle_to_sample,
+    sample_to_pickle,
+    sample_to_text,
+    text_to_sample,
+    write_sample,
+)
+from data_generation.transformations import crop_data
+
+
+def test_write_and_open_sample(tmp_path: Path) -> None:
+    positive, negative = ["ab", "", "abba"], ["b", "bab"]
+    write_sample(path=str(tmp_path / "sample"), positive=positive, negative=negative)
+    sample = open_sample(path=str(tmp_path / "sample"))
+
+    assert isinstance(sample.symbols, np.memmap)
+    assert sample.symbols.dtype == np.uint8
+    assert sample.alphabet == ["a", "b"]
+    assert (sample.num_words, sample.num_positive) == (5, 3)
+    assert sample.positive() == positive
+    assert sample.negative() == negative
+    assert sample.words(indices=[4, 1]) == ["bab", ""]
+
+
+def test_write_sample_with_large_alphabet(tmp_path: Path) -> None:
+    positive = [chr(0x400 + code_point) * 2 for code_point in range(300)]
+    write_sample(path=str(tmp_path / "sample"), positive=positive, negative=[])
+    sample = open_sample(path=str(tmp_path / "sample"))
+
+    assert sample.symbols.dtype == np.uint16
+    assert sample.positive() == positive
+    assert sample.negative() == []
+
+
+def test_crop_sample_draws_the_same_words_as_crop_data(tmp_path: Path) -> None:
+    data = datasets.a_and_b_alternately(positive_data_size=200, negative_data_size=150, min_seq_len=1, seed=0)
+    write_sample(path=str(tmp_path / "sample"), positive=data[0], negative=data[1])
+    sample = open_sample(path=str(tmp_path / "sample"))
+
+    assert crop_sample(sample=sample, size=50, rnd=random.Random(7)) == crop_data(
+        data=data, size=50, rnd=random.Random(7)
+    )
+
+
+def test_pickle_conversion_round_trip(tmp_path: Path) -> None:
+    positive, negative = ["ab", "abab"], ["", "aa"]
+    write_sample(path=str(tmp_path / "sample"), positive=positive, negative=negative)
+    sample_to_pickle(path=str(tmp_path / "sample"), pickle_path=str(tmp_path / "data.pkl"))
+    pickle_to_sample(pickle_path=str(tmp_path / "data.pkl"), path=str(tmp_path / "converted"))
+
+    converted = open_sample(path=str(tmp_path / "converted"))
+    assert (converted.positive(), converted.negative()) == (positive, negative)
+
+
+def test_text_conversion_round_trip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    positive, negative = ["ab", "abab"], ["", "aa"]
+    write_sample(path="sample", positive=positive, negative=negative)
+    sample_to_text(path="sample", positive_file_path="positive", negative_file_path="negative")
+    text_to_sample(positive_file_path="positive", negative_file_path="negative", path="converted")
+
+    converted = open_sample(path="converted")
+    assert (converted.positive(), converted.negative()) == (positive, negative)
@@ -0,0 +1,120 @@
+import random
+
+import numpy as np
+import pytest
+from aalpy import AutomatonSUL, MarkovChain, run_Alergia
+
+from data_generation import datasets
+from data_generation.dfa_tables import compile_dfa
+from data_generation.markov_chains import (
+    accepted_probabilities,
+    compile_markov_chain,
+    exact_solution_quality,
+    MarkovChainTable,
+    measure_solution_quality,
+    sample_sequences,
+)
+from data_generation.transformations import add_noise
+
+
+def learn_markov_chain(noise_percentage: float) -> MarkovChain:
+    positive, negative = datasets.a_and_b_alternately(positive_data_size=500, negative_data_size=500, min_seq_len=1)
+    data = add_noise(positive=positive, negative=negative, noise_percentage=noise_percentage, rnd=random.Random(0))
+    return run_Alergia(data=data, automaton_type="mc", print_info=False)
+
+
+def test_compile_markov_chain() -> None:
+    mc = learn_markov_chain(noise_percentage=0.1)
+    chain = compile_markov_chain(mc=mc)
+
+    assert chain.num_states == len(mc.states)
+    assert np.allclose(chain.probabilities.sum(axis=1), 1.0)
+    assert chain.output_alphabet[chain.outputs[chain.initial_state]] == mc.initial_state.output
+
+
+def test_sample_sequences_follow_the_transition_probabilities() -> None:
+    mc = learn_markov_chain(noise_percentage=0.2)
+    chain = compile_markov_chain(mc=mc)
+    outputs, offsets = sample_sequences(chain=chain, lengths=np.full(20000, 1), rng=np.random.default_rng(0))
+
+    assert np.array_equal(np.diff(offsets), np.full(20000, 2))
+    assert np.all(outputs[offsets[:-1]] == chain.outputs[chain.initial_state])
+    second_outputs = np.bincount(outputs[offsets[:-1] + 1], minlength=len(chain.output_alphabet)) / 20000
+    expected = np.bincount(chain.outputs, weights=chain.probabilities[chain.initial_state])
+    assert np.allclose(second_outputs, expected, atol=0.02)
+
+
+@pytest.mark.parametrize("noise_percentage", [0.0, 0.05, 0.3])
+def test_measure_solution_quality_matches_sul_sampling(noise_percentage: float) -> None:
+    mc = learn_markov_chain(noise_percentage=noise_percentage)
+    random.seed(0)
+    words = datasets.generate_data_from_mc_sul(sul=AutomatonSUL(automaton=mc), size=5000, rnd=random.Random(0))
+    reference = sum(datasets.DFA_FOR_A_AND_B_ALTERNATELY.accepts_input(word) for word in words) / len(words)
+
+    quality = measure_solution_quality(
+        mc=mc, dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY, attempts=5000, rng=np.random.default_rng(0)
+    )
+    assert quality == pytest.approx(reference, abs=0.03)
+    assert datasets.measure_a_and_b_alternately_solution_quality(
+        automaton=mc, rnd=random.Random(1)
+    ) == datasets.measure_a_and_b_alternately_solution_quality(automaton=mc, rnd=random.Random(1))
+
+
+def test_accepted_probabilities_of_a_simple_chain() -> None:
+    chain = MarkovChainTable(
+        output_alphabet=["a", "b"],
+        outputs=np.array([0, 1, 0]),
+        probabilities=np.array([[0.0, 0.75, 0.25], [0.5, 0.0, 0.5], [0.0, 0.0, 1.0]]),
+        initial_state=0,
+    )
+    probabilities = accepted_probabilities(mc=chain, dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY, max_seq_len=3)
+
+    assert probabilities == pytest.approx([1.0, 0.75, 0.75, 0.75 * 0.5 * 0.75])
+    assert exact_solution_quality(
+        mc=chain, dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY, min_seq_len=1, max_seq_len=3
+    ) == pytest.approx((0.75 + 0.75 + 0.28125) / 3)
+
+
+@pytest.mark.parametrize("noise_percentage", [0.05, 0.3])
+def test_exact_solution_quality_matches_sampling(noise_percentage: float) -> None:
+    mc = learn_markov_chain(noise_percentage=noise_percentage)
+    sampled = measure_solution_quality(
+        mc=mc, dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY, attempts=50000, rng=np.random.default_rng(0)
+    )
+
+    assert datasets.exact_a_and_b_alternately_solution_quality(automaton=mc) == pytest.approx(sampled, abs=0.01)
+
+
+def test_accepted_probabilities_match_the_product_chain() -> None:
+    rng = np.random.default_rng(0)
+    num_states, max_seq_len = 200, 8
+    probabilities = np.zeros((num_states, num_states))
+    for state in range(num_states):
+        probabilities[state, rng.choice(num_states, size=3, replace=False)] = rng.dirichlet(np.ones(3))
+    chain = MarkovChainTable(
+        output_alphabet=["a", "b", "c"],
+        outputs=rng.integers(0, 3, size=num_states),
+        probabilities=probabilities,
+        initial_state=0,
+    )
+    table = compile_dfa(dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY)
+
+    # Product chain over (chain state, DFA state) pairs, with an extra rejecting sink for the output "c".
+    sink = table.num_states
+    transitions = np.hstack([np.vstack([table.transitions, [sink, sink]]), np.full((sink + 1, 1), sink)])
+    successors = transitions[:, chain.outputs].T
+    product = np.zeros((num_states * (sink + 1), num_states * (sink + 1)))
+    for state, next_state in zip(*np.nonzero(probabilities)):
+        for dfa_state in range(sink + 1):
+            target = next_state * (sink + 1) + successors[next_state, dfa_state]
+            product[state * (sink + 1) + dfa_state, target] += probabilities[state, next_state]
+    accepting = np.tile(np.append(table.accepting, False), num_states)
+    distribution = np.zeros(num_states * (sink + 1))
+    distribution[successors[0, table.initial_state]] = 1.0
+    expected = []
+    for _ in range(max_seq_len + 1):
+        expected.append(distribution[accepting].sum())
+        distribution = distribution @ product
+
+    actual = accepted_probabilities(mc=chain, dfa=table, max_seq_len=max_seq_len)
+    assert actual == pytest.approx(expected)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from data_generation import rpni_samples
+from data_generation.rpni_samples import create_rpni_benchmark_sample, first_occurrences
+from rpni.pta import build_prefix_tree
+
+
+def test_sample_is_seeded() -> None:
+    first = create_rpni_benchmark_sample(alphabet_size=1024, num_examples=5000, seed=3)
+    second = create_rpni_benchmark_sample(alphabet_size=1024, num_examples=5000, seed=3)
+    other = create_rpni_benchmark_sample(alphabet_size=1024, num_examples=5000, seed=4)
+
+    assert (first.symbols == second.symbols).all() and (first.labels == second.labels).all()
+    assert not np.array_equal(first.symbols, other.symbols)
+
+
+def test_words_are_unique_and_labelled_by_the_first_symbol() -> None:
+    sample = create_rpni_benchmark_sample(alphabet_size=3, num_examples=20_000, min_seq_len=0, max_seq_len=6)
+    data = sample.labelled_sequences()
+
+    assert len({word for word, _ in data}) == len(data) < 20_000
+    assert all(label == (len(word) > 0 and word[0] == 0) for word, label in data)
+    assert all(0 <= len(word) <= 6 for word, _ in data)
+    build_prefix_tree(data=data)
+
+
+def test_first_occurrences() -> None:
+    words = [[1, 2], [2, 1], [1, 2], [], [1], [], [1, 2, 0]]
+    offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum([len(word) for word in words], out=offsets[1:])
+    symbols = np.array([symbol for word in words for symbol in word], dtype=np.int64)
+
+    assert first_occurrences(symbols=symbols, offsets=offsets).tolist() == [True, True, False, True, True, False, True]
+
+
+def test_first_occurrences_survive_hash_collisions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        rpni_samples, "hash_words", lambda symbols, offsets: np.zeros(len(offsets) - 1, dtype=np.uint64)
+    )
+    words = [[1, 2], [2, 1], [1, 2], [2, 1], [3, 3], [1], [1]]
+    offsets = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum([len(word) for word in words], out=offsets[1:])
+    symbols = np.array([symbol for word in words for symbol in word], dtype=np.int64)
+
+    keep = rpni_samples.first_occurrences(symbols=symbols, offsets=offsets)
+    assert keep.tolist() == [True, True, False, False, True, True, False]
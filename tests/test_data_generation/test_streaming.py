@@ -0,0 +1,103 @@
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+import pytest
+
+from data_generation import datasets
+from data_generation.mapped_samples import open_sample
+from data_generation.streaming import (
+    a_and_b_alternately_chunks,
+    coin_toss_chunks,
+    rpni_benchmark_chunks,
+    WordChunk,
+    write_chunks_to_sample,
+    write_chunks_to_text,
+)
+
+
+def test_a_and_b_alternately_chunks_are_labelled_by_the_dfa() -> None:
+    chunks = list(a_and_b_alternately_chunks(positive_data_size=300, negative_data_size=200, chunk_size=128))
+    positive = [word for chunk in chunks for word in chunk.words(label=True)]
+    negative = [word for chunk in chunks for word in chunk.words(label=False)]
+
+    assert [chunk.num_words for chunk in chunks] == [128, 128, 128, 116]
+    assert (len(positive), len(negative)) == (300, 200)
+    assert all(datasets.DFA_FOR_A_AND_B_ALTERNATELY.accepts_input(word) for word in positive)
+    assert not any(datasets.DFA_FOR_A_AND_B_ALTERNATELY.accepts_input(word) for word in negative)
+    assert all(word.startswith("a") and 2 <= len(word) <= 20 for word in negative)
+    assert len(set(negative)) > 50, "Negative words are random, not one word per length"
+
+
+def test_a_and_b_alternately_chunks_draw_negative_words_uniformly() -> None:
+    chunks = a_and_b_alternately_chunks(positive_data_size=0, negative_data_size=15000, min_seq_len=5, max_seq_len=5)
+    counts = Counter(word for chunk in chunks for word in chunk.words(label=False))
+
+    assert len(counts) == 15, "All 15 negative words of length 5 start with 'a'"
+    assert counts["ababb"] / 15000 == pytest.approx(1 / 15, abs=0.01)
+    expected = 15000 / 15
+    chi_square = sum((count - expected) ** 2 / expected for count in counts.values())
+    assert chi_square < 36.12, "Critical value of 14 degrees of freedom at the 0.001 level"
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        pytest.param(lambda **kwargs: a_and_b_alternately_chunks(100, 100, **kwargs), id="a_and_b_alternately"),
+        pytest.param(lambda **kwargs: coin_toss_chunks(n=200, **kwargs), id="coin_toss"),
+        pytest.param(lambda **kwargs: rpni_benchmark_chunks(alphabet_size=4, **kwargs), id="rpni_benchmark"),
+    ],
+)
+def test_chunks_can_be_generated_separately(chunks: Callable[..., Iterator[WordChunk]]) -> None:
+    whole = list(chunks(chunk_size=32, seed=3))
+    parts = list(chunks(chunk_size=32, seed=3, stop_chunk=2)) + list(chunks(chunk_size=32, seed=3, start_chunk=2))
+    other_seed = list(chunks(chunk_size=32, seed=4))
+
+    assert len(whole) == len(parts)
+    for chunk, part in zip(whole, parts):
+        assert np.array_equal(chunk.symbols, part.symbols)
+        assert np.array_equal(chunk.offsets, part.offsets)
+        assert np.array_equal(chunk.labels, part.labels)
+    assert not all(np.array_equal(chunk.symbols, other.symbols) for chunk, other in zip(whole, other_seed))
+
+
+def test_rpni_benchmark_chunks_match_the_layout_of_create_rpni_benchmark_data() -> None:
+    data = [
+        word for chunk in rpni_benchmark_chunks(alphabet_size=4, chunk_size=100) for word in chunk.labelled_sequences()
+    ]
+    reference = datasets.create_rpni_benchmark_data(alphabet_size=4)
+
+    assert len(data) == len(reference)
+    assert data[0] == ((), False)
+    assert data[1 : 4 * 4 + 2] == reference[1 : 4 * 4 + 2]
+    assert [(len(word), label) for word, label in data[1:]] == [(len(word), label) for word, label in reference[1:]]
+    assert all(label == (len(word) > 0 and word[0] == 0) for word, label in data)
+
+
+def test_coin_toss_chunks() -> None:
+    words = [word for chunk in coin_toss_chunks(n=500, chunk_size=64) for word in chunk.words(label=True)]
+
+    assert len(words) == 500
+    assert all(5 <= len(word) <= 12 and set(word) <= {"H", "T"} for word in words)
+
+
+def test_write_chunks_to_sample(tmp_path: Path) -> None:
+    chunks = list(a_and_b_alternately_chunks(positive_data_size=150, negative_data_size=170, chunk_size=64))
+    write_chunks_to_sample(chunks=chunks, path=str(tmp_path / "sample"), block_size=100)
+    sample = open_sample(path=str(tmp_path / "sample"))
+
+    assert sample.positive() == [word for chunk in chunks for word in chunk.words(label=True)]
+    assert sample.negative() == [word for chunk in chunks for word in chunk.words(label=False)]
+    assert sorted(os.listdir(tmp_path / "sample")) == ["alphabet.json", "labels.npy", "offsets.npy", "symbols.npy"]
+
+
+def test_write_chunks_to_text(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    chunks = list(a_and_b_alternately_chunks(positive_data_size=50, negative_data_size=70, chunk_size=16))
+    write_chunks_to_text(chunks=chunks, positive_file_path="positive", negative_file_path="negative")
+
+    assert datasets.read_data_from_file(file_path="positive") == [w for c in chunks for w in c.words(label=True)]
+    assert datasets.read_data_from_file(file_path="negative") == [w for c in chunks for w in c.words(label=False)]
@@ -0,0 +1,93 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from automata.fa.dfa import DFA
+
+from data_generation import datasets
+from data_generation.dfa_tables import compile_dfa
+from data_generation.transformations import translate_automata_to_aalpy
+from data_generation.word_sampler import sample_words, WordSampler
+
+EVEN_NUMBER_OF_AS = DFA(
+    states={"even", "odd"},
+    input_symbols={"a", "b"},
+    initial_state="even",
+    final_states={"even"},
+    transitions={"even": {"a": "odd", "b": "even"}, "odd": {"a": "even", "b": "odd"}},
+)
+
+
+@pytest.mark.parametrize(
+    "dfa",
+    [
+        pytest.param(datasets.DFA_FOR_A_AND_B_ALTERNATELY, id="automata-lib"),
+        pytest.param(translate_automata_to_aalpy(dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY), id="aalpy"),
+        pytest.param(datasets.create_dfa_for_even_number_of_as_or_bs(), id="aalpy even number of 'a's or 'b's"),
+    ],
+)
+def test_compile_dfa_agrees_with_the_dfa(dfa: object) -> None:
+    table = compile_dfa(dfa=dfa)
+    words = ["", "a", "ab", "aba", "abab", "b", "aa", "abb", "aab", "bab", "abba"]
+    symbols, offsets = table.encode(words=words)
+
+    expected = [
+        dfa.accepts_input(word) if isinstance(dfa, DFA) else dfa.execute_sequence(dfa.initial_state, word)[-1]
+        for word in words
+        if word
+    ]
+    assert table.accepts_words(symbols=symbols, offsets=offsets)[1:].tolist() == expected
+    assert table.accepts_words(symbols=symbols, offsets=offsets)[0] == table.accepting[table.initial_state]
+
+
+def test_word_sampler_counts_words() -> None:
+    sampler = WordSampler(dfa=EVEN_NUMBER_OF_AS, max_len=10)
+    rejected_sampler = WordSampler(dfa=EVEN_NUMBER_OF_AS, max_len=10, accepted=False)
+
+    assert [sampler.num_words(length=length) for length in range(5)] == [1, 1, 2, 4, 8]
+    assert [rejected_sampler.num_words(length=length) for length in range(5)] == [0, 1, 2, 4, 8]
+
+
+def test_word_sampler_is_uniform() -> None:
+    sampler = WordSampler(dfa=EVEN_NUMBER_OF_AS, max_len=3)
+    chunk = sampler.sample(lengths=np.full(8000, 3), rng=np.random.default_rng(0))
+    counts = Counter(chunk.words(label=True))
+
+    assert set(counts) == {"bbb", "aab", "aba", "baa"}
+    assert all(abs(count - 2000) < 200 for count in counts.values())
+
+
+@pytest.mark.parametrize("accepted", [True, False])
+def test_word_sampler_draws_words_of_the_language(accepted: bool) -> None:
+    sampler = WordSampler(dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY, max_len=20, accepted=accepted)
+    rng = np.random.default_rng(0)
+    chunk = sampler.sample(lengths=sampler.sample_lengths(size=1000, min_len=0, max_len=20, rng=rng), rng=rng)
+    words = chunk.words(label=accepted)
+
+    assert len(words) == 1000
+    assert all(datasets.DFA_FOR_A_AND_B_ALTERNATELY.accepts_input(word) == accepted for word in words)
+    assert all(len(word) <= 20 for word in words)
+    with pytest.raises(ValueError):
+        sampler.sample(lengths=np.array([21]), rng=rng)
+
+
+def test_sample_words_is_reproducible() -> None:
+    positive, negative = sample_words(dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY, rng=np.random.default_rng(1))
+
+    assert (len(positive), len(negative)) == (1000, 1000)
+    assert len(set(negative)) > 700
+    assert (positive, negative) == sample_words(dfa=datasets.DFA_FOR_A_AND_B_ALTERNATELY, rng=np.random.default_rng(1))
+
+
+def test_a_and_b_alternately_draws_distinct_words_of_both_labels() -> None:
+    positive, negative = datasets.a_and_b_alternately(positive_data_size=200, negative_data_size=200, max_seq_len=10)
+
+    assert len(positive) == 200 and len(negative) == 200
+    assert all(datasets.DFA_FOR_A_AND_B_ALTERNATELY.accepts_input(word) for word in positive)
+    assert not any(datasets.DFA_FOR_A_AND_B_ALTERNATELY.accepts_input(word) for word in negative)
+    assert all(word.startswith("a") for word in negative)
+    assert len(set(negative)) > 100
+    assert datasets.a_and_b_alternately(positive_data_size=200, negative_data_size=200, max_seq_len=10) == (
+        positive,
+        negative,
+    )
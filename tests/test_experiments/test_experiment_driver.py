@@ -0,0 +1,16 @@
+import math
+
+import pytest
+
+from experiment_driver import GRIDS
+from experiments.learners import LEARNERS
+from experiments.orchestrator import ExperimentGrid, run_cell
+
+
+@pytest.mark.parametrize("grid", [pytest.param(grid, id=f"{grid.learner}/{grid.dataset}") for grid in GRIDS])
+def test_every_grid_dataset_runs(grid: ExperimentGrid) -> None:
+    cell = grid.cells()[0]
+    metrics = run_cell(cell=cell)
+
+    assert set(metrics) >= set(LEARNERS[grid.learner].metric_labels)
+    assert all(math.isfinite(metrics[metric]) for metric in LEARNERS[grid.learner].metric_labels)
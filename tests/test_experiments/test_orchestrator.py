@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from experiments import learners
+from experiments.learners import Learner, Metrics
+from experiments.orchestrator import aggregate_results, code_version, ExperimentGrid, ResultStore, run_experiment
+
+calls: list[tuple[dict[str, Any], int]] = []
+
+
+def run_fake_cell(
+    dataset: Callable[..., Any],
+    dataset_parameters: dict[str, Any],
+    parameters: dict[str, Any],
+    seed: int,
+) -> Metrics:
+    calls.append((parameters, seed))
+    positive, _, _, _ = dataset(**dataset_parameters)
+    return {"words": len(positive), "score": parameters["x"] * 10 + seed}
+
+
+@pytest.fixture(autouse=True)
+def fake_learner(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls.clear()
+    learner = Learner(
+        run=run_fake_cell, parameter_labels={"x": "X"}, metric_labels={"words": "Words", "score": "Score"}
+    )
+    monkeypatch.setitem(learners.LEARNERS, "fake", learner)
+
+
+def grid(xs: list[int]) -> ExperimentGrid:
+    return ExperimentGrid(learner="fake", dataset="even_number_of_as", parameters={"x": xs}, seeds=[0, 1])
+
+
+def test_cells_and_keys() -> None:
+    cells = grid(xs=[1, 2]).cells()
+    assert [(dict(cell.parameters)["x"], cell.seed) for cell in cells] == [(1, 0), (1, 1), (2, 0), (2, 1)]
+    assert len({cell.key(code_version="v1") for cell in cells}) == 4
+    assert cells[0].key(code_version="v1") == grid(xs=[1]).cells()[0].key(code_version="v1")
+    assert cells[0].key(code_version="v1") != cells[0].key(code_version="v2")
+
+
+def test_code_version(tmp_path: Path) -> None:
+    (tmp_path / "module.py").write_text("x = 1\n")
+    version = code_version(root=tmp_path)
+    assert version == code_version(root=tmp_path)
+    (tmp_path / "module.py").write_text("x = 2\n")
+    assert version != code_version(root=tmp_path)
+
+
+def test_run_experiment_reuses_stored_cells(tmp_path: Path) -> None:
+    store = ResultStore(directory=str(tmp_path))
+
+    results = run_experiment(grid=grid(xs=[1, 2]), store=store, max_workers=1, version="v1")
+    assert len(calls) == 4
+    assert [metrics["score"] for metrics in results.values()] == [10, 11, 20, 21]
+
+    calls.clear()
+    results = run_experiment(grid=grid(xs=[1, 2, 3]), store=store, max_workers=1, version="v1")
+    assert calls == [({"x": 3}, 0), ({"x": 3}, 1)], "Only the new cells are computed"
+    assert len(results) == 6
+
+    calls.clear()
+    run_experiment(grid=grid(xs=[1]), store=store, max_workers=1, version="v2")
+    assert len(calls) == 2, "A new code version invalidates the stored results"
+
+
+def test_aggregate_results(tmp_path: Path) -> None:
+    experiment_grid = grid(xs=[1, 2])
+    results = run_experiment(grid=experiment_grid, store=ResultStore(directory=str(tmp_path)), max_workers=1)
+    table = aggregate_results(grid=experiment_grid, results=results)
+
+    lines = table.splitlines()
+    assert [column.strip() for column in lines[1].strip("|").split("|")] == ["X", "Words", "Score"]
+    assert [column.strip() for column in lines[3].strip("|").split("|")] == ["1", "9", "10.5"]
+    assert [column.strip() for column in lines[5].strip("|").split("|")] == ["2", "9", "20.5"]
@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+import pytest
+
+from data_generation import datasets
+from gig.fitness import encode_sample, evaluate_partition, evaluate_population, evaluate_population_trie
+from gig.genetic_operations import canonicalize_partition
+from gig.mca import construct_mca, dense_transitions, reduce_mca
+from gig.sample_trie import compile_sample_trie
+
+
+@pytest.mark.parametrize(
+    "dataset",
+    [
+        pytest.param(datasets.at_least_one_a(), id="At least one 'a'"),
+        pytest.param(datasets.even_number_of_as(), id="Even number of 'a's"),
+        pytest.param(datasets.even_number_of_as_or_bs(), id="Even number of 'a's or 'b's"),
+        pytest.param(datasets.one_is_third_from_end(), id="One is third from end"),
+    ],
+)
+def test_evaluate_partition_matches_reduced_dfa(dataset: tuple[list[str], list[str], list[str], list[str]]) -> None:
+    s_plus, s_minus, test_plus, test_minus = dataset
+    mca = construct_mca(s_plus=s_plus)
+    words = s_plus + s_minus + test_plus + test_minus
+    sample = encode_sample(s_plus=s_plus, s_minus=s_minus + test_plus + test_minus, alphabet=mca.alphabet)
+
+    rnd = random.Random(42)
+    for _ in range(20):
+        num_groups = rnd.randint(1, mca.num_states)
+        partition = canonicalize_partition(
+            partition=np.array([rnd.randrange(num_groups) for _ in range(mca.num_states)], dtype=np.int_)
+        )
+        reduced_dfa = reduce_mca(mca=mca, partition=partition).dfa
+
+        accepted = evaluate_partition(mca=mca, partition=partition, sample=sample)
+        assert accepted.tolist() == [reduced_dfa.accepts_input(word) for word in words]
+
+
+def test_encode_sample_rejects_unknown_symbols() -> None:
+    mca = construct_mca(s_plus=["a", "ab"])
+    sample = encode_sample(s_plus=["ab"], s_minus=["", "ac"], alphabet=mca.alphabet)
+    assert sample.symbols.tolist() == [[0, 1], [2, 2], [2, 2]]
+    assert sample.labels.tolist() == [True, False, False]
+    assert sample.valid.tolist() == [True, True, False]
+
+    accepted = evaluate_partition(mca=mca, partition=np.zeros(mca.num_states, dtype=np.int_), sample=sample)
+    assert accepted.tolist() == [True, True, False]
+
+
+def test_evaluate_population_matches_single_partitions() -> None:
+    s_plus, s_minus, test_plus, test_minus = datasets.even_number_of_as_or_bs()
+    mca = construct_mca(s_plus=s_plus)
+    sample = encode_sample(s_plus=s_plus + test_plus, s_minus=s_minus + test_minus, alphabet=mca.alphabet)
+
+    rng = np.random.default_rng(42)
+    partitions = rng.integers(0, mca.num_states, size=(30, mca.num_states))
+    partitions[0] = np.arange(mca.num_states)
+    partitions[1] = 0
+
+    accepted = evaluate_population(mca=mca, partitions=partitions, sample=sample)
+    assert accepted.shape == (30, sample.num_words)
+    for partition, row in zip(partitions, accepted):
+        assert row.tolist() == evaluate_partition(mca=mca, partition=partition, sample=sample).tolist()
+
+
+def test_sparse_mca_matches_dense() -> None:
+    s_plus, s_minus, _, _ = datasets.one_is_third_from_end()
+    dense_mca = construct_mca(s_plus=s_plus)
+    sparse_mca = construct_mca(s_plus=s_plus, sparse=True)
+    sample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=dense_mca.alphabet)
+    trie = compile_sample_trie(sample=sample)
+    partitions = np.random.default_rng(5).integers(0, 6, size=(20, dense_mca.num_states))
+
+    assert sparse_mca.transitions.num_transitions == sparse_mca.num_states - 1
+    assert (dense_transitions(transitions=sparse_mca.transitions) == dense_mca.transitions).all()
+    assert (
+        evaluate_population(mca=sparse_mca, partitions=partitions, sample=sample)
+        == evaluate_population(mca=dense_mca, partitions=partitions, sample=sample)
+    ).all()
+    assert (
+        evaluate_population_trie(mca=sparse_mca, partitions=partitions, trie=trie)
+        == evaluate_population_trie(mca=dense_mca, partitions=partitions, trie=trie)
+    ).all()
+    reduced = reduce_mca(mca=sparse_mca, partition=partitions[0])
+    assert (
+        dense_transitions(transitions=reduced.transitions)
+        == reduce_mca(mca=dense_mca, partition=partitions[0]).transitions
+    ).all()
+
+
+def test_sparse_mca_over_a_large_alphabet() -> None:
+    rng = np.random.default_rng(6)
+    tokens = [f"t{i}" for i in range(10_000)]
+    words = [tuple(rng.choice(tokens, size=rng.integers(1, 6))) for _ in range(400)]
+    mca = construct_mca(s_plus=words[:200], sparse=True)
+    sample = encode_sample(s_plus=words[:200], s_minus=words[200:], alphabet=mca.alphabet)
+    partitions = np.random.default_rng(7).integers(0, 50, size=(10, mca.num_states))
+
+    accepted = evaluate_population(mca=mca, partitions=partitions, sample=sample)
+    assert accepted.shape == (10, 400)
+    assert evaluate_population(mca=mca, partitions=np.arange(mca.num_states)[np.newaxis], sample=sample)[0, :200].all()
+    assert mca.transitions.num_transitions == mca.num_states - 1
@@ -0,0 +1,82 @@
+import numpy as np
+import pygad
+from numpy.typing import NDArray
+
+from data_generation import datasets
+from gig.fitness import encode_sample
+from gig.fitness_cache import cached_fitness_function, FitnessCache, partition_keys
+from gig.genetic_operations import initialize_population
+from gig.mca import construct_mca
+from gig_driver import run_gig
+
+
+def test_fitness_cache_evicts_least_recently_used() -> None:
+    keys = [bytes([i]) * 4 for i in range(3)]
+    probe = FitnessCache()
+    probe.put(key=keys[0], value=0.0)
+
+    cache = FitnessCache(max_bytes=2 * probe.nbytes)
+    cache.put(key=keys[0], value=0.0)
+    cache.put(key=keys[1], value=1.0)
+    assert cache.get(keys[0]) == 0.0
+    cache.put(key=keys[2], value=2.0)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) == 2.0
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 1, 1)
+    assert len(cache) == 2
+
+
+def test_fitness_cache_skips_entries_larger_than_bound() -> None:
+    cache = FitnessCache(max_bytes=1)
+    cache.put(key=b"\x00\x01", value=1.0)
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_partition_keys_are_canonical() -> None:
+    keys = partition_keys(partitions=np.array([[0, 1, 1, 0], [3, 2, 2, 3], [0, 1, 0, 1]]))
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
+
+
+def test_cached_fitness_function_evaluates_only_missing_partitions() -> None:
+    evaluated: list[list[int]] = []
+
+    def fitness_function(_: pygad.GA, solutions: NDArray[np.int_], indices: list[int]) -> NDArray[np.floating]:
+        evaluated.append(indices)
+        return solutions.max(axis=1).astype(np.float64)
+
+    cache = FitnessCache()
+    cached_fitness = cached_fitness_function(fitness_function=fitness_function, cache=cache)
+    population = np.array([[0, 1, 2], [0, 0, 1], [5, 5, 7], [0, 1, 1]])
+
+    assert cached_fitness(None, population, [0, 1, 2, 3]).tolist() == [2.0, 1.0, 1.0, 1.0]
+    assert evaluated == [[0, 1, 3]]
+
+    assert cached_fitness(None, population[::-1], [0, 1, 2, 3]).tolist() == [1.0, 1.0, 1.0, 2.0]
+    assert evaluated == [[0, 1, 3]]
+    assert (cache.hits, cache.misses) == (4, 3)
+
+
+def test_run_gig_counts_its_own_cache_lookups() -> None:
+    s_plus, s_minus, _, _ = datasets.even_number_of_as()
+    mca = construct_mca(s_plus=s_plus)
+    train_sample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet)
+    cache = FitnessCache(max_bytes=4096)
+    runs = [
+        run_gig(
+            mca=mca,
+            train_sample=train_sample,
+            test_sample=train_sample,
+            initial_population_func=initialize_population,
+            seed=seed,
+            fitness_cache=cache,
+        )
+        for seed in range(2)
+    ]
+
+    assert all(run.cache_hits > 0 and run.cache_misses > 0 for run in runs)
+    assert sum(run.cache_hits for run in runs) == cache.hits
+    assert sum(run.cache_misses for run in runs) == cache.misses
+    assert sum(run.cache_evictions for run in runs) == cache.evictions > 0
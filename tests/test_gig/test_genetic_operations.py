@@ -1,4 +1,15 @@
-from gig.genetic_operations import initialize_population
+from types import SimpleNamespace
+
+import numpy as np
+
+from gig.genetic_operations import (
+    canonicalize_partition,
+    canonicalize_population,
+    crossover_func,
+    initialize_population,
+    initialize_random_population,
+    mutation_func,
+)
 
 
 def test_initialize_population() -> None:
@@ -8,3 +19,37 @@ def test_initialize_population() -> None:
         assert partition[0] == 0
         assert len(partition) == 10
         assert all(0 <= group < 10 for group in partition)
+
+
+def make_ga_instance(random_seed: int) -> SimpleNamespace:
+    return SimpleNamespace(random_seed=random_seed)
+
+
+def test_canonicalize_population_relabels_by_first_occurrence() -> None:
+    partitions = np.array([[3, 3, 1, 0, 1], [0, 1, 2, 3, 4], [4, 4, 4, 4, 4], [2, 0, 2, 1, 0]])
+    expected = [[0, 0, 1, 2, 1], [0, 1, 2, 3, 4], [0, 0, 0, 0, 0], [0, 1, 0, 2, 1]]
+    assert canonicalize_population(partitions=partitions).tolist() == expected
+    assert canonicalize_partition(partition=partitions[3]).tolist() == expected[3]
+
+
+def test_crossover_func_mixes_two_parents() -> None:
+    parents = initialize_random_population(num_states=12, population_size=6, rng=np.random.default_rng(0))
+    offspring = crossover_func(parents=parents, offspring_size=(40, 12), ga_instance=make_ga_instance(0))
+    assert offspring.shape == (40, 12)
+    assert (canonicalize_population(partitions=offspring) == offspring).all()
+
+    identical_parents = np.repeat(parents[:1], 2, axis=0)
+    offspring = crossover_func(parents=identical_parents, offspring_size=(5, 12), ga_instance=make_ga_instance(0))
+    assert (offspring == parents[0]).all()
+
+
+def test_mutation_func_moves_single_state() -> None:
+    offspring = initialize_random_population(num_states=8, population_size=300, rng=np.random.default_rng(1))
+    mutated = mutation_func(offspring=offspring, ga_instance=make_ga_instance(1))
+
+    changed_rows = np.flatnonzero((mutated != offspring).any(axis=1))
+    assert len(changed_rows) <= 3
+    assert (canonicalize_population(partitions=mutated) == mutated).all()
+
+    again = mutation_func(offspring=offspring, ga_instance=make_ga_instance(1))
+    assert (again == mutated).all(), "Operators are reproducible for a fixed seed"
@@ -0,0 +1,58 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from data_generation import datasets
+from gig.fitness import encode_sample
+from gig.fitness_cache import FitnessCache
+from gig.genetic_operations import initialize_population
+from gig.instrumentation import GenerationLog, GenerationRecord
+from gig.mca import construct_mca
+from gig_driver import run_gig
+
+
+def profiled_run() -> list[GenerationRecord]:
+    s_plus, s_minus, _, _ = datasets.even_number_of_as()
+    mca = construct_mca(s_plus=s_plus)
+    train_sample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet)
+    run = run_gig(
+        mca=mca,
+        train_sample=train_sample,
+        test_sample=train_sample,
+        initial_population_func=initialize_population,
+        seed=3,
+        fitness_cache=FitnessCache(),
+        profile=True,
+    )
+    assert len(run.generation_records) == run.generations
+    return run.generation_records
+
+
+def test_generation_profiler() -> None:
+    records = profiled_run()
+
+    assert [record.generation for record in records] == list(range(1, len(records) + 1))
+    for record in records:
+        assert record.fitness_calls >= 1
+        assert 0 < record.evaluated_solutions <= 2 * 100
+        assert 0.0 <= record.cache_hit_rate <= 1.0
+        assert 1 <= record.diversity <= 100
+        assert record.mean_fitness <= record.best_fitness
+        assert min(record.fitness_seconds, record.selection_seconds, record.crossover_seconds) >= 0.0
+        assert record.total_seconds >= record.fitness_seconds + record.mutation_seconds
+
+
+@pytest.mark.parametrize("file_name", ["profile.csv", "profile.jsonl"])
+def test_generation_log(tmp_path: Path, file_name: str) -> None:
+    records = profiled_run()[:3]
+    path = tmp_path / file_name
+    with GenerationLog(path=str(path), extra_columns=["run"]) as generation_log:
+        generation_log.write(records=records, run=7)
+
+    with open(path) as file:
+        rows = list(csv.DictReader(file)) if file_name.endswith(".csv") else [json.loads(line) for line in file]
+    assert len(rows) == 3
+    assert [int(row["run"]) for row in rows] == [7, 7, 7]
+    assert [float(row["best_fitness"]) for row in rows] == [record.best_fitness for record in records]
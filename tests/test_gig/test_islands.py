@@ -0,0 +1,44 @@
+import pytest
+
+from data_generation import datasets
+from gig.fitness import encode_sample
+from gig.islands import migration_targets, run_island_model
+from gig.mca import construct_mca
+
+
+def test_migration_targets() -> None:
+    assert migration_targets(num_islands=3, topology="ring") == [[1], [2], [0]]
+    assert migration_targets(num_islands=3, topology="fully_connected") == [[1, 2], [0, 2], [0, 1]]
+    assert migration_targets(num_islands=1, topology="ring") == [[]]
+    with pytest.raises(ValueError):
+        migration_targets(num_islands=3, topology="star")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("topology", ["ring", "fully_connected"])
+def test_run_island_model_is_reproducible(topology: str) -> None:
+    s_plus, s_minus, _, _ = datasets.even_number_of_as()
+    mca = construct_mca(s_plus=s_plus)
+    train_sample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet)
+
+    results = [
+        run_island_model(
+            mca=mca,
+            train_sample=train_sample,
+            num_islands=3,
+            num_generations=25,
+            population_size=30,
+            migration_interval=10,
+            topology=topology,  # type: ignore[arg-type]
+            seed=7,
+        )
+        for _ in range(2)
+    ]
+
+    first, second = results
+    assert (first.best_solution == second.best_solution).all()
+    assert first.best_solution_fitness == max(island.best_fitness[-1] for island in first.islands)
+    for island, statistics in enumerate(first.islands):
+        assert statistics.island == island
+        assert statistics.generations == len(statistics.best_fitness) == len(statistics.mean_fitness) <= 25
+        assert statistics.immigrants == (2 if topology == "ring" else 4) * 2
+        assert statistics.best_fitness == second.islands[island].best_fitness
@@ -1,8 +1,9 @@
+import numpy as np
 import pytest
 from automata.fa.dfa import DFA
 
 from data_generation import datasets
-from gig.mca import construct_mca, reduce_mca
+from gig.mca import construct_mca, MCA, reduce_mca
 
 
 @pytest.mark.parametrize(
@@ -20,6 +21,15 @@ def test_construct_mca(dataset: tuple[list[str], list[str], list[str], list[str]
     mca = construct_mca(s_plus=s_plus)
     for word in s_plus:
         assert mca.accepts_input(word), f"Does not accept '{word}'"
+        assert mca.dfa.accepts_input(word), f"DFA view does not accept '{word}'"
+
+
+def test_construct_mca_numbers_prefix_states() -> None:
+    mca = construct_mca(s_plus=["ab", "b", "aa"])
+    assert mca.alphabet == {"a": 0, "b": 1}
+    assert mca.num_states == 5
+    assert mca.transitions.tolist() == [[1, 3], [4, 2], [2, 2], [3, 3], [4, 4]]
+    assert mca.final_states.tolist() == [False, False, True, True, True]
 
 
 @pytest.mark.parametrize(
@@ -70,18 +80,24 @@ def test_construct_mca(dataset: tuple[list[str], list[str], list[str], list[str]
 )
 def test_reduce_mca(partition: tuple[int, ...], expected: DFA) -> None:
     """
-    Order of {'', '0', '1'} in python set is ('', '1', '0')
+    States 0, 1 and 2 correspond to '', '0' and '1' in the expected DFAs.
     """
-    mca = DFA(
-        states={"", "0", "1"},
-        input_symbols={"a", "b"},
-        transitions={
-            "": {"a": "0", "b": "1"},
-            "0": {"a": "0", "b": "1"},
-            "1": {"a": "0", "b": "1"},
-        },
-        initial_state="",
-        final_states={"0"},
+    mca = MCA(
+        transitions=np.array([[1, 2], [1, 2], [1, 2]]),
+        final_states=np.array([False, True, False]),
+        alphabet={"a": 0, "b": 1},
+    )
+    result = reduce_mca(mca=mca, partition=np.array(partition))
+    assert result.dfa == expected, f"Expected {expected}, but got {result.dfa}"
+
+
+def test_reduce_mca_last_writer_wins() -> None:
+    mca = MCA(
+        transitions=np.array([[1, 0], [2, 1], [0, 2]]),
+        final_states=np.array([False, False, True]),
+        alphabet={"a": 0, "b": 1},
     )
-    result = reduce_mca(mca_states=["", "0", "1"], mca=mca, partition=partition)
-    assert result == expected, f"Expected {expected}, but got {result}"
+    result = reduce_mca(mca=mca, partition=np.array([0, 1, 0]))
+    assert result.transitions.tolist() == [[0, 0], [0, 1]]
+    assert result.final_states.tolist() == [True, False]
+    assert result.initial_state == 0
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from data_generation import datasets
+from gig.fitness import (
+    calculate_unique_groups_points,
+    create_fitness_function,
+    encode_sample,
+    EncodedSample,
+    evaluate_population,
+)
+from gig.fitness_cache import FitnessCache
+from gig.genetic_operations import initialize_random_population
+from gig.mca import construct_mca
+from gig.pruning import FitnessPruning
+from gig.sample_trie import compile_sample_trie
+
+
+def test_threshold() -> None:
+    pruning = FitnessPruning(rank=2)
+    assert pruning.threshold(ga_instance=SimpleNamespace(last_generation_fitness=None)) is None
+    assert pruning.threshold(ga_instance=SimpleNamespace(last_generation_fitness=np.array([1.0]))) is None
+    assert pruning.threshold(ga_instance=SimpleNamespace(last_generation_fitness=np.array([3.0, 1.0, 2.0]))) == 2.0
+
+
+@pytest.mark.parametrize("use_trie", [False, True], ids=["Encoded sample", "Sample trie"])
+def test_correct_counts_are_exact_or_lower_bounds(use_trie: bool) -> None:
+    s_plus, s_minus, _, _ = datasets.one_is_third_from_end()
+    mca = construct_mca(s_plus=s_plus)
+    sample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet)
+    partitions = initialize_random_population(mca.num_states, 30, np.random.default_rng(4))
+    unique_groups_points = calculate_unique_groups_points(solutions=partitions)
+
+    exact_correct = np.count_nonzero(
+        evaluate_population(mca=mca, partitions=partitions, sample=sample) == sample.labels,
+        axis=1,
+    )
+    exact_fitness = (exact_correct / sample.num_words * 3 + unique_groups_points) * 1000
+    threshold = float(np.median(exact_fitness))
+
+    pruning = FitnessPruning(chunk_size=16)
+    correct, pruned = pruning.correct_counts(
+        mca=mca,
+        partitions=partitions,
+        sample=compile_sample_trie(sample=sample) if use_trie else sample,
+        unique_groups_points=unique_groups_points,
+        threshold=threshold,
+    )
+    assert pruned.any()
+    assert (correct[~pruned] == exact_correct[~pruned]).all()
+    assert (correct[pruned] <= exact_correct[pruned]).all()
+    assert (exact_fitness[pruned] < threshold).all()
+    assert (pruning.evaluations, pruning.pruned) == (30, np.count_nonzero(pruned))
+    assert pruning.skipped_words > 0
+
+
+def test_pruned_fitness_is_not_cached() -> None:
+    s_plus, s_minus, _, _ = datasets.even_number_of_as()
+    mca = construct_mca(s_plus=s_plus)
+    train_sample: EncodedSample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet)
+    fitness_cache = FitnessCache()
+    fitness_function = create_fitness_function(
+        mca=mca,
+        train_sample=train_sample,
+        fitness_cache=fitness_cache,
+        pruning=FitnessPruning(chunk_size=4),
+    )
+    partitions = np.stack([np.arange(mca.num_states), np.zeros(mca.num_states, dtype=np.int_)])
+
+    exact = fitness_function(SimpleNamespace(last_generation_fitness=None), partitions, [0, 1])
+    fitness_cache = FitnessCache()
+    fitness_function = create_fitness_function(
+        mca=mca,
+        train_sample=train_sample,
+        fitness_cache=fitness_cache,
+        pruning=FitnessPruning(chunk_size=4),
+    )
+    bounded = fitness_function(SimpleNamespace(last_generation_fitness=np.array([4000.0, 4000.0])), partitions, [0, 1])
+    assert (bounded <= exact).all()
+    assert len(fitness_cache) == 0
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from data_generation import datasets
+from gig.fitness import (
+    accepts_sample,
+    calculate_data_points,
+    encode_sample,
+    evaluate_population,
+    evaluate_population_trie,
+)
+from gig.genetic_operations import initialize_random_population
+from gig.mca import construct_mca, reduce_mca
+from gig.sample_trie import accepts_trie, compile_sample_trie, count_true_verdicts
+
+DATASETS = [
+    pytest.param(datasets.even_number_of_as(), id="Even number of 'a's"),
+    pytest.param(datasets.even_number_of_as_or_bs(), id="Even number of 'a's or 'b's"),
+    pytest.param(datasets.one_is_third_from_end(), id="One is third from end"),
+]
+
+
+def test_compile_sample_trie() -> None:
+    sample = encode_sample(s_plus=["ab", "abb", ""], s_minus=["b", "ab", "ac"], alphabet={"a": 0, "b": 1})
+    trie = compile_sample_trie(sample=sample)
+
+    assert trie.num_nodes == 5, "'', 'a', 'b', 'ab' and 'abb'"
+    assert trie.level_offsets.tolist() == [0, 1, 3, 4, 5]
+    assert trie.parents.tolist() == [-1, 0, 0, 1, 3]
+    assert trie.symbols.tolist() == [-1, 0, 1, 1, 1]
+    assert trie.positives.tolist() == [1, 0, 0, 1, 1]
+    assert trie.negatives.tolist() == [0, 0, 1, 1, 0]
+    assert (trie.num_positives, trie.num_negatives, trie.num_words) == (3, 3, 6)
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_accepts_trie_matches_word_by_word_evaluation(
+    dataset: tuple[list[str], list[str], list[str], list[str]],
+) -> None:
+    train_plus, train_minus, test_plus, test_minus = dataset
+    mca = construct_mca(s_plus=train_plus)
+    sample = encode_sample(s_plus=test_plus, s_minus=test_minus, alphabet=mca.alphabet)
+    trie = compile_sample_trie(sample=sample)
+
+    for partition in initialize_random_population(mca.num_states, 10, np.random.default_rng(1)):
+        automaton = reduce_mca(mca=mca, partition=partition)
+        accepted = accepts_sample(automaton=automaton, sample=sample)
+        true_positives, true_negatives = count_true_verdicts(
+            accepted=accepts_trie(automaton=automaton, trie=trie), trie=trie
+        )
+        assert true_positives == np.count_nonzero(accepted & sample.labels)
+        assert true_negatives == np.count_nonzero(~accepted & ~sample.labels)
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_evaluate_population_trie_matches_data_points(
+    dataset: tuple[list[str], list[str], list[str], list[str]],
+) -> None:
+    s_plus, s_minus, _, _ = dataset
+    mca = construct_mca(s_plus=s_plus)
+    sample = encode_sample(s_plus=s_plus, s_minus=s_minus, alphabet=mca.alphabet)
+    trie = compile_sample_trie(sample=sample)
+    partitions = initialize_random_population(mca.num_states, 20, np.random.default_rng(2))
+
+    expected = calculate_data_points(
+        accepted=evaluate_population(mca=mca, partitions=partitions, sample=sample),
+        sample=sample,
+    )
+    data_points = calculate_data_points(
+        accepted=evaluate_population_trie(mca=mca, partitions=partitions, trie=trie),
+        sample=trie,
+    )
+    assert (data_points == expected).all()
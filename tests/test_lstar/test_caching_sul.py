@@ -0,0 +1,46 @@
+from aalpy import RegexSUL, run_Lstar, WMethodEqOracle
+
+from data_generation.language_accuracy import compare_languages
+from lstar_driver import CachingSUL, ExSUL
+
+
+def test_repeated_queries_and_prefixes_are_cached() -> None:
+    inner = ExSUL(is_correct=lambda string: string.startswith("01"))
+    sul = CachingSUL(sul=inner)
+
+    assert sul.query(("0", "1", "1")) == [False, True, True]
+    assert sul.query(("0", "1", "1")) == [False, True, True]
+    assert sul.query(("0", "1")) == [False, True]
+    assert sul.query(("0", "1", "0")) == [False, True, True]
+    assert sul.query(()) == [False]
+    assert sul.query(()) == [False]
+
+    # The empty word is the single input None.
+    assert (sul.saved_queries, sul.saved_steps) == (3, 6)
+    # The third input of "010" replays the cached prefix "01" on the SUL.
+    assert (sul.sul_queries, sul.sul_steps) == (3, 7)
+    assert sul.num_queries == 6
+
+
+def test_learns_the_same_automaton() -> None:
+    alphabet = list("01")
+    plain_sul = RegexSUL(regex="0{3}[01]*")
+    caching_sul = CachingSUL(sul=RegexSUL(regex="0{3}[01]*"))
+
+    learned_dfas = [
+        run_Lstar(
+            alphabet,
+            sul,
+            WMethodEqOracle(alphabet, sul, max_number_of_states=6),
+            automaton_type="dfa",
+            cache_and_non_det_check=False,
+            print_level=0,
+        )
+        for sul in [plain_sul, caching_sul]
+    ]
+
+    assert len(learned_dfas[0].states) == len(learned_dfas[1].states) == 5
+    assert compare_languages(learned=learned_dfas[1], reference=learned_dfas[0], max_len=8).equivalent
+    assert caching_sul.saved_queries > 0
+    # The W-method oracle steps the SUL itself, so only membership queries are counted in `num_queries`.
+    assert caching_sul.num_queries == plain_sul.num_queries
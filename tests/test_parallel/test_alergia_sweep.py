@@ -0,0 +1,31 @@
+from alergia_driver import cell_visualisation_paths, run_alergia_noise_sweep
+from data_generation import datasets
+
+
+def test_alergia_noise_sweep_does_not_depend_on_the_number_of_workers() -> None:
+    positive, negative = datasets.a_and_b_alternately(positive_data_size=200, negative_data_size=200, min_seq_len=1)
+
+    results = [
+        run_alergia_noise_sweep(
+            positive=positive,
+            negative=negative,
+            noise_percentages=[0.0, 0.1],
+            num_of_runs=3,
+            seed=7,
+            max_workers=max_workers,
+        )
+        for max_workers in [1, 2]
+    ]
+
+    assert results[0] == results[1]
+    assert [noise_percentage for noise_percentage, _, _ in results[0]] == [0.0, 0.1]
+    assert results[0][0][1] == 1.0, "Noise-free data is learned exactly"
+
+
+def test_cells_render_to_distinct_files() -> None:
+    paths = cell_visualisation_paths(noise_percentages=[0.0, 0.001, 0.1], num_of_runs=4, visualisation_catalogue="mc")
+
+    assert len(paths) == 3 * 4
+    rendered = [path for path in paths if path is not None]
+    assert rendered == ["mc/learned_mc_0_000.png", "mc/learned_mc_0_001.png", "mc/learned_mc_0_100.png"]
+    assert cell_visualisation_paths(noise_percentages=[0.0], num_of_runs=2, visualisation_catalogue=None) == [None] * 2
@@ -0,0 +1,19 @@
+from data_generation import datasets
+from gig_driver import benchmark_gig_initial_population
+
+
+def test_gig_benchmark_does_not_depend_on_the_number_of_workers() -> None:
+    # A small cache evicts entries, so the sequential and the per-worker caches hold different fitness values.
+    results = [
+        benchmark_gig_initial_population(
+            data=datasets.at_least_one_a(),
+            fitness_cache_bytes=4096,
+            seed=7,
+            max_workers=max_workers,
+            num_of_runs=3,
+        )
+        for max_workers in [1, 2]
+    ]
+
+    assert results[0] == results[1]
+    assert [row[0] for row in results[0]] == ["initialize_population", "initialize_random_population"]
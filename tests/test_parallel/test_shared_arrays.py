@@ -0,0 +1,28 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from parallel.shared_arrays import attach_shared_arrays, SharedArrays, SharedArraysSpec
+
+
+def sum_shared_arrays(spec: SharedArraysSpec) -> dict[str, int]:
+    arrays, _blocks = attach_shared_arrays(spec=spec)
+    return {name: int(array.sum()) for name, array in arrays.items()}
+
+
+def test_shared_arrays_are_read_only_views() -> None:
+    symbols = np.arange(12).reshape(3, 4)
+    with SharedArrays(arrays={"symbols": symbols, "empty": np.zeros(0, dtype=np.bool_)}) as shared:
+        arrays, _blocks = attach_shared_arrays(spec=shared.spec)
+        assert (arrays["symbols"] == symbols).all()
+        assert arrays["empty"].shape == (0,)
+        with pytest.raises(ValueError):
+            arrays["symbols"][0, 0] = 1
+
+
+def test_shared_arrays_are_visible_in_worker_processes() -> None:
+    with SharedArrays(arrays={"a": np.ones(100, dtype=np.int_), "b": np.arange(5)}) as shared:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(sum_shared_arrays, [shared.spec] * 3))
+    assert results == [{"a": 100, "b": 10}] * 3
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+from aalpy import run_RPNI
+
+from data_generation.datasets import create_rpni_benchmark_data
+from data_generation.language_accuracy import compare_languages
+from rpni.learner import run_native_rpni, StateMerger
+from rpni.pta import build_prefix_tree, UNKNOWN
+
+
+@pytest.mark.parametrize("alphabet_size", [2, 4, 16, 64])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_equivalent_to_aalpy(alphabet_size: int, seed: int) -> None:
+    random.seed(seed)
+    data = create_rpni_benchmark_data(alphabet_size=alphabet_size)
+
+    native = run_native_rpni(data=data)
+    reference = run_RPNI(list(data), automaton_type="dfa", print_info=False)
+
+    assert len(native.states) == len(reference.states)
+    assert compare_languages(learned=native, reference=reference, max_len=6).equivalent
+
+
+def test_consistent_with_data() -> None:
+    random.seed(3)
+    data = create_rpni_benchmark_data(alphabet_size=8)
+
+    model = run_native_rpni(data=data)
+
+    for word, label in data:
+        model.reset_to_initial()
+        output = model.initial_state.is_accepting
+        for symbol in word:
+            output = model.step(symbol)
+        assert output == label
+
+
+def test_prefix_tree() -> None:
+    pta = build_prefix_tree(data=[(("a", "b"), True), (("b",), False), ((), False), (("a",), True)])
+
+    # Words are inserted by length and symbols are indexed by first appearance, so "b" comes before "a".
+    assert pta.alphabet == ["b", "a"]
+    assert pta.num_states == 4
+    assert pta.outputs.tolist() == [0, 0, 1, 1]
+    assert pta.depths.tolist() == [0, 1, 1, 2]
+    assert pta.children.to_dense().tolist() == [[1, 2], [-1, -1], [3, -1], [-1, -1]]
+    assert pta.children.num_transitions == 3
+
+
+def test_non_deterministic_data() -> None:
+    with pytest.raises(ValueError):
+        build_prefix_tree(data=[(("a",), True), (("a",), False)])
+
+
+def test_rejected_merge_is_undone() -> None:
+    # "a" is positive and "aa" negative, so merging "a" into the root folds "aa" into "a" and conflicts.
+    pta = build_prefix_tree(data=[(("a",), True), (("a", "a"), False), (("a", "b"), True)])
+    merger = StateMerger(pta=pta)
+    parents = list(merger.parents)
+    outputs = list(merger.outputs)
+    block_children = [list(children.items()) for children in merger.block_children]
+
+    assert not merger.try_merge(red=0, blue=1)
+
+    assert merger.parents == parents
+    assert merger.outputs == outputs
+    assert [list(children.items()) for children in merger.block_children] == block_children
+    assert merger.rejected_merges == 1
+    assert outputs[0] == UNKNOWN
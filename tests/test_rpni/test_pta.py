@@ -0,0 +1,60 @@
+import random
+
+from aalpy.learning_algs.deterministic_passive.rpni_helper_functions import createPTA
+
+from data_generation.datasets import create_rpni_benchmark_data
+from data_generation.language_accuracy import compare_languages
+from rpni.pta import build_prefix_tree, to_rpni_nodes
+from rpni_driver import count_pta_states, PrefixTreeRPNI, RPNI
+
+
+def count_aalpy_pta_states(data: list) -> int:
+    nodes = [createPTA(list(data), automaton_type="dfa")]
+    count = 0
+    while nodes:
+        count += 1
+        nodes.extend(nodes.pop().children.values())
+    return count
+
+
+def test_state_count_matches_aalpy() -> None:
+    random.seed(5)
+    data = create_rpni_benchmark_data(alphabet_size=16)
+    pta = build_prefix_tree(data=data)
+
+    assert count_pta_states(data=pta) == count_pta_states(data=data) == count_aalpy_pta_states(data=data)
+
+
+def test_statistics() -> None:
+    pta = build_prefix_tree(data=[(("a", "b"), True), (("a", "a"), False), (("b",), False), ((), True)])
+
+    assert pta.alphabet == ["b", "a"]
+    assert pta.depth_histogram.tolist() == [1, 2, 2]
+    assert pta.symbol_counts.tolist() == [2, 2]
+    assert pta.branching_histogram.tolist() == [3, 0, 2]
+    assert pta.mean_branching == 2.0
+    assert pta.depth_histogram.sum() == pta.num_states == pta.branching_histogram.sum()
+
+
+def test_rpni_nodes_match_aalpy_pta() -> None:
+    random.seed(7)
+    data = create_rpni_benchmark_data(alphabet_size=8)
+    root, aalpy_root = to_rpni_nodes(pta=build_prefix_tree(data=data)), createPTA(list(data), automaton_type="moore")
+
+    nodes, aalpy_nodes = [root], [aalpy_root]
+    while nodes:
+        node, aalpy_node = nodes.pop(), aalpy_nodes.pop()
+        assert (node.prefix, node.output) == (aalpy_node.prefix, aalpy_node.output)
+        assert list(node.children) == list(aalpy_node.children), "Children are in the same order"
+        nodes.extend(node.children.values())
+        aalpy_nodes.extend(aalpy_node.children.values())
+
+
+def test_aalpy_rpni_on_shared_prefix_tree() -> None:
+    random.seed(9)
+    data = create_rpni_benchmark_data(alphabet_size=4)
+    model = PrefixTreeRPNI(pta=build_prefix_tree(data=data)).run_rpni()
+    reference = RPNI(data=list(data), automaton_type="dfa", print_info=False).run_rpni()
+
+    assert len(model.states) == len(reference.states)
+    assert compare_languages(learned=model, reference=reference, max_len=6).equivalent